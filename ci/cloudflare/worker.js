@@ -4,6 +4,19 @@
  * Proxies GitHub and Codecov API requests with authentication.
  * Token is stored as an encrypted environment variable in Cloudflare.
  *
+ * Routes:
+ *   /github/*   → api.github.com (whitelisted paths only)
+ *   /codecov/*  → api.codecov.io (whitelisted paths only)
+ *   /batch?q=…  → latest runs for many workflows in one round trip, shaped
+ *                 like the dashboard's PREFETCHED_CI_DATA (see handleBatch)
+ *   /snapshot   → the PREFETCHED_CI_DATA payload last computed by the cron
+ *                 trigger and stored in KV (see prewarmSnapshot)
+ *
+ * Upstream responses are cached at the edge (see cachedFetch); every
+ * response carries X-Cache: HIT, STALE, MISS or BYPASS.  Successful
+ * responses are cut down to the fields the dashboard reads before they are
+ * cached (see projectFields).
+ *
  * Setup:
  *   1. Create a Worker at workers.cloudflare.com
  *   2. Paste this code
@@ -14,6 +27,18 @@
  * Environment Variables:
  *   GITHUB_TOKEN    — Required. GitHub PAT with public_repo read scope.
  *   ALLOWED_ORIGIN  — Optional. CORS origin (default: "*").
+ *   CACHE_TTL_RUNS     — Optional. Seconds GitHub run lists stay fresh (60).
+ *   CACHE_TTL_CODECOV  — Optional. Seconds Codecov totals stay fresh (600).
+ *   CACHE_MAX_STALE    — Optional. Seconds past the TTL a response may still
+ *                        be served while it is refreshed (3600).
+ *   A TTL of 0 disables caching for that route.
+ *   FIELD_PROJECTION   — Optional. "off" returns upstream bodies unmodified.
+ *   SNAPSHOT_CONFIG    — Optional. Projects to pre-warm, as exported by
+ *                        `build_dashboard.py --worker-config`.
+ *
+ * Bindings (optional, for the pre-warmed snapshot):
+ *   CI_SNAPSHOT     — KV namespace holding the snapshot.
+ *   Cron trigger    — e.g. "*\/5 * * * *"; each run recomputes the snapshot.
  */
 
 // ── Whitelist: only these path patterns are forwarded ──────────────
@@ -24,21 +49,67 @@ const GITHUB_PATH_PATTERNS = [
   /^\/repos\/casangi\/[a-zA-Z0-9._-]+\/actions\/runs/,
 ];
 
+// /batch items name a repository and workflow files; both are checked
+// before they are spliced into an upstream path.
+const BATCH_REPO_PATTERN = /^casangi\/[A-Za-z0-9._-]+$/;
+const BATCH_FILE_PATTERN = /^[A-Za-z0-9._-]+$/;
+
 const CODECOV_PATH_PATTERNS = [
   // Repository-level coverage totals
   /^\/api\/v2\/github\/casangi\/repos\/[a-zA-Z0-9._-]+\/?$/,
 ];
 
+// ── Batch status ───────────────────────────────────────────────────
+// Upper bound on upstream calls a single /batch request may trigger
+// (Workers allow 50 subrequests per invocation).
+const MAX_BATCH_CALLS = 40;
+// Runs inspected for branch discovery (matches app.js and the bake).
+const RECENT_RUNS_WINDOW = 30;
+const MAX_RECENT_BRANCHES = 10;
+const DEFAULT_BRANCH = "main";
+
+// ── Edge cache ─────────────────────────────────────────────────────
+// [upstream path pattern, env override, default TTL in seconds]
+const CACHE_TTLS = [
+  [/\/actions\/workflows\/[^/]+\/runs$/, "CACHE_TTL_RUNS", 60],
+  [/\/actions\/runs$/, "CACHE_TTL_RUNS", 60],
+  [/^\/api\/v2\//, "CACHE_TTL_CODECOV", 600],
+];
+const DEFAULT_MAX_STALE = 3600;
+const CACHED_AT_HEADER = "X-Cached-At";
+const RATE_LIMIT_HEADERS = ["X-RateLimit-Remaining", "X-RateLimit-Limit", "X-RateLimit-Reset"];
+
+// ── Snapshot (cron pre-warm) ───────────────────────────────────────
+const SNAPSHOT_KEY = "snapshot";
+// One /actions/runs sweep of this many runs per repository answers most
+// entries (as the bake's fetch_mode: repo does).
+const SWEEP_PAGE_SIZE = 100;
+// Upstream calls one scheduled run may make (sweeps plus fallbacks).
+const MAX_SNAPSHOT_CALLS = 45;
+
+// ── Field projection ───────────────────────────────────────────────
+// What app.js reads from run lists and Codecov totals; everything else
+// (repository, actor, commit objects, …) is dropped.
+const RUN_FIELDS = ["name", "status", "conclusion", "head_branch", "updated_at"];
+const CODECOV_TOTALS_FIELDS = ["coverage", "lines", "hits", "misses", "partials"];
+// Part of every edge-cache key for projected bodies; bump it whenever the
+// projection changes so entries of the old shape are not served.
+const PROJECTION_VERSION = 1;
+
+// Refreshes in flight in this isolate, so concurrent misses and background
+// revalidations of one URL share a single upstream request.
+const refreshing = new Map();
+
 // ── Handler ────────────────────────────────────────────────────────
 export default {
-  async fetch(request, env) {
+  async fetch(request, env, ctx) {
     const origin = env.ALLOWED_ORIGIN || "*";
     const corsHeaders = {
       "Access-Control-Allow-Origin": origin,
       "Access-Control-Allow-Methods": "GET, OPTIONS",
       "Access-Control-Allow-Headers": "Content-Type",
       "Access-Control-Expose-Headers":
-        "X-RateLimit-Remaining, X-RateLimit-Limit, X-RateLimit-Reset",
+        "X-RateLimit-Remaining, X-RateLimit-Limit, X-RateLimit-Reset, X-Cache",
     };
 
     // Handle CORS preflight
@@ -59,7 +130,7 @@ export default {
       const ghPath = path.replace(/^\/github/, "");
       const ghSearch = url.search;
 
-      if (!GITHUB_PATH_PATTERNS.some((re) => re.test(ghPath))) {
+      if (!githubPathAllowed(ghPath)) {
         return jsonResponse(403, { error: "Path not allowed" }, corsHeaders);
       }
 
@@ -67,32 +138,17 @@ export default {
         return jsonResponse(500, { error: "GITHUB_TOKEN not configured" }, corsHeaders);
       }
 
-      const upstream = `https://api.github.com${ghPath}${ghSearch}`;
-      const resp = await fetch(upstream, {
-        headers: {
-          Authorization: `token ${env.GITHUB_TOKEN}`,
-          Accept: "application/vnd.github.v3+json",
-          "User-Agent": "viper-dashboard-proxy",
-        },
-      });
-
-      const body = await resp.text();
+      const { entry, cacheStatus } = await githubFetch(`${ghPath}${ghSearch}`, env, ctx);
       const headers = new Headers(corsHeaders);
-      headers.set(
-        "Content-Type",
-        resp.headers.get("Content-Type") || "application/json"
-      );
+      headers.set("Content-Type", entry.headers.get("Content-Type") || "application/json");
+      headers.set("X-Cache", cacheStatus);
 
       // Pass through rate-limit headers
-      for (const h of [
-        "X-RateLimit-Remaining",
-        "X-RateLimit-Limit",
-        "X-RateLimit-Reset",
-      ]) {
-        if (resp.headers.has(h)) headers.set(h, resp.headers.get(h));
+      for (const h of RATE_LIMIT_HEADERS) {
+        if (entry.headers.has(h)) headers.set(h, entry.headers.get(h));
       }
 
-      return new Response(body, { status: resp.status, headers });
+      return new Response(entry.body, { status: entry.status, headers });
     }
 
     // ── Route: /codecov/* → api.codecov.io ─────────────────────
@@ -104,32 +160,449 @@ export default {
       }
 
       const upstream = `https://api.codecov.io${ccPath}${url.search}`;
-      const resp = await fetch(upstream, {
+      const { entry, cacheStatus } = await cachedFetch(upstream, {
         headers: {
           Accept: "application/json",
           "User-Agent": "viper-dashboard-proxy",
         },
-      });
+      }, env, ctx);
 
-      const body = await resp.text();
       const headers = new Headers(corsHeaders);
-      headers.set(
-        "Content-Type",
-        resp.headers.get("Content-Type") || "application/json"
-      );
+      headers.set("Content-Type", entry.headers.get("Content-Type") || "application/json");
+      headers.set("X-Cache", cacheStatus);
+
+      return new Response(entry.body, { status: entry.status, headers });
+    }
 
-      return new Response(body, { status: resp.status, headers });
+    // ── Route: /snapshot → pre-warmed payload from KV ──────────
+    if (path === "/snapshot") {
+      const snapshot = env.CI_SNAPSHOT ? await env.CI_SNAPSHOT.get(SNAPSHOT_KEY) : null;
+      if (!snapshot) {
+        return jsonResponse(404, { error: "No snapshot available" }, corsHeaders);
+      }
+      return new Response(snapshot, {
+        headers: {
+          ...corsHeaders,
+          "Content-Type": "application/json",
+          "Cache-Control": "public, max-age=30",
+        },
+      });
+    }
+
+    // ── Route: /batch → many workflow statuses at once ─────────
+    if (path === "/batch") {
+      if (!env.GITHUB_TOKEN) {
+        return jsonResponse(500, { error: "GITHUB_TOKEN not configured" }, corsHeaders);
+      }
+      return handleBatch(url, env, ctx, corsHeaders);
     }
 
     // ── Fallback ───────────────────────────────────────────────
     return jsonResponse(
       404,
-      { error: "Unknown route. Use /github/* or /codecov/*" },
+      { error: "Unknown route. Use /github/*, /codecov/*, /batch or /snapshot" },
       corsHeaders
     );
   },
+
+  // ── Cron trigger → recompute the snapshot ────────────────────
+  async scheduled(event, env, ctx) {
+    ctx.waitUntil(prewarmSnapshot(env, ctx));
+  },
 };
 
+function githubPathAllowed(path) {
+  // No whitelisted path needs a percent-escape, and an escaped "%2e%2e"
+  // would only be resolved to ".." upstream, after this check.
+  if (path.includes("%")) return false;
+  if (path.split(/[/?]/).some((seg) => seg === "." || seg === "..")) return false;
+  // Check the path as the upstream URL will resolve it, and refuse any
+  // path that normalisation would change.
+  let pathname;
+  try {
+    pathname = new URL(path, "https://api.github.com").pathname;
+  } catch {
+    return false;
+  }
+  if (pathname !== path) return false;
+  return GITHUB_PATH_PATTERNS.some((re) => re.test(pathname));
+}
+
+function githubFetch(pathAndSearch, env, ctx, options) {
+  return cachedFetch(`https://api.github.com${pathAndSearch}`, {
+    headers: {
+      Authorization: `token ${env.GITHUB_TOKEN}`,
+      Accept: "application/vnd.github.v3+json",
+      "User-Agent": "viper-dashboard-proxy",
+    },
+  }, env, ctx, options);
+}
+
+/**
+ * Fetch an upstream URL through the Cache API.
+ *
+ * Entries are keyed by the normalised upstream URL (query parameters
+ * sorted) plus the projection mode and PROJECTION_VERSION, so projected
+ * and raw bodies of one URL are cached apart.  One younger than its route's TTL is served as a HIT; an older
+ * one, up to CACHE_MAX_STALE past the TTL, is served as STALE while
+ * ctx.waitUntil refreshes it in the background.  Refreshes are conditional
+ * on the cached ETag, and a 304 (free on GitHub's rate limit) just renews
+ * the entry.  Error responses are passed through but never cached.
+ *
+ * options.refresh skips serving from cache (the entry is still revalidated
+ * and stored); options.cache = false bypasses the cache altogether and
+ * options.project overrides FIELD_PROJECTION.
+ *
+ * Resolves to { entry: {status, headers, body}, cacheStatus }.
+ */
+async function cachedFetch(upstream, init, env, ctx, options = {}) {
+  const url = new URL(upstream);
+  url.searchParams.sort();
+  const target = url.toString();
+  const ttl = options.cache === false ? 0 : cacheTtl(url.pathname, env);
+  const cache = typeof caches !== "undefined" ? caches.default : null;
+  const project = options.project ?? env.FIELD_PROJECTION !== "off";
+  if (!cache || !(ttl > 0)) {
+    return { entry: await toEntry(await fetch(target, init), project), cacheStatus: "BYPASS" };
+  }
+  const key = cacheKey(target, project);
+
+  const maxStale = envSeconds(env, "CACHE_MAX_STALE", DEFAULT_MAX_STALE);
+  const hit = await cache.match(key);
+  const cached = hit ? await toEntry(hit) : null;
+  if (cached && !options.refresh) {
+    const age = (Date.now() - Number(cached.headers.get(CACHED_AT_HEADER) || 0)) / 1000;
+    if (age < ttl) return { entry: cached, cacheStatus: "HIT" };
+    if (age < ttl + maxStale) {
+      const refresh = refreshEntry(cache, key, target, init, cached, ttl + maxStale, project)
+        .catch(() => null);
+      if (ctx) ctx.waitUntil(refresh);
+      return { entry: cached, cacheStatus: "STALE" };
+    }
+  }
+  const entry = await refreshEntry(cache, key, target, init, cached, ttl + maxStale, project);
+  return { entry, cacheStatus: "MISS" };
+}
+
+function cacheKey(target, project) {
+  const key = new URL(target);
+  key.searchParams.set("__projection", project ? `v${PROJECTION_VERSION}` : "off");
+  key.searchParams.sort();
+  return key.toString();
+}
+
+function refreshEntry(cache, key, target, init, cached, lifetime, project) {
+  if (!refreshing.has(key)) {
+    const done = revalidate(cache, key, target, init, cached, lifetime, project)
+      .finally(() => refreshing.delete(key));
+    refreshing.set(key, done);
+  }
+  return refreshing.get(key);
+}
+
+async function revalidate(cache, key, target, init, cached, lifetime, project) {
+  const headers = { ...init.headers };
+  const etag = cached && cached.headers.get("ETag");
+  if (etag) headers["If-None-Match"] = etag;
+  const resp = await fetch(target, { ...init, headers });
+
+  let entry;
+  if (resp.status === 304 && cached) {
+    entry = { status: cached.status, headers: new Headers(cached.headers), body: cached.body };
+    for (const h of RATE_LIMIT_HEADERS) {
+      if (resp.headers.has(h)) entry.headers.set(h, resp.headers.get(h));
+    }
+  } else {
+    entry = await toEntry(resp, project);
+    if (!resp.ok) return entry;
+  }
+
+  entry.headers.set(CACHED_AT_HEADER, String(Date.now()));
+  entry.headers.set("Cache-Control", `max-age=${Math.ceil(lifetime)}`);
+  await cache.put(key, new Response(entry.body, { status: entry.status, headers: entry.headers }));
+  return entry;
+}
+
+async function toEntry(resp, project = false) {
+  const headers = new Headers(resp.headers);
+  let body = await resp.text();
+  if (project && resp.ok) {
+    try {
+      body = JSON.stringify(projectFields(JSON.parse(body)));
+      headers.delete("Content-Length");
+    } catch {
+      // not JSON: pass through unmodified
+    }
+  }
+  return { status: resp.status, headers, body };
+}
+
+function projectFields(data) {
+  if (data && Array.isArray(data.workflow_runs)) {
+    return {
+      total_count: data.total_count,
+      workflow_runs: data.workflow_runs.map((run) => pick(run, RUN_FIELDS)),
+    };
+  }
+  if (data && data.totals && typeof data.totals === "object") {
+    return {
+      totals: pick(data.totals, CODECOV_TOTALS_FIELDS),
+      branch: data.branch,
+      updatestamp: data.updatestamp,
+    };
+  }
+  return data;
+}
+
+function pick(obj, fields) {
+  const out = {};
+  for (const f of fields) if (obj && f in obj) out[f] = obj[f];
+  return out;
+}
+
+function cacheTtl(path, env) {
+  const rule = CACHE_TTLS.find(([re]) => re.test(path));
+  return rule ? envSeconds(env, rule[1], rule[2]) : 0;
+}
+
+function envSeconds(env, name, fallback) {
+  const value = Number(env[name]);
+  return env[name] === undefined || env[name] === "" || Number.isNaN(value) ? fallback : value;
+}
+
+/**
+ * GET /batch?q=<JSON>
+ *
+ * q is the list of projects the landing page shows, e.g.
+ *   [{"id": "xradio", "repo": "casangi/xradio", "branch": "main",
+ *     "workflows": ["python-testing-linux.yml"], "branches": 4}]
+ * (branch defaults to main; branches > 0 also discovers that many recent
+ * non-main branches).  Every workflow's latest run is fetched upstream in
+ * parallel and the answer mirrors PREFETCHED_CI_DATA:
+ *   {"baked_at": …, "projects": {"xradio": {
+ *      "workflows": {"python-testing-linux.yml": {conclusion, updated_at}},
+ *      "recent_branches": [...], "errors": {"<file>": "<reason>"}}}}
+ * Each item's repo ("casangi/<name>") and workflow file names are
+ * validated, and its paths checked against the whitelist, on its own; an
+ * item that is refused or fails upstream is reported under "errors" and
+ * left out of "workflows", so the client can fall back to a direct
+ * request for it.
+ */
+async function handleBatch(url, env, ctx, corsHeaders) {
+  let items;
+  try {
+    items = JSON.parse(url.searchParams.get("q") || "");
+  } catch {
+    items = null;
+  }
+  if (!Array.isArray(items) || items.some((it) => !it || typeof it.id !== "string"
+      || typeof it.repo !== "string" || !Array.isArray(it.workflows || []))) {
+    return jsonResponse(400, {
+      error: "q must be a JSON list of {id, repo, branch?, workflows, branches?}",
+    }, corsHeaders);
+  }
+
+  const projects = {};
+  const jobs = [];
+  for (const item of items) {
+    const branch = typeof item.branch === "string" && item.branch ? item.branch : DEFAULT_BRANCH;
+    const proj = (projects[item.id] = projects[item.id] || { workflows: {}, errors: {} });
+    const repoAllowed = BATCH_REPO_PATTERN.test(item.repo);
+    for (const file of item.workflows || []) {
+      jobs.push({
+        proj, key: String(file),
+        allowed: repoAllowed && BATCH_FILE_PATTERN.test(String(file)),
+        path: `/repos/${item.repo}/actions/workflows/${file}/runs`,
+        search: `?branch=${encodeURIComponent(branch)}&per_page=1`,
+      });
+    }
+    const wanted = Math.min(Number(item.branches) || 0, MAX_RECENT_BRANCHES);
+    if (wanted > 0) {
+      proj.recent_branches = [];
+      jobs.push({
+        proj, key: "recent_branches", wanted, allowed: repoAllowed,
+        path: `/repos/${item.repo}/actions/runs`,
+        search: `?per_page=${RECENT_RUNS_WINDOW}`,
+      });
+    }
+  }
+  if (jobs.length > MAX_BATCH_CALLS) {
+    return jsonResponse(400, {
+      error: `Too many items (${jobs.length} > ${MAX_BATCH_CALLS})`,
+    }, corsHeaders);
+  }
+
+  // Identical upstream requests within one batch are made once.  The
+  // batch reports the least favourable cache status of its parts.
+  const upstream = new Map();
+  const statuses = new Set();
+  let remaining = null;
+  const fetchRuns = (pathAndSearch) => {
+    if (!upstream.has(pathAndSearch)) {
+      upstream.set(pathAndSearch, githubFetch(pathAndSearch, env, ctx)
+        .then(({ entry, cacheStatus }) => {
+          statuses.add(cacheStatus);
+          const left = entry.headers.get("X-RateLimit-Remaining");
+          if (left !== null) remaining = Math.min(remaining ?? Infinity, Number(left));
+          if (entry.status < 200 || entry.status >= 300) throw new Error(`HTTP ${entry.status}`);
+          return JSON.parse(entry.body);
+        }));
+    }
+    return upstream.get(pathAndSearch);
+  };
+
+  await Promise.all(jobs.map(async (job) => {
+    if (!job.allowed || !githubPathAllowed(job.path)) {
+      job.proj.errors[job.key] = "Path not allowed";
+      return;
+    }
+    try {
+      const runs = (await fetchRuns(job.path + job.search)).workflow_runs || [];
+      if (job.key === "recent_branches") {
+        job.proj.recent_branches = recentBranches(runs, job.wanted);
+      } else if (runs.length) {
+        job.proj.workflows[job.key] = runSummary(runs[0]);
+      } else {
+        job.proj.errors[job.key] = "no runs found";
+      }
+    } catch (err) {
+      job.proj.errors[job.key] = err.message;
+    }
+  }));
+
+  for (const proj of Object.values(projects)) {
+    if (!Object.keys(proj.errors).length) delete proj.errors;
+  }
+  const headers = { ...corsHeaders };
+  if (remaining !== null) headers["X-RateLimit-Remaining"] = String(remaining);
+  const cacheStatus = ["BYPASS", "MISS", "STALE", "HIT"].find((s) => statuses.has(s));
+  if (cacheStatus) headers["X-Cache"] = cacheStatus;
+  return jsonResponse(200, { baked_at: timestamp(), projects }, headers);
+}
+
+/**
+ * Recompute the snapshot and store it in KV (cron trigger).
+ *
+ * SNAPSHOT_CONFIG lists, per project, the calls bake_ci_data would make
+ * (see build_dashboard.py --worker-config), and the payload has the same
+ * shape.  Entries are answered from one /actions/runs sweep per repository;
+ * workflows missing from the sweep get their own request, which also
+ * refreshes that URL in the edge cache for live viewers.  Entries whose
+ * request fails keep their value from the previous snapshot.
+ */
+async function prewarmSnapshot(env, ctx) {
+  if (!env.CI_SNAPSHOT || !env.SNAPSHOT_CONFIG || !env.GITHUB_TOKEN) return null;
+  const config = typeof env.SNAPSHOT_CONFIG === "string"
+    ? JSON.parse(env.SNAPSHOT_CONFIG) : env.SNAPSHOT_CONFIG;
+  const previous = await env.CI_SNAPSHOT.get(SNAPSHOT_KEY, "json");
+  const payload = await computeSnapshot(config, previous, env, ctx);
+  await env.CI_SNAPSHOT.put(SNAPSHOT_KEY, JSON.stringify(payload), {
+    metadata: { baked_at: payload.baked_at },
+  });
+  return payload;
+}
+
+async function computeSnapshot(config, previous, env, ctx) {
+  const fetchedAt = timestamp();
+  const maxBranches = config.max_recent_branches ?? 2;
+  const prevProjects = (previous && previous.projects) || {};
+  const projects = config.projects || [];
+
+  let budget = MAX_SNAPSHOT_CALLS;
+  const getRuns = async (pathAndSearch, options) => {
+    if (budget-- <= 0) throw new Error("subrequest budget exhausted");
+    const { entry } = await githubFetch(pathAndSearch, env, ctx, options);
+    if (entry.status < 200 || entry.status >= 300) throw new Error(`HTTP ${entry.status}`);
+    return JSON.parse(entry.body).workflow_runs || [];
+  };
+
+  // Sweeps need each run's workflow path, which the projection drops.
+  const sweeps = await Promise.all(projects.map((p) =>
+    getRuns(`/repos/${p.owner}/${p.repo}/actions/runs?per_page=${SWEEP_PAGE_SIZE}`,
+            { cache: false, project: false })
+      .catch(() => null)));
+
+  const baked = {};
+  await Promise.all(projects.map(async (p, i) => {
+    const runs = sweeps[i];
+    const prev = prevProjects[p.id] || {};
+    const out = (baked[p.id] = { workflows: {} });
+    const base = `/repos/${p.owner}/${p.repo}/actions`;
+
+    const latest = async (file, branch) => {
+      const swept = runs && latestRun(runs, file, branch);
+      if (swept) return swept;
+      const query = branch ? `?branch=${encodeURIComponent(branch)}&per_page=1` : "?per_page=1";
+      return (await getRuns(`${base}/workflows/${file}/runs${query}`, { refresh: true }))[0];
+    };
+    const jobs = [
+      ...(p.workflows || []).map((file) => ["workflows", file, latest(file, DEFAULT_BRANCH)]),
+      ...(p.panel_workflows || []).map((file) => ["panel_workflows", file, latest(file, null)]),
+    ];
+    const results = await Promise.allSettled(jobs.map((job) => job[2]));
+    jobs.forEach(([section, file], k) => {
+      const { status, value } = results[k];
+      let entry = null;
+      if (status === "fulfilled" && value) {
+        entry = { ...runSummary(value, section === "panel_workflows"), fetched_at: fetchedAt };
+      } else if (status === "rejected") {
+        entry = (prev[section] || {})[file] || null;
+      }
+      if (entry) (out[section] = out[section] || {})[file] = entry;
+    });
+
+    if (!p.fixed_branch) {
+      try {
+        const recent = runs
+          ? runs.slice(0, RECENT_RUNS_WINDOW)
+          : await getRuns(`${base}/runs?per_page=${RECENT_RUNS_WINDOW}`, { refresh: true });
+        out.recent_branches = recentBranches(recent, maxBranches);
+        out.branches_fetched_at = fetchedAt;
+      } catch {
+        if (prev.recent_branches) {
+          out.recent_branches = prev.recent_branches;
+          out.branches_fetched_at = prev.branches_fetched_at || "";
+        }
+      }
+    }
+  }));
+
+  // Projects in config order, as in the bake.
+  const ordered = {};
+  for (const p of projects) ordered[p.id] = baked[p.id];
+  return { baked_at: fetchedAt, projects: ordered };
+}
+
+function latestRun(runs, file, branch) {
+  return runs.find((run) => (run.path || "").split("/").pop() === file
+    && (branch === null || run.head_branch === branch));
+}
+
+function runSummary(run, withBranch = false) {
+  const summary = {
+    conclusion: run.conclusion || run.status || "unknown",
+    updated_at: run.updated_at || "",
+  };
+  if (withBranch) summary.head_branch = run.head_branch || "";
+  return summary;
+}
+
+function timestamp() {
+  return new Date(Date.now()).toISOString().replace(/\.\d{3}Z$/, "Z");
+}
+
+function recentBranches(runs, wanted) {
+  const branches = [];
+  for (const run of runs) {
+    const b = run.head_branch;
+    if (b && b !== DEFAULT_BRANCH && !branches.includes(b)) {
+      branches.push(b);
+      if (branches.length >= wanted) break;
+    }
+  }
+  return branches;
+}
+
 function jsonResponse(status, body, corsHeaders) {
   return new Response(JSON.stringify(body), {
     status,
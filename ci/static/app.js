@@ -7,7 +7,7 @@
    CONFIGURATION CONSTANTS (injected by build_dashboard.py):
      PROJECTS, LANDING_TITLE, LAUNCH_PANEL_TYPES, LAUNCH_PANEL_URLS,
      DEFAULT_THEME, THEME_LABELS, WORKER_URL, MAX_RECENT_BRANCHES,
-     PREFETCHED_CI_DATA, CI_OVERVIEW_PROJECTS
+     PREFETCHED_CI_DATA, CI_DATA_URL, CI_OVERVIEW_PROJECTS
 ══════════════════════════════════════════════════════════════════════════ */
 
 /* ── API URL helpers ─────────────────────────────────────────────────────
@@ -25,6 +25,217 @@ function ccApiUrl(path) {
   return 'https://api.codecov.io' + path;
 }
 
+const GH_REQUEST = { headers: { 'Accept': 'application/vnd.github+json' } };
+
+/* ── API response cache ──────────────────────────────────────────────────
+   GitHub/Codecov responses are kept in memory and in localStorage, so
+   revisiting a panel or reloading the page renders at once.  A response
+   younger than its endpoint's TTL is used as-is; an older one (up to
+   API_CACHE_MAX_AGE) is shown immediately while a background request
+   revalidates it (stale-while-revalidate) and repaints via onUpdate if it
+   changed.  Only the fields the dashboard reads are persisted, and at most
+   API_CACHE_MAX_ENTRIES of them: the least recently used entries are
+   evicted beyond that, or earlier when localStorage reports it is full.
+
+   Concurrent requests for the same URL share one fetch.  Callers may pass
+   an AbortSignal; the shared fetch is cancelled once every caller waiting
+   on it has aborted, and aborted callers reject with an AbortError that
+   their error handlers ignore (see isAbortError).                        */
+
+const API_CACHE_TTL = [
+  // [URL pattern, fresh for (ms)]
+  [/\/actions\/workflows\/[^/]+\/runs/, 60 * 1000],
+  [/\/actions\/runs/,                   60 * 1000],
+  [/\/api\/v2\//,                  10 * 60 * 1000],
+  [/\/batch\?/,                        60 * 1000],
+  [/\/snapshot$/,                       30 * 1000],
+];
+const API_CACHE_MAX_AGE = 24 * 60 * 60 * 1000;
+const API_CACHE_PREFIX  = 'viper-api:';
+const API_CACHE_MAX_ENTRIES = 200;
+
+const apiCache       = new Map();   // url → { at, data }
+const apiCacheStored = new Set();   // persisted urls, least recently used first
+const apiInFlight    = new Map();   // url → { promise, controller, waiters }
+
+function apiCacheTtl(url) {
+  const rule = API_CACHE_TTL.find(([re]) => re.test(url));
+  return rule ? rule[1] : 0;
+}
+
+function slimApiResponse(data) {
+  if (!data) return data;
+  if ('totals' in data) {
+    return { totals: data.totals, branch: data.branch, updatestamp: data.updatestamp };
+  }
+  if (!Array.isArray(data.workflow_runs)) return data;
+  return {
+    total_count:   data.total_count,
+    workflow_runs: data.workflow_runs.map(r => ({
+      name:        r.name,
+      status:      r.status,
+      conclusion:  r.conclusion,
+      head_branch: r.head_branch,
+      updated_at:  r.updated_at,
+    })),
+  };
+}
+
+function apiCacheGet(url) {
+  let entry = apiCache.get(url);
+  let stored = apiCacheStored.has(url);
+  if (!entry) {
+    try {
+      entry = JSON.parse(localStorage.getItem(API_CACHE_PREFIX + url));
+    } catch {
+      entry = null;
+    }
+    if (!entry) return null;
+    apiCache.set(url, entry);
+    stored = true;
+  }
+  if (Date.now() - entry.at > API_CACHE_MAX_AGE) {
+    apiCacheEvict(url);
+    return null;
+  }
+  if (stored) apiCacheTouch(url);
+  return entry;
+}
+
+function apiCacheTouch(url) {
+  apiCacheStored.delete(url);
+  apiCacheStored.add(url);
+}
+
+function apiCacheEvict(url) {
+  apiCache.delete(url);
+  apiCacheStored.delete(url);
+  try { localStorage.removeItem(API_CACHE_PREFIX + url); } catch { /* unavailable */ }
+}
+
+/* Evict the least recently used persisted entry other than keep; false
+   when there is none. */
+function apiCacheEvictOldest(keep) {
+  for (const url of apiCacheStored) {
+    if (url !== keep) {
+      apiCacheEvict(url);
+      return true;
+    }
+  }
+  return false;
+}
+
+function isQuotaError(err) {
+  return err && (err.name === 'QuotaExceededError' || err.name === 'NS_ERROR_DOM_QUOTA_REACHED');
+}
+
+function apiCachePut(url, data) {
+  const entry = { at: Date.now(), data: slimApiResponse(data) };
+  const value = JSON.stringify(entry);
+  apiCache.set(url, entry);
+  for (;;) {
+    try {
+      localStorage.setItem(API_CACHE_PREFIX + url, value);
+      apiCacheTouch(url);
+      break;
+    } catch (err) {
+      /* Storage full: make room and retry.  Disabled storage (or nothing
+         left to evict) leaves the in-memory copy, which still works. */
+      if (!isQuotaError(err) || !apiCacheEvictOldest(url)) break;
+    }
+  }
+  while (apiCacheStored.size > API_CACHE_MAX_ENTRIES) {
+    if (!apiCacheEvictOldest(url)) break;
+  }
+  return entry.data;
+}
+
+/* Drop expired entries and index the rest, oldest first, for eviction. */
+function pruneApiCache() {
+  try {
+    const urls = [];
+    for (let i = 0; i < localStorage.length; i++) {
+      const key = localStorage.key(i);
+      if (key && key.startsWith(API_CACHE_PREFIX)) urls.push(key.slice(API_CACHE_PREFIX.length));
+    }
+    const kept = urls.map(url => [url, apiCacheGet(url)]).filter(([, entry]) => entry);
+    kept.sort((a, b) => a[1].at - b[1].at).forEach(([url]) => apiCacheTouch(url));
+    while (apiCacheStored.size > API_CACHE_MAX_ENTRIES) apiCacheEvictOldest();
+  } catch {
+    /* Storage unavailable */
+  }
+}
+
+function isAbortError(err) {
+  return err && err.name === 'AbortError';
+}
+
+function fetchApiJson(url, init, signal) {
+  let flight = apiInFlight.get(url);
+  if (!flight) {
+    const controller = new AbortController();
+    const promise = fetch(url, { ...init, signal: controller.signal })
+      .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
+      .then(data => apiCachePut(url, data))
+      .finally(() => { if (apiInFlight.get(url) === flight) apiInFlight.delete(url); });
+    flight = { promise, controller, waiters: 0 };
+    apiInFlight.set(url, flight);
+  }
+  flight.waiters++;
+  if (!signal) return flight.promise;
+
+  return new Promise((resolve, reject) => {
+    const onAbort = () => {
+      if (--flight.waiters === 0) {
+        if (apiInFlight.get(url) === flight) apiInFlight.delete(url);
+        flight.controller.abort();
+      }
+      reject(new DOMException('Request aborted', 'AbortError'));
+    };
+    if (signal.aborted) {
+      onAbort();
+      return;
+    }
+    signal.addEventListener('abort', onAbort, { once: true });
+    flight.promise
+      .then(resolve, reject)
+      .finally(() => signal.removeEventListener('abort', onAbort));
+  });
+}
+
+/* Resolve with the best available data for url: fresh cache, else stale
+   cache (revalidated in the background), else the network.  onUpdate is
+   called with the revalidated data when it differs from what was shown. */
+function cachedApiJson(url, init, onUpdate, signal) {
+  const entry = apiCacheGet(url);
+  if (!entry) return fetchApiJson(url, init, signal);
+  if (Date.now() - entry.at > apiCacheTtl(url)) {
+    const shown = JSON.stringify(entry.data);
+    fetchApiJson(url, init, signal)
+      .then(data => { if (onUpdate && JSON.stringify(data) !== shown) onUpdate(data); })
+      .catch(() => { /* keep showing the stale copy */ });
+  }
+  return Promise.resolve(entry.data);
+}
+
+/* ── Panel request scope ─────────────────────────────────────────────────
+   Requests started by a CI or coverage panel are aborted when the visible
+   panel changes, so a slow response can never paint into the panel that
+   replaced it.                                                           */
+
+let panelController = null;
+
+function abortPanelRequests() {
+  if (panelController) panelController.abort();
+  panelController = null;
+}
+
+function panelSignal() {
+  abortPanelRequests();
+  panelController = new AbortController();
+  return panelController.signal;
+}
+
 /* ── SVG icons for each category type ────────────────────────────────── */
 const ICONS = {
   report: `<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
@@ -90,6 +301,59 @@ const LAUNCH_REASONS = {
 let activeProject  = null;
 let activeCategory = null;
 
+/* ── Baked CI snapshot ───────────────────────────────────────────────────
+   With a sidecar data file (build_dashboard.py --data-file) the snapshot
+   is fetched from CI_DATA_URL at startup, so the HTML shell stays cached
+   across bakes.  Otherwise, or if that fetch fails, the inlined
+   PREFETCHED_CI_DATA is used (null = live mode).
+
+   The Worker recomputes the same payload every few minutes (cron trigger)
+   and serves it from /snapshot.  The table is first rendered from the
+   baked data; when the Worker's copy turns out newer it is patched in, so
+   a slow or unreachable Worker never holds up the page.                  */
+
+// A Worker snapshot younger than this stands in for live per-row requests.
+const LIVE_SNAPSHOT_MAX_AGE = 10 * 60 * 1000;
+// Give up on the Worker snapshot after this long.
+const WORKER_SNAPSHOT_TIMEOUT = 5 * 1000;
+
+let ciSnapshot = PREFETCHED_CI_DATA;
+
+function fetchWorkerSnapshot() {
+  if (!WORKER_URL) return Promise.resolve(null);
+  return cachedApiJson(WORKER_URL + '/snapshot', undefined, undefined,
+                       AbortSignal.timeout(WORKER_SNAPSHOT_TIMEOUT))
+    .catch(() => null);
+}
+
+function isRecentSnapshot(snap) {
+  return Boolean(snap && snap.baked_at
+    && Date.now() - new Date(snap.baked_at).getTime() < LIVE_SNAPSHOT_MAX_AGE);
+}
+
+async function loadCISnapshot() {
+  if (!CI_DATA_URL) return;
+  try {
+    // no-cache: always revalidate (a 304 when the data is unchanged)
+    const r = await fetch(CI_DATA_URL, { cache: 'no-cache' });
+    if (!r.ok) throw new Error('HTTP ' + r.status);
+    ciSnapshot = await r.json();
+  } catch (err) {
+    console.warn('CI data file unavailable (' + err.message + '); using inlined data');
+  }
+}
+
+/* Patch the rendered snapshot table with the Worker's copy if it is newer.
+   Live mode (no baked data, or a Refresh) asks the Worker by itself.      */
+async function applyWorkerSnapshot() {
+  if (!ciSnapshot) return;
+  const snap = await fetchWorkerSnapshot();
+  if (!snap || !snap.projects || !(snap.baked_at > ciSnapshot.baked_at)) return;
+  if (!document.querySelector('#ci-data-status .ci-data-age')) return;  // gone live
+  autoRefresh.digest = overviewDigest(snap);
+  patchOverview(snap);
+}
+
 /* ══════════════════════════════════════════════════════════════════════════
    LANDING PAGE — CI OVERVIEW TABLE
 ══════════════════════════════════════════════════════════════════════════ */
@@ -106,14 +370,20 @@ const CI_CONCLUSION_MAP = {
   skipped:   ['#7a8ba8', 'skipped'],
 };
 
-async function fetchRecentBranches(owner, repo) {
+function workflowRunsUrl(owner, repo, file, branch) {
+  return ghApiUrl(`/repos/${owner}/${repo}/actions/workflows/${file}/runs` +
+                  `?branch=${encodeURIComponent(branch)}&per_page=1`);
+}
+
+function recentRunsUrl(owner, repo) {
+  return ghApiUrl(`/repos/${owner}/${repo}/actions/runs?per_page=30`);
+}
+
+/* fresh (a forced refresh) skips the response cache. */
+async function fetchRecentBranches(owner, repo, fresh) {
   try {
-    const r = await fetch(
-      ghApiUrl(`/repos/${owner}/${repo}/actions/runs?per_page=30`),
-      { headers: { 'Accept': 'application/vnd.github+json' } }
-    );
-    if (!r.ok) return [];
-    const data = await r.json();
+    const url  = recentRunsUrl(owner, repo);
+    const data = await (fresh ? fetchApiJson(url, GH_REQUEST) : cachedApiJson(url, GH_REQUEST));
     const seen     = new Set();
     const branches = [];
     for (const run of (data.workflow_runs || [])) {
@@ -130,39 +400,38 @@ async function fetchRecentBranches(owner, repo) {
   }
 }
 
-function fetchWorkflowRow(owner, repo, file, branch, dotEl, statusEl, branchEl, timeEl) {
+function fetchWorkflowRow(owner, repo, file, branch, dotEl, statusEl, branchEl, timeEl, signal,
+                          fresh) {
   branchEl.textContent     = branch;
   dotEl.style.background   = 'var(--border)';
   statusEl.textContent     = 'Fetching\u2026';
   statusEl.style.color     = '';
   timeEl.textContent       = '';
+  delete statusEl.dataset.conclusion;
+  delete timeEl.dataset.time;
+
+  const render = data => {
+    const run = (data.workflow_runs || [])[0];
+    if (run) {
+      paintWorkflowRow({ conclusion: run.conclusion || run.status || 'unknown',
+                         updated_at: run.updated_at }, dotEl, statusEl, timeEl);
+    } else {
+      statusEl.textContent = 'no runs found';
+    }
+  };
 
-  fetch(
-    ghApiUrl(`/repos/${owner}/${repo}/actions/workflows/${file}/runs` +
-    `?branch=${encodeURIComponent(branch)}&per_page=1`),
-    { headers: { 'Accept': 'application/vnd.github+json' } }
-  )
-    .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
-    .then(data => {
-      const run = (data.workflow_runs || [])[0];
-      if (run) {
-        const [color, label] = CI_CONCLUSION_MAP[run.conclusion]
-          || ['#7a8ba8', run.conclusion || run.status || 'unknown'];
-        dotEl.style.background = color;
-        statusEl.textContent   = label;
-        statusEl.style.color   = color;
-        timeEl.textContent     = relTime(new Date(run.updated_at));
-      } else {
-        statusEl.textContent = 'no runs found';
-      }
-    })
+  const url = workflowRunsUrl(owner, repo, file, branch);
+  return (fresh ? fetchApiJson(url, GH_REQUEST, signal)
+                : cachedApiJson(url, GH_REQUEST, render, signal))
+    .then(render)
     .catch(err => {
+      if (isAbortError(err)) return;
       dotEl.style.background = 'var(--border)';
       statusEl.textContent   = 'unavailable (' + err.message + ')';
     });
 }
 
-function refreshProjectRows(tbody, owner, repo, projId, workflows, branch) {
+function refreshProjectRows(tbody, owner, repo, projId, workflows, branch, signal) {
   workflows.forEach(wf => {
     const row = tbody.querySelector(`tr[data-proj="${projId}"][data-wf="${wf.file}"]`);
     if (!row) return;
@@ -170,7 +439,7 @@ function refreshProjectRows(tbody, owner, repo, projId, workflows, branch) {
     const statusEl = row.querySelector('.ci-ov-status');
     const branchEl = row.querySelector('.ci-ov-branch');
     const timeEl   = row.querySelector('.ci-ov-time');
-    fetchWorkflowRow(owner, repo, wf.file, branch, dotEl, statusEl, branchEl, timeEl);
+    fetchWorkflowRow(owner, repo, wf.file, branch, dotEl, statusEl, branchEl, timeEl, signal);
   });
 }
 
@@ -187,17 +456,33 @@ function resizeBranchSelect(sel) {
 
 function buildCIOverview(forceLive) {
   const projects = CI_OVERVIEW_PROJECTS;
-  const usePrebaked = PREFETCHED_CI_DATA && !forceLive;
+  const usePrebaked = ciSnapshot && !forceLive;
 
   const statusBar = document.getElementById('ci-data-status');
   if (usePrebaked) {
-    const age = relTime(new Date(PREFETCHED_CI_DATA.baked_at));
     statusBar.innerHTML =
-      'Snapshot from ' + age +
+      'Snapshot from <span class="ci-data-age"></span>' +
       '&ensp;<a href="#" class="ci-refresh-link" ' +
       'onclick="buildCIOverview(true);return false;">&#x21BA; Refresh</a>';
+    setRelTime(statusBar.querySelector('.ci-data-age'), ciSnapshot.baked_at);
   } else {
-    statusBar.textContent = 'Live data';
+    statusBar.innerHTML =
+      '<span class="ci-live-source">Loading live data\u2026</span>' +
+      '&ensp;<a href="#" class="ci-refresh-link" ' +
+      'onclick="buildCIOverview(true);return false;">&#x21BA; Refresh</a>';
+  }
+  const sourceEl = statusBar.querySelector('.ci-live-source');
+  if (canAutoRefresh()) {
+    const toggle = document.createElement('a');
+    toggle.href = '#';
+    toggle.className = 'ci-refresh-link ci-autorefresh-link';
+    toggle.title = 'Poll for new data while this tab is visible';
+    toggle.addEventListener('click', e => {
+      e.preventDefault();
+      setAutoRefresh(!autoRefresh.enabled);
+    });
+    statusBar.appendChild(toggle);
+    renderAutoRefreshToggle();
   }
 
   const container = document.getElementById('ci-overview');
@@ -226,6 +511,9 @@ function buildCIOverview(forceLive) {
   table.appendChild(thead);
 
   const tbody = document.createElement('tbody');
+  const liveRows    = [];
+  const liveSelects = [];
+  overview = { rows: [], selects: [] };
 
   projects.forEach(cfg => {
     const proj  = PROJECTS.find(p => p.id.trim() === cfg.id);
@@ -235,7 +523,7 @@ function buildCIOverview(forceLive) {
     const { owner, repo } = ciCat.github;
     const actionsUrl      = ciCat.url;
 
-    const projBaked = usePrebaked ? (PREFETCHED_CI_DATA.projects || {})[cfg.id] : null;
+    const projBaked = usePrebaked ? (ciSnapshot.projects || {})[cfg.id] : null;
 
     const projRow = document.createElement('tr');
     projRow.className = 'ci-ov-proj-row';
@@ -267,29 +555,22 @@ function buildCIOverview(forceLive) {
 
       requestAnimationFrame(() => resizeBranchSelect(selectEl));
 
+      const selectRec = { id: cfg.id, owner, repo, selectEl };
+      overview.selects.push(selectRec);
       if (projBaked && projBaked.recent_branches && projBaked.recent_branches.length) {
-        projBaked.recent_branches.forEach(b => {
-          const opt = document.createElement('option');
-          opt.value = b;
-          opt.textContent = b.length > 40 ? b.slice(0, 37) + '\u2026' : b;
-          selectEl.appendChild(opt);
-        });
-        resizeBranchSelect(selectEl);
+        setBranchOptions(selectEl, projBaked.recent_branches);
       } else {
-        fetchRecentBranches(owner, repo).then(branches => {
-          branches.forEach(b => {
-            const opt = document.createElement('option');
-            opt.value = b;
-            opt.textContent = b.length > 40 ? b.slice(0, 37) + '\u2026' : b;
-            selectEl.appendChild(opt);
-          });
-          resizeBranchSelect(selectEl);
-        });
+        liveSelects.push(selectRec);
       }
 
+      // Switching branch again cancels the rows still loading for the last one.
+      let branchController = null;
       selectEl.addEventListener('change', () => {
         resizeBranchSelect(selectEl);
-        refreshProjectRows(tbody, owner, repo, cfg.id, cfg.workflows, selectEl.value);
+        if (branchController) branchController.abort();
+        branchController = new AbortController();
+        refreshProjectRows(tbody, owner, repo, cfg.id, cfg.workflows, selectEl.value,
+                           branchController.signal);
       });
 
       branchTd.appendChild(selectEl);
@@ -351,24 +632,297 @@ function buildCIOverview(forceLive) {
       row.appendChild(timeTd);
       tbody.appendChild(row);
 
+      const rowRec = { id: cfg.id, owner, repo, wf, selectEl,
+                       dot, statusEl: statusSpan, branchEl: branchSpan, timeEl: timeSpan };
+      overview.rows.push(rowRec);
       const wfBaked = projBaked ? (projBaked.workflows || {})[wf.file] : null;
       if (wfBaked) {
-        const [color, label] = CI_CONCLUSION_MAP[wfBaked.conclusion]
-          || ['#7a8ba8', wfBaked.conclusion || 'unknown'];
-        dot.style.background   = color;
-        statusSpan.textContent = label;
-        statusSpan.style.color = color;
-        branchSpan.textContent = 'main';
-        timeSpan.textContent   = relTime(new Date(wfBaked.updated_at));
+        paintWorkflowRow(wfBaked, dot, statusSpan, timeSpan);
       } else {
         statusSpan.textContent = 'Fetching\u2026';
-        fetchWorkflowRow(owner, repo, wf.file, 'main', dot, statusSpan, branchSpan, timeSpan);
+        liveRows.push(rowRec);
       }
     });
   });
 
   table.appendChild(tbody);
   container.appendChild(table);
+
+  const loaded = liveRows.length || liveSelects.length
+    ? loadLiveOverview(liveRows, liveSelects, forceLive)
+    : Promise.resolve({ live: true });
+  if (sourceEl) loaded.then(source => showLiveSource(sourceEl, source));
+}
+
+/* Say where live-mode data came from: "Live data" only when every
+   response came over the network. */
+function showLiveSource(el, source) {
+  if (source.live) {
+    el.textContent = 'Live data';
+    return;
+  }
+  el.innerHTML = (source.snapshot ? 'Snapshot' : 'Cached data') + ' from <span></span>';
+  setRelTime(el.firstElementChild,
+             source.snapshot || new Date(source.cachedAt).toISOString());
+}
+
+function paintWorkflowRow(entry, dotEl, statusEl, timeEl) {
+  const [color, label] = CI_CONCLUSION_MAP[entry.conclusion]
+    || ['#7a8ba8', entry.conclusion || 'unknown'];
+  dotEl.style.background      = color;
+  statusEl.textContent        = label;
+  statusEl.style.color        = color;
+  statusEl.dataset.conclusion = entry.conclusion;
+  setRelTime(timeEl, entry.updated_at);
+}
+
+function setBranchOptions(selectEl, branches) {
+  const selected = selectEl.value;
+  while (selectEl.options.length > 1) selectEl.remove(1);
+  branches.forEach(b => {
+    const opt = document.createElement('option');
+    opt.value = b;
+    opt.textContent = b.length > 40 ? b.slice(0, 37) + '\u2026' : b;
+    selectEl.appendChild(opt);
+  });
+  if (branches.includes(selected)) selectEl.value = selected;
+  resizeBranchSelect(selectEl);
+}
+
+/* ── Live landing data ───────────────────────────────────────────────────
+   Rows without baked data are filled from the Worker's pre-warmed
+   snapshot when it is recent, else from a single /batch round trip; both
+   have the same shape as the baked snapshot.  Without a Worker, or for
+   anything neither could answer, each row falls back to its own request.
+   Resolves with where the data came from, for the status bar.           */
+
+function statusBatchUrl(rows, selects) {
+  const items = new Map();
+  const item = r => {
+    if (!items.has(r.id)) {
+      items.set(r.id, { id: r.id, repo: r.owner + '/' + r.repo, workflows: [] });
+    }
+    return items.get(r.id);
+  };
+  rows.forEach(r => item(r).workflows.push(r.wf.file));
+  selects.forEach(s => { item(s).branches = MAX_RECENT_BRANCHES; });
+  return WORKER_URL + '/batch?q=' + encodeURIComponent(JSON.stringify([...items.values()]));
+}
+
+function loadLiveOverview(rows, selects, fresh) {
+  // The oldest cached response shown instead of a network one, if any
+  let cachedAt = Infinity;
+  const noteCache = url => {
+    const entry = fresh ? null : apiCacheGet(url);
+    if (entry) cachedAt = Math.min(cachedAt, entry.at);
+  };
+  const source = () => (cachedAt < Infinity ? { cachedAt } : { live: true });
+
+  const fetchRow = r => {
+    noteCache(workflowRunsUrl(r.owner, r.repo, r.wf.file, 'main'));
+    return fetchWorkflowRow(r.owner, r.repo, r.wf.file, 'main', r.dot, r.statusEl,
+                            r.branchEl, r.timeEl, undefined, fresh);
+  };
+  const fetchBranches = s => {
+    noteCache(recentRunsUrl(s.owner, s.repo));
+    return fetchRecentBranches(s.owner, s.repo, fresh)
+      .then(branches => setBranchOptions(s.selectEl, branches));
+  };
+
+  if (!WORKER_URL) {
+    return Promise.all([...rows.map(fetchRow), ...selects.map(fetchBranches)]).then(source);
+  }
+
+  const apply = snap => {
+    const projects = (snap && snap.projects) || {};
+    const pending  = [];
+    rows.forEach(r => {
+      if (r.selectEl && r.selectEl.value !== 'main') return;  // showing another branch
+      const entry = ((projects[r.id] || {}).workflows || {})[r.wf.file];
+      if (entry) paintWorkflowRow(entry, r.dot, r.statusEl, r.timeEl);
+      else pending.push(fetchRow(r));
+    });
+    selects.forEach(s => {
+      const branches = (projects[s.id] || {}).recent_branches;
+      if (branches) setBranchOptions(s.selectEl, branches);
+      else pending.push(fetchBranches(s));
+    });
+    return Promise.all(pending);
+  };
+  // A forced refresh goes to the network, past the Worker snapshot and
+  // the response cache.
+  const batchUrl = statusBatchUrl(rows, selects);
+  const batch = () => {
+    if (fresh) return fetchApiJson(batchUrl).then(apply);
+    noteCache(batchUrl);
+    return cachedApiJson(batchUrl, undefined, apply).then(apply);
+  };
+  if (fresh) return batch().catch(() => apply(null)).then(source);
+  return fetchWorkerSnapshot()
+    .then(snap => (isRecentSnapshot(snap)
+      ? apply(snap).then(() => ({ snapshot: snap.baked_at }))
+      : batch().then(source)))
+    .catch(() => apply(null).then(source));
+}
+
+/* ── Landing auto-refresh ────────────────────────────────────────────────
+   With auto-refresh on (status-bar toggle, remembered; or ?autorefresh in
+   the URL for wall-mounted screens) the landing table polls for new data
+   while the tab is visible and the landing page is shown.  The interval
+   doubles up to AUTO_REFRESH_MAX while nothing changes and drops back to
+   AUTO_REFRESH_MIN when something does; only changed rows are repainted.
+   "… ago" labels (elements with data-time) tick locally, without network,
+   while the tab is visible.                                              */
+
+const AUTO_REFRESH_MIN = 60 * 1000;
+const AUTO_REFRESH_MAX = 10 * 60 * 1000;
+const RELTIME_TICK     = 15 * 1000;
+
+const autoRefresh = { enabled: false, timer: null, delay: AUTO_REFRESH_MIN, due: 0, digest: '' };
+let overview      = { rows: [], selects: [] };   // set by buildCIOverview
+let relTimeTimer  = null;
+
+function setRelTime(el, iso) {
+  el.dataset.time = iso || '';
+  el.textContent  = relTime(new Date(iso));
+}
+
+function tickRelTimes() {
+  document.querySelectorAll('[data-time]').forEach(el => {
+    if (el.dataset.time) el.textContent = relTime(new Date(el.dataset.time));
+  });
+}
+
+function startRelTimeTicker() {
+  if (!relTimeTimer) relTimeTimer = setInterval(tickRelTimes, RELTIME_TICK);
+}
+
+function canAutoRefresh() {
+  return Boolean(WORKER_URL || CI_DATA_URL);
+}
+
+/* What the table shows, ignoring bake timestamps. */
+function overviewDigest(snap) {
+  const projects = (snap && snap.projects) || {};
+  return JSON.stringify(Object.keys(projects).sort().map(id => [
+    id,
+    Object.entries(projects[id].workflows || {})
+      .map(([file, e]) => [file, e.conclusion, e.updated_at]),
+    projects[id].recent_branches || [],
+  ]));
+}
+
+function fetchOverviewData() {
+  if (WORKER_URL) {
+    return fetchApiJson(WORKER_URL + '/snapshot')
+      .then(snap => (isRecentSnapshot(snap) ? snap : Promise.reject(new Error('stale'))))
+      .catch(() => fetchApiJson(statusBatchUrl(overview.rows, overview.selects)));
+  }
+  return fetch(CI_DATA_URL, { cache: 'no-cache' })
+    .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); });
+}
+
+function patchOverview(snap) {
+  const projects = snap.projects || {};
+  overview.rows.forEach(r => {
+    if (r.selectEl && r.selectEl.value !== 'main') return;  // showing another branch
+    const entry = ((projects[r.id] || {}).workflows || {})[r.wf.file];
+    if (entry && (r.statusEl.dataset.conclusion !== entry.conclusion
+                  || r.timeEl.dataset.time !== entry.updated_at)) {
+      paintWorkflowRow(entry, r.dot, r.statusEl, r.timeEl);
+    }
+  });
+  overview.selects.forEach(s => {
+    const branches = (projects[s.id] || {}).recent_branches;
+    const shown = [...s.selectEl.options].slice(1).map(o => o.value);
+    if (branches && branches.join('\n') !== shown.join('\n')) {
+      setBranchOptions(s.selectEl, branches);
+    }
+  });
+  const age = document.querySelector('#ci-data-status .ci-data-age');
+  if (age && snap.baked_at) {
+    ciSnapshot = snap;
+    setRelTime(age, snap.baked_at);
+  }
+}
+
+function landingVisible() {
+  return document.getElementById('landing').style.display !== 'none';
+}
+
+function scheduleAutoRefresh(delay) {
+  clearTimeout(autoRefresh.timer);
+  autoRefresh.timer = null;
+  if (!autoRefresh.enabled || document.hidden) return;
+  autoRefresh.due   = Date.now() + delay;
+  autoRefresh.timer = setTimeout(pollOverview, delay);
+}
+
+async function pollOverview() {
+  clearTimeout(autoRefresh.timer);
+  autoRefresh.timer = null;
+  let snap = null;
+  if (landingVisible()) {
+    try {
+      snap = await fetchOverviewData();
+    } catch {
+      snap = null;
+    }
+  }
+  const digest = snap ? overviewDigest(snap) : autoRefresh.digest;
+  if (digest !== autoRefresh.digest) {
+    autoRefresh.digest = digest;
+    autoRefresh.delay  = AUTO_REFRESH_MIN;
+    patchOverview(snap);
+  } else {
+    autoRefresh.delay = Math.min(autoRefresh.delay * 2, AUTO_REFRESH_MAX);
+  }
+  scheduleAutoRefresh(autoRefresh.delay);
+}
+
+function renderAutoRefreshToggle() {
+  const link = document.querySelector('.ci-autorefresh-link');
+  if (link) link.textContent = 'Auto-refresh: ' + (autoRefresh.enabled ? 'on' : 'off');
+}
+
+function setAutoRefresh(on) {
+  autoRefresh.enabled = on;
+  autoRefresh.delay   = AUTO_REFRESH_MIN;
+  try {
+    localStorage.setItem('dashboard-autorefresh', on ? '1' : '0');
+  } catch {
+    /* Storage full or disabled — the setting lasts for this page only */
+  }
+  renderAutoRefreshToggle();
+  scheduleAutoRefresh(autoRefresh.delay);
+}
+
+function initAutoRefresh() {
+  const param = new URLSearchParams(window.location.search).get('autorefresh');
+  let remembered = null;
+  try {
+    remembered = localStorage.getItem('dashboard-autorefresh');
+  } catch {
+    /* Storage unavailable */
+  }
+  autoRefresh.enabled = canAutoRefresh() && (param !== null ? param !== '0' : remembered === '1');
+  autoRefresh.digest = overviewDigest(ciSnapshot);
+  renderAutoRefreshToggle();
+
+  document.addEventListener('visibilitychange', () => {
+    if (document.hidden) {
+      clearTimeout(autoRefresh.timer);
+      autoRefresh.timer = null;
+      clearInterval(relTimeTimer);
+      relTimeTimer = null;
+      return;
+    }
+    tickRelTimes();
+    startRelTimeTicker();
+    scheduleAutoRefresh(Math.max(0, autoRefresh.due - Date.now()));
+  });
+  if (!document.hidden) startRelTimeTicker();
+  scheduleAutoRefresh(autoRefresh.delay);
 }
 
 /* ══════════════════════════════════════════════════════════════════════════
@@ -392,6 +946,7 @@ function goHome() {
 ══════════════════════════════════════════════════════════════════════════ */
 
 function showPanel(name) {
+  abortPanelRequests();
   document.getElementById('landing').style.display          = 'none';
   document.getElementById('main-frame').style.display       = 'none';
   document.getElementById('launch-panel').style.display     = 'none';
@@ -588,6 +1143,7 @@ function showLaunchPanel(cat) {
 function showCoveragePanel(cat) {
   document.getElementById('loader').classList.add('hidden');
   showPanel('coverage-panel');
+  const signal = panelSignal();
 
   const pctEl = document.getElementById('cov-pct');
   pctEl.innerHTML = '&nbsp;';
@@ -617,32 +1173,34 @@ function showCoveragePanel(cat) {
     const cc = cat.codecov;
     const apiUrl = ccApiUrl(`/api/v2/${cc.service}/${cc.owner}/repos/${cc.repo}/`);
 
-    fetch(apiUrl)
-      .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
-      .then(data => {
-        const totals = data.totals;
-        if (totals) {
-          const pct   = parseFloat(totals.coverage);
-          const color = pct >= 80 ? '#4ade80' : pct >= 60 ? '#fbbf24' : '#f87171';
-          pctEl.textContent     = isNaN(pct) ? '\u2014' : pct.toFixed(1) + '%';
-          pctEl.style.color     = color;
-          pctEl.style.minWidth  = '';
-          pctEl.style.minHeight = '';
-          pctEl.classList.remove('shimmer');
-          document.getElementById('cov-circle').style.borderColor = color;
-
-          document.getElementById('cov-lines').textContent  = totals.lines    != null ? totals.lines    : '\u2014';
-          document.getElementById('cov-hits').textContent   = totals.hits     != null ? totals.hits     : '\u2014';
-          document.getElementById('cov-misses').textContent = totals.misses   != null ? totals.misses   : '\u2014';
-          document.getElementById('cov-parts').textContent  = totals.partials != null ? totals.partials : '\u2014';
-        }
+    const renderCoverage = data => {
+      const totals = data.totals;
+      if (totals) {
+        const pct   = parseFloat(totals.coverage);
+        const color = pct >= 80 ? '#4ade80' : pct >= 60 ? '#fbbf24' : '#f87171';
+        pctEl.textContent     = isNaN(pct) ? '\u2014' : pct.toFixed(1) + '%';
+        pctEl.style.color     = color;
+        pctEl.style.minWidth  = '';
+        pctEl.style.minHeight = '';
+        pctEl.classList.remove('shimmer');
+        document.getElementById('cov-circle').style.borderColor = color;
 
-        clearShimmer('cov-name',    cc.owner + ' / ' + cc.repo);
-        clearShimmer('cov-branch',  'branch: ' + (data.branch || 'main'));
-        clearShimmer('cov-updated', data.updatestamp
-          ? 'Updated ' + relTime(new Date(data.updatestamp)) : '');
-      })
+        document.getElementById('cov-lines').textContent  = totals.lines    != null ? totals.lines    : '\u2014';
+        document.getElementById('cov-hits').textContent   = totals.hits     != null ? totals.hits     : '\u2014';
+        document.getElementById('cov-misses').textContent = totals.misses   != null ? totals.misses   : '\u2014';
+        document.getElementById('cov-parts').textContent  = totals.partials != null ? totals.partials : '\u2014';
+      }
+
+      clearShimmer('cov-name',    cc.owner + ' / ' + cc.repo);
+      clearShimmer('cov-branch',  'branch: ' + (data.branch || 'main'));
+      clearShimmer('cov-updated', data.updatestamp
+        ? 'Updated ' + relTime(new Date(data.updatestamp)) : '');
+    };
+
+    cachedApiJson(apiUrl, undefined, renderCoverage, signal)
+      .then(renderCoverage)
       .catch(err => {
+        if (isAbortError(err)) return;
         pctEl.textContent     = '\u2014';
         pctEl.style.minWidth  = '';
         pctEl.style.minHeight = '';
@@ -658,22 +1216,24 @@ function showCoveragePanel(cat) {
 
   if (cat.github) {
     const gh = cat.github;
-    fetch(ghApiUrl(`/repos/${gh.owner}/${gh.repo}/actions/runs?per_page=5`),
-          { headers: { 'Accept': 'application/vnd.github+json' } })
-      .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
-      .then(data => {
-        const runs = data.workflow_runs || [];
-        const run  = runs.find(r => r.status === 'completed') || runs[0];
-        if (run) {
-          const [color, label] = CI_CONCLUSION_MAP[run.conclusion] || ['#7a8ba8', run.conclusion || run.status || 'unknown'];
-          document.getElementById('cov-ci-dot').style.background = color;
-          document.getElementById('cov-ci-text').textContent = 'CI: ' + (run.name || 'Workflow') + ' \u2014 ' + label;
-          document.getElementById('cov-ci-time').textContent = relTime(new Date(run.updated_at));
-        } else {
-          document.getElementById('cov-ci-text').textContent = 'No CI runs found';
-        }
-      })
-      .catch(() => {
+    const renderCI = data => {
+      const runs = data.workflow_runs || [];
+      const run  = runs.find(r => r.status === 'completed') || runs[0];
+      if (run) {
+        const [color, label] = CI_CONCLUSION_MAP[run.conclusion] || ['#7a8ba8', run.conclusion || run.status || 'unknown'];
+        document.getElementById('cov-ci-dot').style.background = color;
+        document.getElementById('cov-ci-text').textContent = 'CI: ' + (run.name || 'Workflow') + ' \u2014 ' + label;
+        document.getElementById('cov-ci-time').textContent = relTime(new Date(run.updated_at));
+      } else {
+        document.getElementById('cov-ci-text').textContent = 'No CI runs found';
+      }
+    };
+
+    cachedApiJson(ghApiUrl(`/repos/${gh.owner}/${gh.repo}/actions/runs?per_page=5`),
+                  GH_REQUEST, renderCI, signal)
+      .then(renderCI)
+      .catch(err => {
+        if (isAbortError(err)) return;
         document.getElementById('cov-ci-dot').style.background = 'var(--border)';
         document.getElementById('cov-ci-text').textContent = 'CI status unavailable';
       });
@@ -760,6 +1320,7 @@ function loadFromHash() {
 function showCIPanel(cat, projId) {
   document.getElementById('loader').classList.add('hidden');
   showPanel('ci-panel');
+  const signal = panelSignal();
 
   if (!cat.github) return;
   const { owner, repo } = cat.github;
@@ -788,9 +1349,9 @@ function showCIPanel(cat, projId) {
     return;
   }
 
-  const panelBaked = PREFETCHED_CI_DATA
-    && PREFETCHED_CI_DATA.projects[projId]
-    && PREFETCHED_CI_DATA.projects[projId].panel_workflows;
+  const panelBaked = ciSnapshot
+    && ciSnapshot.projects[projId]
+    && ciSnapshot.projects[projId].panel_workflows;
 
   rowsEl.innerHTML = '';
   workflows.forEach(wf => {
@@ -822,27 +1383,29 @@ function showCIPanel(cat, projId) {
       return;
     }
 
-    fetch(
+    const render = data => {
+      const run = (data.workflow_runs || [])[0];
+      if (run) {
+        const [color, label] = CI_CONCLUSION_MAP[run.conclusion]
+          || ['#7a8ba8', run.conclusion || run.status || 'unknown'];
+        dot.style.background = color;
+        branch.textContent   = run.head_branch || '\u2014';
+        status.textContent   = label;
+        status.style.color   = color;
+        time.textContent     = relTime(new Date(run.updated_at));
+      } else {
+        branch.textContent = '\u2014';
+        status.textContent = 'no runs found';
+      }
+    };
+
+    cachedApiJson(
       ghApiUrl(`/repos/${owner}/${repo}/actions/workflows/${wf.file}/runs?per_page=1`),
-      { headers: { 'Accept': 'application/vnd.github+json' } }
+      GH_REQUEST, render, signal
     )
-      .then(r => { if (!r.ok) throw new Error('HTTP ' + r.status); return r.json(); })
-      .then(data => {
-        const run = (data.workflow_runs || [])[0];
-        if (run) {
-          const [color, label] = CI_CONCLUSION_MAP[run.conclusion]
-            || ['#7a8ba8', run.conclusion || run.status || 'unknown'];
-          dot.style.background = color;
-          branch.textContent   = run.head_branch || '\u2014';
-          status.textContent   = label;
-          status.style.color   = color;
-          time.textContent     = relTime(new Date(run.updated_at));
-        } else {
-          branch.textContent = '\u2014';
-          status.textContent = 'no runs found';
-        }
-      })
+      .then(render)
       .catch(err => {
+        if (isAbortError(err)) return;
         dot.style.background = 'var(--border)';
         branch.textContent   = '\u2014';
         status.textContent   = 'unavailable (' + err.message + ')';
@@ -856,8 +1419,13 @@ function showCIPanel(cat, projId) {
 
 (function init() {
   initTheme();
+  pruneApiCache();
   applyLandingTitle();
   buildProjectTabs();
-  buildCIOverview();
-  loadFromHash();
+  loadCISnapshot().then(() => {
+    buildCIOverview();
+    initAutoRefresh();
+    loadFromHash();
+    applyWorkerSnapshot();
+  });
 })();
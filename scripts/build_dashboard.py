@@ -14,22 +14,76 @@ Usage (in CI — with baking):
 Usage (locally — no baking, live mode via Cloudflare Worker):
     python scripts/build_dashboard.py
 
+Usage (sidecar data — baked snapshot in ci-data.json, HTML shell unchanged):
+    GITHUB_TOKEN=<token> python scripts/build_dashboard.py --data-file
+
+Usage (production build — minified, with .gz/.br siblings and a size report):
+    python scripts/build_dashboard.py --minify
+
+Usage (local development — live-reloading server, optional recorded data):
+    python scripts/build_dashboard.py --serve [--port 8000] [--fixture ci-data.json]
+
+Usage (Worker pre-warm config — SNAPSHOT_CONFIG for ci/cloudflare/worker.js):
+    python scripts/build_dashboard.py --worker-config worker-config.json
+
+Usage (incremental re-bake — keep fresh entries of the previous snapshot):
+    GITHUB_TOKEN=<token> DASHBOARD_PREVIOUS=<old index.html> \
+        python scripts/build_dashboard.py --incremental
+
+Every build writes build-manifest.json next to the output: content hashes
+of all inputs, the build options and the baked data (ignoring bake
+timestamps), plus every file it wrote.  When a rebuild would be identical
+and all of those files are still in place, nothing is rendered or written
+(--force overrides); in GitHub Actions the step output
+``changed`` tells later steps whether there is anything to deploy.
+
 Environment variables:
     GITHUB_TOKEN   Optional. When set, fetches CI data and injects a
-                   PREFETCHED_CI_DATA snapshot into the output HTML.
+                   PREFETCHED_CI_DATA snapshot into the output HTML.  Per-call
+                   timings are written to bake-metrics.json next to it.
     DASHBOARD_OUT  Optional. Output path. Default: ci/html/dashboard.html
+    DASHBOARD_HTTP_CACHE
+                   Optional. Directory for the conditional-request (ETag)
+                   cache; overrides bake.cache_dir in projects.yaml.  Set
+                   to an empty string to disable.
+    GITHUB_API_URL Optional. GitHub REST API base (default
+                   https://api.github.com), e.g. a local
+                   scripts/mock_api_server.py.
+    DASHBOARD_PREVIOUS
+                   Optional. Previously published dashboard HTML (or
+                   snapshot JSON); entries skipped because the GitHub rate
+                   limit ran out are reused from it.  Overrides
+                   bake.previous_snapshot in projects.yaml.
 """
 
+import argparse
+import gzip
+import hashlib
+import http.client
+import http.server
+import io
 import json
 import os
+import random
+import re
 import sys
 import textwrap
+import threading
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from typing import Callable, NamedTuple
 
 import yaml
-from jinja2 import Environment
+from jinja2 import Environment, TemplateError
+
+try:
+    import brotli
+except ImportError:  # optional: .br siblings are skipped without it
+    brotli = None
 
 
 # ---------------------------------------------------------------------------
@@ -45,40 +99,645 @@ CSS_PATH      = os.path.join(REPO_ROOT, "ci", "static", "style.css")
 JS_PATH       = os.path.join(REPO_ROOT, "ci", "static", "app.js")
 DEFAULT_OUT   = os.path.join(REPO_ROOT, "ci", "html", "dashboard.html")
 
+# Written next to the dashboard output after every bake.
+BAKE_METRICS_NAME = "bake-metrics.json"
+
 
 # ---------------------------------------------------------------------------
 # GitHub API helpers
 # ---------------------------------------------------------------------------
 
-API_BASE = "https://api.github.com"
+# GITHUB_API_URL is set by GitHub Actions; locally it can point the bake at
+# scripts/mock_api_server.py.
+API_BASE = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 BRANCH   = "main"
 
+DEFAULT_BAKE_WORKERS = 8
+
+
+class HttpCache:
+    """Persistent on-disk cache of GitHub API responses for conditional requests.
+
+    Each URL is stored as one JSON file (named by the URL's SHA-256) holding
+    the response body and its ``ETag`` / ``Last-Modified`` validators.  A
+    re-bake sends ``If-None-Match`` / ``If-Modified-Since`` and reuses the
+    stored body on ``304 Not Modified``, which GitHub does not count against
+    the rate limit.  The directory can be saved and restored between CI runs.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits   = 0    # 304 responses served from the cache
+        self.stores = 0    # fresh 200 responses written to the cache
+        self._lock  = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, digest + ".json")
+
+    def get(self, url: str) -> dict | None:
+        try:
+            with open(self._path(url), encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(self, url: str, headers, body: str) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        entry = {
+            "url":           url,
+            "etag":          etag,
+            "last_modified": last_modified,
+            "body":          body,
+        }
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.stores += 1
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+
+# Set by configure_http_cache(); None disables conditional requests.
+HTTP_CACHE: HttpCache | None = None
+
+
+def configure_http_cache(config: dict) -> HttpCache | None:
+    """Enable the on-disk HTTP cache from ``bake.cache_dir`` (or $DASHBOARD_HTTP_CACHE)."""
+    global HTTP_CACHE
+    cache_dir = os.environ.get(
+        "DASHBOARD_HTTP_CACHE", config.get("bake", {}).get("cache_dir", "")
+    )
+    if not cache_dir:
+        HTTP_CACHE = None
+        return None
+    if not os.path.isabs(cache_dir):
+        cache_dir = os.path.join(REPO_ROOT, cache_dir)
+    HTTP_CACHE = HttpCache(os.path.normpath(cache_dir))
+    return HTTP_CACHE
+
+
+class PooledResponse:
+    """Minimal ``urlopen``-style response returned by ``ConnectionPool.open``."""
+
+    def __init__(self, status: int, headers, body: bytes):
+        self.status  = status
+        self.headers = headers
+        self._body   = body
+
+    def read(self) -> bytes:
+        return self._body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections shared by all bake calls.
+
+    A drop-in replacement for ``urllib.request.urlopen`` (same ``Request``
+    input, same ``HTTPError`` on non-2xx responses) that reuses idle
+    HTTP/1.1 connections per host instead of paying a TLS handshake per
+    call.  A reused connection the server has meanwhile closed is retried
+    once on a fresh one.  Redirects are followed.  With *gzip*, compressed
+    responses are requested and decoded transparently.
+    """
+
+    def __init__(self, max_idle: int = DEFAULT_BAKE_WORKERS, gzip: bool = True):
+        self.max_idle = max_idle
+        self.gzip     = gzip
+        self.opened   = 0
+        self.reused   = 0
+        self._idle: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme: str, host: str, port: int | None, timeout: float):
+        key = (scheme, host, port)
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                self.reused += 1
+                conn = idle.pop()
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return key, conn, True
+            self.opened += 1
+        cls = (http.client.HTTPSConnection if scheme == "https"
+               else http.client.HTTPConnection)
+        return key, cls(host, port, timeout=timeout), False
+
+    def _release(self, key: tuple, conn) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+    def _send(self, req: urllib.request.Request, timeout: float):
+        parts = urllib.parse.urlsplit(req.full_url)
+        target = parts.path + (f"?{parts.query}" if parts.query else "")
+        headers = dict(req.header_items())
+        headers.setdefault("User-Agent", "viper-dashboard-bake")
+        headers["Connection"] = "keep-alive"
+        if self.gzip:
+            headers["Accept-Encoding"] = "gzip"
+
+        for attempt in (0, 1):
+            key, conn, reused = self._acquire(parts.scheme, parts.hostname,
+                                              parts.port, timeout)
+            try:
+                conn.request(req.get_method(), target, body=req.data, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if reused and attempt == 0:
+                    continue    # stale keep-alive connection; retry on a new one
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return resp, body
+
+    def open(self, req: urllib.request.Request, timeout: float = 20):
+        """Send *req*, following redirects as ``urlopen`` does.
+
+        Redirects to the same scheme and host stay on pooled connections;
+        one to another host is handed to ``urllib.request.urlopen``, without
+        the Authorization header.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            resp, body = self._send(req, timeout)
+            location = resp.getheader("Location")
+            if resp.status not in REDIRECT_STATUSES or not location:
+                break
+            url = urllib.parse.urljoin(req.full_url, location)
+            same_host = (urllib.parse.urlsplit(url)[:2]
+                         == urllib.parse.urlsplit(req.full_url)[:2])
+            req = _redirect_request(req, resp.status, url, same_host)
+            if not same_host:
+                return urllib.request.urlopen(req, timeout=timeout)
+        else:
+            raise urllib.error.HTTPError(req.full_url, resp.status,
+                                         f"more than {MAX_REDIRECTS} redirects",
+                                         resp.msg, io.BytesIO(body))
+
+        if resp.getheader("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+        if not 200 <= resp.status < 300:
+            raise urllib.error.HTTPError(req.full_url, resp.status, resp.reason,
+                                         resp.msg, io.BytesIO(body))
+        return PooledResponse(resp.status, resp.msg, body)
+
+
+# Redirects ConnectionPool.open follows, at most MAX_REDIRECTS in a row
+# (urllib's HTTPRedirectHandler limit).
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 10
+
+
+def _redirect_request(req: urllib.request.Request, status: int, url: str,
+                      same_host: bool) -> urllib.request.Request:
+    """The request that follows a *status* redirect of *req* to *url*.
+
+    307/308 repeat the request; 303, and 301/302 after a POST, turn it into
+    a body-less GET.  Credentials are only sent on to the same host.
+    """
+    headers = {k: v for k, v in req.header_items()
+               if same_host or k.lower() != "authorization"}
+    if status == 303 or (status in (301, 302) and req.get_method() == "POST"):
+        headers = {k: v for k, v in headers.items()
+                   if k.lower() not in ("content-type", "content-length")}
+        return urllib.request.Request(url, headers=headers, method="GET")
+    return urllib.request.Request(url, data=req.data, headers=headers,
+                                  method=req.get_method())
+
+
+# Set by configure_http_pool(); None falls back to urllib.request.urlopen.
+HTTP_POOL: ConnectionPool | None = None
+
+
+def configure_http_pool(config: dict) -> ConnectionPool | None:
+    """Enable keep-alive connection pooling unless ``bake.keep_alive`` is false."""
+    global HTTP_POOL
+    bake_cfg = config.get("bake", {})
+    if not bake_cfg.get("keep_alive", True):
+        HTTP_POOL = None
+        return None
+    HTTP_POOL = ConnectionPool(
+        max_idle=int(bake_cfg.get("max_workers", DEFAULT_BAKE_WORKERS)),
+        gzip=bool(bake_cfg.get("gzip", True)),
+    )
+    return HTTP_POOL
+
+
+def _urlopen(req: urllib.request.Request, timeout: float):
+    pool = HTTP_POOL
+    if pool is not None:
+        return pool.open(req, timeout=timeout)
+    return urllib.request.urlopen(req, timeout=timeout)
+
+
+_ENDPOINT_CLASSES = [
+    ("workflow_runs", re.compile(r"/actions/workflows/[^/]+/runs")),
+    ("repo_runs",     re.compile(r"/actions/runs")),
+    ("graphql",       re.compile(r"^/graphql")),
+]
+_REPO_RE = re.compile(r"^/repos/([^/]+/[^/?]+)")
+
+
+def endpoint_class(path: str) -> str:
+    for name, pattern in _ENDPOINT_CLASSES:
+        if pattern.search(path):
+            return name
+    return "other"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of *values* (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class BakeMetrics:
+    """Per-call instrumentation of a bake.
+
+    Every GitHub request records its path, endpoint class, repository, HTTP
+    status, latency, bytes received, cache outcome (hit/miss/off), retry
+    count and the ``X-RateLimit-Remaining`` seen on the response.
+    """
+
+    def __init__(self):
+        self.calls: list[dict] = []
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, record: dict, elapsed: float) -> None:
+        repo = _REPO_RE.match(record["path"])
+        entry = dict(record,
+                     endpoint=endpoint_class(record["path"]),
+                     repo=repo.group(1) if repo else None,
+                     latency_ms=round(elapsed * 1000, 1))
+        with self._lock:
+            self.calls.append(entry)
+
+    @staticmethod
+    def _stats(calls: list[dict]) -> dict:
+        latencies = [c["latency_ms"] for c in calls]
+        return {
+            "calls":      len(calls),
+            "p50_ms":     _percentile(latencies, 50),
+            "p95_ms":     _percentile(latencies, 95),
+            "max_ms":     max(latencies, default=0.0),
+            "total_ms":   round(sum(latencies), 1),
+            "bytes":      sum(c["bytes"] for c in calls),
+            "cache_hits": sum(c["cache"] == "hit" for c in calls),
+            "retries":    sum(c["retries"] for c in calls),
+            "errors":     sum(c["status"] is None or c["status"] >= 400 for c in calls),
+        }
+
+    def summary(self) -> dict:
+        with self._lock:
+            calls = list(self.calls)
+        by_endpoint: dict[str, list] = {}
+        by_repo: dict[str, list] = {}
+        for c in calls:
+            by_endpoint.setdefault(c["endpoint"], []).append(c)
+            if c["repo"]:
+                by_repo.setdefault(c["repo"], []).append(c)
+        return {
+            "wall_time_s": round(time.perf_counter() - self.started, 3),
+            "total":       self._stats(calls),
+            "endpoints":   {k: self._stats(v) for k, v in sorted(by_endpoint.items())},
+            "repos":       {k: self._stats(v) for k, v in sorted(by_repo.items())},
+        }
+
+    def table(self) -> str:
+        summary = self.summary()
+        lines = [f"{'Endpoint class':<16}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}"
+                 f"{'max ms':>9}{'KiB':>9}{'304s':>6}{'retry':>7}"]
+        rows = list(summary["endpoints"].items()) + [("TOTAL", summary["total"])]
+        for name, st in rows:
+            lines.append(f"{name:<16}{st['calls']:>7}{st['p50_ms']:>9.0f}{st['p95_ms']:>9.0f}"
+                         f"{st['max_ms']:>9.0f}{st['bytes'] / 1024:>9.1f}"
+                         f"{st['cache_hits']:>6}{st['retries']:>7}")
+        slowest = sorted(summary["repos"].items(), key=lambda kv: -kv[1]["total_ms"])[:3]
+        if slowest:
+            lines.append("Slowest repositories (summed latency): " + ", ".join(
+                f"{repo} {st['total_ms'] / 1000:.2f}s" for repo, st in slowest))
+        lines.append(f"Bake wall time: {summary['wall_time_s']:.2f}s")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            calls = list(self.calls)
+        return {"summary": self.summary(), "calls": calls}
+
+
+# Replaced at the start of every bake; None disables instrumentation.
+BAKE_METRICS: BakeMetrics | None = None
+
+
+def write_bake_metrics(path: str, payload: dict | None) -> None:
+    """Write the last bake's metrics (plus rate-limit and cache state) as JSON."""
+    if BAKE_METRICS is None:
+        return
+    data = BAKE_METRICS.to_dict()
+    data["baked_at"] = (payload or {}).get("baked_at")
+    if RATE_LIMIT is not None:
+        data["rate_limit"] = {
+            "resources":  {name: win.to_dict()
+                           for name, win in sorted(RATE_LIMIT.windows.items())},
+            "dispatched": RATE_LIMIT.dispatched,
+            "charged":    RATE_LIMIT.charged,
+            "retries":    RATE_LIMIT.retries,
+            "skipped":    RATE_LIMIT.skipped,
+        }
+    if HTTP_CACHE is not None:
+        data["http_cache"] = {"hits": HTTP_CACHE.hits, "stores": HTTP_CACHE.stores}
+    if HTTP_POOL is not None:
+        data["connections"] = {"opened": HTTP_POOL.opened, "reused": HTTP_POOL.reused}
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2)
+    print(f"Metrics: {path}")
+
+
+class RateLimited(Exception):
+    """Raised when a call is skipped because the rate-limit budget is spent."""
+
+
+class RateLimitWindow:
+    """What GitHub reports for one rate-limit resource (``core``, ``graphql``)."""
+
+    def __init__(self):
+        self.limit: int | None     = None
+        self.remaining: int | None = None
+        self.reset_at: int | None  = None
+        self.reserved = 0     # units held by calls in flight
+
+    def to_dict(self) -> dict:
+        return {"limit": self.limit, "remaining": self.remaining, "reset_at": self.reset_at}
+
+
+class RateLimitBudget:
+    """Track the GitHub rate-limit budget across all bake calls.
+
+    REST and GraphQL draw on separate limits, so the budget keeps one
+    ``RateLimitWindow`` per ``X-RateLimit-Resource``; headers without one
+    count against the resource the request was made for.  Before each call
+    the scheduler asks ``acquire`` for permission on that call's resource:
+    once fewer than ``reserve`` requests remain, only priority-0 calls
+    (overview workflows, repository sweeps and GraphQL queries) are allowed,
+    and none are once the budget reaches zero.  An admitted call holds one
+    unit until ``release``; the headers then tell what it really cost, so
+    calls answered with a free 304 give their unit back.  Secondary rate
+    limits are retried up to ``max_retries`` times with exponential backoff
+    and jitter.
+
+    ``limit``, ``remaining``, ``reset_at`` and ``reserved`` describe the
+    ``core`` (REST) resource.
+    """
+
+    def __init__(self, reserve: int = 100, max_retries: int = 3,
+                 backoff: float = 2.0):
+        self.reserve     = reserve
+        self.max_retries = max_retries
+        self.backoff     = backoff
+        self.windows: dict[str, RateLimitWindow] = {}
+        self.dispatched = 0   # calls admitted by acquire
+        self.charged    = 0   # responses counted against the limit (non-304)
+        self.retries    = 0
+        self.skipped    = 0
+        self._lock      = threading.Lock()
+
+    def window(self, resource: str = "core") -> RateLimitWindow:
+        with self._lock:
+            return self.windows.setdefault(resource, RateLimitWindow())
+
+    @property
+    def limit(self) -> int | None:
+        return self.window().limit
+
+    @property
+    def remaining(self) -> int | None:
+        return self.window().remaining
+
+    @property
+    def reset_at(self) -> int | None:
+        return self.window().reset_at
+
+    @property
+    def reserved(self) -> int:
+        return self.window().reserved
+
+    def update(self, headers, resource: str = "core") -> None:
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        reset = int(headers.get("X-RateLimit-Reset") or 0)
+        win = self.window(headers.get("X-RateLimit-Resource") or resource)
+        with self._lock:
+            # Concurrent responses arrive out of order; within one reset
+            # window the lowest remaining count is the most recent.
+            if win.reset_at is None or reset > win.reset_at:
+                win.remaining = int(remaining)
+            else:
+                win.remaining = min(win.remaining, int(remaining))
+            win.reset_at = max(reset, win.reset_at or 0)
+            if headers.get("X-RateLimit-Limit"):
+                win.limit = int(headers["X-RateLimit-Limit"])
+
+    def acquire(self, priority: int, resource: str = "core") -> bool:
+        win = self.window(resource)
+        with self._lock:
+            if win.remaining is None:
+                allowed = True
+            else:
+                available = win.remaining - win.reserved
+                if available <= 0 and time.time() < (win.reset_at or 0):
+                    allowed = False
+                else:
+                    allowed = priority == 0 or available > self.reserve
+            if allowed:
+                win.reserved += 1
+                self.dispatched += 1
+            else:
+                self.skipped += 1
+            return allowed
+
+    def release(self, resource: str = "core") -> None:
+        """Return the unit an admitted call held; its headers have been seen."""
+        win = self.window(resource)
+        with self._lock:
+            win.reserved = max(0, win.reserved - 1)
+
+    def skip(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def charge(self) -> None:
+        with self._lock:
+            self.charged += 1
+
+    def backoff_delay(self, attempt: int, retry_after: str | None) -> float:
+        with self._lock:
+            self.retries += 1
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    def report(self) -> str:
+        budgets = []
+        for resource, win in sorted(self.windows.items()):
+            if win.remaining is None:
+                continue
+            reset = datetime.fromtimestamp(win.reset_at or 0, timezone.utc)
+            budgets.append(f"{resource} {max(win.remaining, 0)}/{win.limit or '?'} remaining, "
+                           f"resets {reset.strftime('%H:%M:%SZ')}")
+        budget = "; ".join(budgets) or "budget unknown (no rate-limit headers seen)"
+        return (f"Rate limit: {self.charged} request(s) charged this bake; "
+                f"{budget}; {self.retries} retries, {self.skipped} call(s) skipped")
+
+
+# Replaced at the start of every bake; None disables scheduling.
+RATE_LIMIT: RateLimitBudget | None = None
+
+
+def _is_rate_limited(exc: urllib.error.HTTPError) -> bool:
+    if exc.code not in (403, 429):
+        return False
+    if exc.headers.get("Retry-After") or exc.headers.get("X-RateLimit-Remaining") == "0":
+        return True
+    try:
+        body = exc.read().decode(errors="replace")
+    except Exception:
+        return False
+    return "rate limit" in body.lower()
+
 
 def _gh_get(path: str, token: str) -> dict:
+    record = {"path": path, "status": None, "bytes": 0, "cache": "off",
+              "retries": 0, "ratelimit_remaining": None}
+    start = time.perf_counter()
+    try:
+        return _gh_get_request(path, token, record)
+    finally:
+        if BAKE_METRICS is not None:
+            BAKE_METRICS.record(record, time.perf_counter() - start)
+
+
+def _gh_get_request(path: str, token: str, record: dict) -> dict:
     url = API_BASE + path
-    req = urllib.request.Request(
-        url,
-        headers={
-            "Accept":               "application/vnd.github+json",
-            "Authorization":        f"Bearer {token}",
-            "X-GitHub-Api-Version": "2022-11-28",
-        },
-    )
+    headers = {
+        "Accept":               "application/vnd.github+json",
+        "Authorization":        f"Bearer {token}",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    cache = HTTP_CACHE
+    cached = cache.get(url) if cache else None
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    if cache:
+        record["cache"] = "miss"
+
+    req = urllib.request.Request(url, headers=headers)
     try:
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            return json.loads(resp.read().decode())
+        resp_headers, body = _gh_send(req, record, timeout=20)
+        if cache:
+            cache.put(url, resp_headers, body)
+        return json.loads(body)
     except urllib.error.HTTPError as exc:
+        if exc.code == 304 and cached:
+            cache.record_hit()
+            record["cache"] = "hit"
+            return json.loads(cached["body"])
         if exc.code in (401, 403):
             raise RuntimeError(
                 f"GitHub API error (HTTP {exc.code}) for {url}"
             ) from exc
         print(f"  WARNING: HTTP {exc.code} for {url}", file=sys.stderr)
         return {}
+    except RateLimited:
+        raise
     except Exception as exc:
         print(f"  WARNING: {exc} for {url}", file=sys.stderr)
         return {}
 
 
+def _gh_send(req: urllib.request.Request, record: dict, timeout: float,
+             resource: str = "core"):
+    """Send a GitHub API request with the rate-limit budget's bookkeeping.
+
+    Every response updates *resource* of ``RATE_LIMIT`` (unless its headers
+    name another) and all but 304s are charged to it.  Secondary rate limits are retried with backoff; an exhausted or
+    still-limited budget raises ``RateLimited``.  Other error statuses are
+    re-raised as ``HTTPError``.  Returns the response headers and body text.
+    """
+    url = req.full_url
+    budget = RATE_LIMIT
+    attempt = 0
+    while True:
+        record["retries"] = attempt
+        try:
+            with _urlopen(req, timeout=timeout) as resp:
+                if budget:
+                    budget.update(resp.headers, resource)
+                    budget.charge()
+                raw = resp.read()
+                record["status"] = getattr(resp, "status", 200)
+                record["bytes"] = len(raw)
+                record["ratelimit_remaining"] = resp.headers.get("X-RateLimit-Remaining")
+                return resp.headers, raw.decode()
+        except urllib.error.HTTPError as exc:
+            record["status"] = exc.code
+            record["ratelimit_remaining"] = exc.headers.get("X-RateLimit-Remaining")
+            if budget:
+                budget.update(exc.headers, resource)
+                if exc.code != 304:
+                    budget.charge()
+            if _is_rate_limited(exc):
+                if exc.headers.get("X-RateLimit-Remaining") == "0":
+                    raise RateLimited(f"rate limit exhausted for {url}") from exc
+                if budget and attempt < budget.max_retries:
+                    delay = budget.backoff_delay(attempt, exc.headers.get("Retry-After"))
+                    print(f"  WARNING: secondary rate limit for {url}; "
+                          f"retrying in {delay:.1f}s", file=sys.stderr)
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                raise RateLimited(f"secondary rate limit for {url}") from exc
+            raise
+
+
 def fetch_workflow_run(owner, repo, wf_file, branch, token):
     path = (
         f"/repos/{owner}/{repo}/actions/workflows/{wf_file}/runs"
@@ -100,12 +759,11 @@ def fetch_workflow_run_any_branch(owner, repo, wf_file, token):
     return runs[0] if runs else None
 
 
-def fetch_recent_branches(owner, repo, token, max_branches=2):
-    path = f"/repos/{owner}/{repo}/actions/runs?per_page=30"
-    data = _gh_get(path, token)
+def recent_branches_from_runs(runs, max_branches):
+    """Return up to *max_branches* distinct non-main branches, newest first."""
     seen: set[str] = set()
     branches: list[str] = []
-    for run in data.get("workflow_runs", []):
+    for run in runs:
         b = run.get("head_branch", "")
         if b and b != BRANCH and b not in seen:
             seen.add(b)
@@ -115,6 +773,150 @@ def fetch_recent_branches(owner, repo, token, max_branches=2):
     return branches
 
 
+def fetch_recent_branches(owner, repo, token, max_branches=2):
+    path = f"/repos/{owner}/{repo}/actions/runs?per_page={RECENT_RUNS_WINDOW}"
+    data = _gh_get(path, token)
+    return recent_branches_from_runs(data.get("workflow_runs", []), max_branches)
+
+
+# Number of most recent runs inspected for branch discovery (matches app.js).
+RECENT_RUNS_WINDOW = 30
+SWEEP_PAGE_SIZE    = 100
+
+
+def fetch_repo_runs(owner, repo, token, pages=1):
+    """Fetch the newest ``pages * 100`` runs of all workflows in a repository."""
+    runs: list[dict] = []
+    for page in range(1, pages + 1):
+        path = (
+            f"/repos/{owner}/{repo}/actions/runs"
+            f"?per_page={SWEEP_PAGE_SIZE}&page={page}"
+        )
+        batch = _gh_get(path, token).get("workflow_runs", [])
+        runs.extend(batch)
+        if len(batch) < SWEEP_PAGE_SIZE:
+            break
+    return runs
+
+
+def latest_run_from_runs(runs, wf_file, branch=None):
+    """Return the newest run of *wf_file* in *runs* (optionally on *branch*)."""
+    for run in runs:
+        if os.path.basename(run.get("path", "")) != wf_file:
+            continue
+        if branch is None or run.get("head_branch") == branch:
+            return run
+    return None
+
+
+# ---------------------------------------------------------------------------
+# GitHub GraphQL backend (bake.fetch_mode: graphql)
+# ---------------------------------------------------------------------------
+
+GRAPHQL_REFS   = 10    # most recently committed branches inspected per repo
+GRAPHQL_SUITES = 50    # newest check suites inspected per branch head
+
+_GRAPHQL_REPO_FIELDS = """
+    refs(refPrefix: "refs/heads/", first: %(refs)d,
+         orderBy: {field: TAG_COMMIT_DATE, direction: DESC}) {
+      nodes {
+        name
+        target {
+          ... on Commit {
+            checkSuites(last: %(suites)d) {
+              nodes {
+                status
+                conclusion
+                updatedAt
+                workflowRun { updatedAt file { path } }
+              }
+            }
+          }
+        }
+      }
+    }"""
+
+
+def build_graphql_query(projects: list[dict]) -> str:
+    """Build one query fetching branch-head check suites for every project."""
+    fields = _GRAPHQL_REPO_FIELDS % {"refs": GRAPHQL_REFS, "suites": GRAPHQL_SUITES}
+    parts = [
+        f"  r{i}: repository(owner: {json.dumps(p['owner'])}, "
+        f"name: {json.dumps(p['repo'])}) {{{fields}\n  }}"
+        for i, p in enumerate(projects)
+    ]
+    return "query {\n" + "\n".join(parts) + "\n}"
+
+
+def _gh_graphql(query: str, token: str) -> dict:
+    url = API_BASE + "/graphql"
+    req = urllib.request.Request(
+        url,
+        data=json.dumps({"query": query}).encode(),
+        headers={
+            "Accept":        "application/json",
+            "Authorization": f"Bearer {token}",
+            "Content-Type":  "application/json",
+        },
+        method="POST",
+    )
+    record = {"path": "/graphql", "status": None, "bytes": 0, "cache": "off",
+              "retries": 0, "ratelimit_remaining": None}
+    start = time.perf_counter()
+    try:
+        _, body = _gh_send(req, record, timeout=30, resource="graphql")
+        data = json.loads(body)
+    except urllib.error.HTTPError as exc:
+        if exc.code in (401, 403):
+            raise RuntimeError(
+                f"GitHub API error (HTTP {exc.code}) for {url}"
+            ) from exc
+        print(f"  WARNING: HTTP {exc.code} for {url}", file=sys.stderr)
+        return {}
+    except RateLimited:
+        raise
+    except Exception as exc:
+        print(f"  WARNING: {exc} for {url}", file=sys.stderr)
+        return {}
+    finally:
+        if BAKE_METRICS is not None:
+            BAKE_METRICS.record(record, time.perf_counter() - start)
+    for err in data.get("errors") or []:
+        print(f"  WARNING: GraphQL: {err.get('message', err)}", file=sys.stderr)
+    return data.get("data") or {}
+
+
+def graphql_repo_to_runs(repo_data: dict | None) -> list[dict]:
+    """Flatten a repository's branch-head check suites into REST-shaped runs.
+
+    Only suites created by GitHub Actions (those with a ``workflowRun``) are
+    kept.  The result is ordered newest first, like ``/actions/runs``.
+    """
+    runs: list[dict] = []
+    for ref in ((repo_data or {}).get("refs") or {}).get("nodes") or []:
+        suites = ((ref.get("target") or {}).get("checkSuites") or {}).get("nodes") or []
+        for suite in suites:
+            wf_run = suite.get("workflowRun")
+            if not wf_run:
+                continue
+            runs.append({
+                "path":        (wf_run.get("file") or {}).get("path", ""),
+                "head_branch": ref.get("name", ""),
+                "status":      (suite.get("status") or "").lower() or None,
+                "conclusion":  (suite.get("conclusion") or "").lower() or None,
+                "updated_at":  wf_run.get("updatedAt") or suite.get("updatedAt", ""),
+            })
+    runs.sort(key=lambda r: r["updated_at"], reverse=True)
+    return runs
+
+
+def fetch_repos_runs_graphql(projects: list[dict], token: str) -> dict:
+    """Return ``{project id: runs}`` for *projects* from a single GraphQL query."""
+    data = _gh_graphql(build_graphql_query(projects), token)
+    return {p["id"]: graphql_repo_to_runs(data.get(f"r{i}"))
+            for i, p in enumerate(projects)}
+
+
 # ---------------------------------------------------------------------------
 # Config → JS generation
 # ---------------------------------------------------------------------------
@@ -140,8 +942,17 @@ def yaml_categories_to_js(project: dict) -> list[dict]:
     return js_cats
 
 
-def generate_js_config(config: dict, prefetched_data) -> str:
-    """Generate the JS config constants block from the YAML config."""
+def generate_js_config(config: dict, prefetched_data, data_url: str = "",
+                       compact: bool = False) -> str:
+    """Generate the JS config constants block from the YAML config.
+
+    With *data_url* the baked snapshot is not inlined; app.js fetches it from
+    that (relative) URL at startup instead.  *compact* drops the spaces after
+    ``,`` and ``:`` in every constant (the large ones are always compact).
+    """
+    def dumps(value) -> str:
+        return json.dumps(value, separators=(",", ":") if compact else None)
+
     dashboard = config.get("dashboard", {})
     projects  = config.get("projects", [])
 
@@ -163,11 +974,11 @@ def generate_js_config(config: dict, prefetched_data) -> str:
 
     lines = []
     lines.append(f"const PROJECTS = {json.dumps(js_projects, separators=(',', ':'))};")
-    lines.append(f"const LANDING_TITLE = {json.dumps(dashboard.get('title', 'Dashboard'))};")
-    lines.append(f"const LAUNCH_PANEL_TYPES = {json.dumps(config.get('launch_panel_types', []))};")
-    lines.append(f"const LAUNCH_PANEL_URLS = {json.dumps(config.get('launch_panel_urls', []))};")
-    lines.append(f"const DEFAULT_THEME = {json.dumps(dashboard.get('default_theme', 'light'))};")
-    lines.append(f"const THEME_LABELS = {json.dumps(config.get('themes', {}))};")
+    lines.append(f"const LANDING_TITLE = {dumps(dashboard.get('title', 'Dashboard'))};")
+    lines.append(f"const LAUNCH_PANEL_TYPES = {dumps(config.get('launch_panel_types', []))};")
+    lines.append(f"const LAUNCH_PANEL_URLS = {dumps(config.get('launch_panel_urls', []))};")
+    lines.append(f"const DEFAULT_THEME = {dumps(dashboard.get('default_theme', 'light'))};")
+    lines.append(f"const THEME_LABELS = {dumps(config.get('themes', {}))};")
 
     worker_url = dashboard.get("worker_url", "")
     lines.append(f"const WORKER_URL = {json.dumps(worker_url or '')};")
@@ -175,10 +986,11 @@ def generate_js_config(config: dict, prefetched_data) -> str:
     max_branches = dashboard.get("max_recent_branches", 4)
     lines.append(f"const MAX_RECENT_BRANCHES = {json.dumps(max_branches)};")
 
-    if prefetched_data is not None:
+    if prefetched_data is not None and not data_url:
         lines.append(f"const PREFETCHED_CI_DATA = {json.dumps(prefetched_data, separators=(',', ':'))};")
     else:
         lines.append("const PREFETCHED_CI_DATA = null;")
+    lines.append(f"const CI_DATA_URL = {json.dumps(data_url)};")
 
     lines.append(f"const CI_OVERVIEW_PROJECTS = {json.dumps(ci_overview, separators=(',', ':'))};")
 
@@ -189,99 +1001,412 @@ def generate_js_config(config: dict, prefetched_data) -> str:
 # Bake CI data (optional)
 # ---------------------------------------------------------------------------
 
-def bake_ci_data(config: dict, token: str) -> dict | None:
-    """Fetch CI data for all projects and return the PREFETCHED_CI_DATA payload."""
-    projects = config.get("projects", [])
+class BakeCall(NamedTuple):
+    """One planned GitHub API call and where its result lands in the payload."""
+    pid:     str
+    section: str    # "workflows", "panel_workflows" or "recent_branches"
+    key:     str    # workflow file (unused for recent_branches)
+    fn:      Callable
+    args:    tuple
+
+
+def plan_project_calls(proj: dict, token: str, max_branches: int) -> list[BakeCall]:
+    """Return the API calls needed to bake one project, in payload order."""
+    pid   = proj["id"]
+    owner = proj["owner"]
+    repo  = proj["repo"]
+    calls: list[BakeCall] = []
+
+    for wf in proj.get("overview_workflows", []):
+        calls.append(BakeCall(pid, "workflows", wf["file"], fetch_workflow_run,
+                              (owner, repo, wf["file"], BRANCH, token)))
+
+    # CI panel workflows (latest run on any branch).  Overview workflows that
+    # also appear in a CI panel are re-fetched without the branch filter.
+    ci_cats = [c for c in proj.get("categories", [])
+               if c.get("type") == "ci"]
+    panel_wfs = {wf["file"] for c in ci_cats
+                 for wf in c.get("workflows", [])}
+    overview_wfs = {wf["file"] for wf in proj.get("overview_workflows", [])}
+    for wf_file in sorted(overview_wfs & panel_wfs) + sorted(panel_wfs - overview_wfs):
+        calls.append(BakeCall(pid, "panel_workflows", wf_file,
+                              fetch_workflow_run_any_branch,
+                              (owner, repo, wf_file, token)))
+
+    if not proj.get("fixed_branch", False):
+        calls.append(BakeCall(pid, "recent_branches", "", fetch_recent_branches,
+                              (owner, repo, token, max_branches)))
+    return calls
+
+
+def worker_snapshot_config(config: dict) -> dict:
+    """Return the SNAPSHOT_CONFIG for the Worker's scheduled pre-warm.
+
+    Lists, per project, the calls ``plan_project_calls`` makes, so the
+    snapshot the Worker stores in KV has the same entries as the payload of
+    ``bake_ci_data``.
+    """
     max_branches = config.get("dashboard", {}).get("max_recent_branches", 2)
-    baked_projects: dict = {}
-    total_calls = 0
-    failures    = 0
+    projects = []
+    for proj in config.get("projects", []):
+        calls = plan_project_calls(proj, "", max_branches)
+        projects.append({
+            "id":              proj["id"],
+            "owner":           proj["owner"],
+            "repo":            proj["repo"],
+            "fixed_branch":    bool(proj.get("fixed_branch", False)),
+            "workflows":       [c.key for c in calls if c.section == "workflows"],
+            "panel_workflows": [c.key for c in calls if c.section == "panel_workflows"],
+        })
+    return {"max_recent_branches": max_branches, "projects": projects}
+
 
+# Scheduling priority per call section.  Lower values are dispatched first
+# and are the only calls allowed once the rate-limit reserve is reached.
+CALL_PRIORITY = {
+    "sweep":           0,
+    "graphql":         0,
+    "workflows":       0,
+    "panel_workflows": 1,
+    "recent_branches": 2,
+}
+
+# Rate-limit resource each section draws on (anything else is REST "core").
+CALL_RESOURCE = {
+    "graphql": "graphql",
+}
+
+# Result placeholder for calls skipped by the rate-limit scheduler.
+SKIPPED = object()
+
+
+def _scheduled_call(call: BakeCall):
+    budget = RATE_LIMIT
+    resource = CALL_RESOURCE.get(call.section, "core")
+    if budget is not None and not budget.acquire(CALL_PRIORITY.get(call.section, 1), resource):
+        return SKIPPED
     try:
-        for proj in projects:
-            pid   = proj["id"]
-            owner = proj["owner"]
-            repo  = proj["repo"]
-            print(f"\n[{pid}]")
-
-            proj_data: dict = {"workflows": {}}
-
-            for wf in proj.get("overview_workflows", []):
-                wf_file = wf["file"]
-                print(f"  Fetching run: {wf_file} @ {BRANCH} ...", end=" ")
-                run = fetch_workflow_run(owner, repo, wf_file, BRANCH, token)
-                total_calls += 1
-                if run:
-                    proj_data["workflows"][wf_file] = {
-                        "conclusion": run.get("conclusion") or run.get("status") or "unknown",
-                        "updated_at": run.get("updated_at", ""),
-                    }
-                    print(proj_data["workflows"][wf_file]["conclusion"])
-                else:
-                    failures += 1
-                    print("no data")
-
-            # Fetch CI panel workflows (latest run on any branch)
-            ci_cats = [c for c in proj.get("categories", [])
-                       if c.get("type") == "ci"]
-            panel_wfs = {wf["file"] for c in ci_cats
-                         for wf in c.get("workflows", [])}
-            # Exclude workflows already fetched for overview (avoid duplicate calls)
-            overview_wfs = {wf["file"] for wf in proj.get("overview_workflows", [])}
-            extra_panel_wfs = panel_wfs - overview_wfs
-            panel_data: dict = {}
-
-            # Re-fetch overview workflows without branch filter for panel use
-            for wf_file in overview_wfs & panel_wfs:
-                print(f"  Fetching panel run: {wf_file} (any branch) ...", end=" ")
-                run = fetch_workflow_run_any_branch(owner, repo, wf_file, token)
-                total_calls += 1
-                if run:
-                    panel_data[wf_file] = {
-                        "conclusion":  run.get("conclusion") or run.get("status") or "unknown",
-                        "updated_at":  run.get("updated_at", ""),
-                        "head_branch": run.get("head_branch", ""),
-                    }
-                    print(panel_data[wf_file]["conclusion"])
-                else:
-                    failures += 1
-                    print("no data")
-
-            for wf_file in sorted(extra_panel_wfs):
-                print(f"  Fetching panel run: {wf_file} (any branch) ...", end=" ")
-                run = fetch_workflow_run_any_branch(owner, repo, wf_file, token)
-                total_calls += 1
-                if run:
-                    panel_data[wf_file] = {
-                        "conclusion":  run.get("conclusion") or run.get("status") or "unknown",
-                        "updated_at":  run.get("updated_at", ""),
-                        "head_branch": run.get("head_branch", ""),
-                    }
-                    print(panel_data[wf_file]["conclusion"])
-                else:
-                    failures += 1
-                    print("no data")
+        return call.fn(*call.args)
+    except RateLimited as exc:
+        print(f"  WARNING: {exc}; skipping", file=sys.stderr)
+        if budget is not None:
+            budget.skip()
+        return SKIPPED
+    finally:
+        if budget is not None:
+            budget.release(resource)
+
+
+def run_calls(calls: list[BakeCall], max_workers: int) -> list:
+    """Execute *calls* on a thread pool and return their results in call order.
+
+    Calls are dispatched in ``CALL_PRIORITY`` order and gated by the
+    rate-limit budget; calls that are not allowed to run (or hit an exhausted
+    limit) yield ``SKIPPED``.  The first other exception raised by any call
+    (e.g. an auth ``RuntimeError``) cancels the calls that have not started
+    yet and is re-raised.
+    """
+    order = sorted(range(len(calls)),
+                   key=lambda i: CALL_PRIORITY.get(calls[i].section, 1))
+    if max_workers <= 1:
+        results: list = [None] * len(calls)
+        for i in order:
+            results[i] = _scheduled_call(calls[i])
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers,
+                            thread_name_prefix="bake") as pool:
+        futures = {i: pool.submit(_scheduled_call, calls[i]) for i in order}
+        done, _ = wait(futures.values(), return_when=FIRST_EXCEPTION)
+        for fut in futures.values():
+            if fut in done and fut.exception() is not None:
+                for pending in futures.values():
+                    pending.cancel()
+                raise fut.exception()
+        return [futures[i].result() for i in range(len(calls))]
+
+
+def resolve_calls_from_runs(calls: list[BakeCall], runs_by_pid: dict,
+                            max_workers: int) -> tuple[list, int]:
+    """Answer *calls* from per-project run lists, falling back where needed.
+
+    Latest-per-workflow (main and any branch) and recent branches are derived
+    in memory from ``runs_by_pid``.  Calls that cannot be answered (project
+    has no runs, or the workflow is absent from the window) are issued as
+    their original targeted call.  Returns the results in call order and the
+    number of fallback calls made (the rate-limit scheduler's skips excluded).
+    """
+    results: list = []
+    for call in calls:
+        runs = runs_by_pid.get(call.pid)
+        if not runs or runs is SKIPPED:
+            results.append(None)
+        elif call.section == "recent_branches":
+            results.append(recent_branches_from_runs(runs[:RECENT_RUNS_WINDOW],
+                                                     call.args[3]))
+        elif call.section == "workflows":
+            results.append(latest_run_from_runs(runs, call.key, BRANCH))
+        else:
+            results.append(latest_run_from_runs(runs, call.key))
+
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        print(f"  {len(missing)} workflow(s) not in the fetched window — "
+              f"falling back to targeted calls")
+        fallback = run_calls([calls[i] for i in missing], max_workers)
+        for i, result in zip(missing, fallback):
+            results[i] = result
+    return results, sum(results[i] is not SKIPPED for i in missing)
+
+
+def run_calls_with_sweep(calls: list[BakeCall], projects: list[dict], token: str,
+                         max_workers: int, pages: int) -> tuple[list, int]:
+    """Resolve *calls* from one ``/actions/runs`` sweep per repository.
+
+    Returns the results in call order and the number of fetches actually
+    issued (sweeps + fallbacks, not counting calls that were ``SKIPPED``).
+    """
+    sweeps = [BakeCall(p["id"], "sweep", "", fetch_repo_runs,
+                       (p["owner"], p["repo"], token, pages))
+              for p in projects]
+    sweep_runs = dict(zip((c.pid for c in sweeps), run_calls(sweeps, max_workers)))
+    results, n_fallback = resolve_calls_from_runs(calls, sweep_runs, max_workers)
+    n_sweeps = sum(runs is not SKIPPED for runs in sweep_runs.values())
+    return results, n_sweeps + n_fallback
+
+
+def run_calls_with_graphql(calls: list[BakeCall], projects: list[dict], token: str,
+                           max_workers: int, batch_size: int) -> tuple[list, int]:
+    """Resolve *calls* from batched GraphQL queries (``batch_size`` repos each).
+
+    Returns the results in call order and the number of requests issued
+    (GraphQL queries + REST fallbacks, not counting calls that were ``SKIPPED``).
+    """
+    batch_size = max(1, batch_size)
+    batches = [projects[i:i + batch_size]
+               for i in range(0, len(projects), batch_size)]
+    queries = [BakeCall("", "graphql", "", fetch_repos_runs_graphql, (batch, token))
+               for batch in batches]
+    runs_by_pid: dict = {}
+    n_queries = 0
+    for batch_runs in run_calls(queries, max_workers):
+        if batch_runs is not SKIPPED:
+            runs_by_pid.update(batch_runs)
+            n_queries += 1
+    results, n_fallback = resolve_calls_from_runs(calls, runs_by_pid, max_workers)
+    return results, n_queries + n_fallback
+
+
+def _run_summary(run: dict, with_branch: bool = False) -> dict:
+    summary = {
+        "conclusion": run.get("conclusion") or run.get("status") or "unknown",
+        "updated_at": run.get("updated_at", ""),
+    }
+    if with_branch:
+        summary["head_branch"] = run.get("head_branch", "")
+    return summary
+
+
+def load_previous_snapshot(path: str) -> dict | None:
+    """Load a previously published PREFETCHED_CI_DATA payload.
+
+    *path* may be a JSON file holding the payload or a built dashboard HTML
+    file, from which the inlined ``const PREFETCHED_CI_DATA = …;`` is read.
+    A dashboard built with ``--data-file`` inlines null; its snapshot is then
+    read from the ``CI_DATA_URL`` file next to it.  Returns None when the file
+    is missing or holds no baked data.
+    """
+    if not path or not os.path.isfile(path):
+        return None
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    if not path.endswith(".json"):
+        match = re.search(r"^const PREFETCHED_CI_DATA = (.*);$", text, re.MULTILINE)
+        if not match:
+            return None
+        sidecar = re.search(r'^const CI_DATA_URL = "([^"/?]+)(?:\?[^"]*)?";$', text, re.MULTILINE)
+        if match.group(1) == "null" and sidecar:
+            return load_previous_snapshot(
+                os.path.join(os.path.dirname(path), sidecar.group(1)))
+        text = match.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        print(f"  WARNING: could not parse previous snapshot {path}", file=sys.stderr)
+        return None
+    return data if isinstance(data, dict) and "projects" in data else None
 
-            if panel_data:
-                proj_data["panel_workflows"] = panel_data
 
-            if not proj.get("fixed_branch", False):
-                print("  Fetching recent branches ...", end=" ")
-                branches = fetch_recent_branches(owner, repo, token, max_branches)
-                total_calls += 1
-                proj_data["recent_branches"] = branches
-                print(branches if branches else "(none found)")
+# Run states that are still changing; such entries are always re-fetched by an
+# incremental bake regardless of their age.
+PENDING_STATES = {"in_progress", "queued", "requested", "waiting", "pending", "unknown"}
 
-            baked_projects[pid] = proj_data
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
 
+
+def previous_entry(prev_projects: dict, call: BakeCall) -> tuple:
+    """Return ``(entry, fetched_at)`` for *call* from a previous snapshot."""
+    prev = prev_projects.get(call.pid, {})
+    if call.section == "recent_branches":
+        return prev.get("recent_branches"), prev.get("branches_fetched_at")
+    entry = prev.get(call.section, {}).get(call.key)
+    return entry, (entry or {}).get("fetched_at")
+
+
+def is_fresh(call: BakeCall, entry, fetched_at: str | None,
+             max_age_minutes: float, now: datetime) -> bool:
+    """True when a previous entry can be kept as-is by an incremental bake."""
+    if entry is None or not fetched_at:
+        return False
+    if call.section != "recent_branches" and entry.get("conclusion") in PENDING_STATES:
+        return False
+    try:
+        fetched = datetime.strptime(fetched_at, TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return False
+    return (now - fetched).total_seconds() < max_age_minutes * 60
+
+
+def bake_ci_data(config: dict, token: str, previous: dict | None = None,
+                 incremental: bool = False) -> dict | None:
+    """Fetch CI data for all projects and return the PREFETCHED_CI_DATA payload.
+
+    All API calls are planned up front and dispatched concurrently (up to
+    ``bake.max_workers`` at a time); results are then assembled in config
+    order so the payload is identical to a serial bake.  With
+    ``bake.fetch_mode: repo`` the per-workflow calls are answered from a
+    single ``/actions/runs`` sweep per repository instead, and with
+    ``bake.fetch_mode: graphql`` from batched GraphQL queries.
+
+    Calls are scheduled against the GitHub rate-limit budget (see
+    ``RateLimitBudget``).  Entries skipped because the budget ran out are
+    filled from *previous* (the last published snapshot) when available.
+
+    Every entry records its own ``fetched_at``.  With *incremental*, entries
+    of *previous* younger than ``bake.max_age_minutes`` whose run had
+    finished are kept and only the rest are re-fetched.
+    """
+    global RATE_LIMIT, BAKE_METRICS
+    projects = config.get("projects", [])
+    max_branches = config.get("dashboard", {}).get("max_recent_branches", 2)
+    bake_cfg = config.get("bake", {})
+    max_workers = int(bake_cfg.get("max_workers", DEFAULT_BAKE_WORKERS))
+    fetch_mode = bake_cfg.get("fetch_mode", "workflow")
+    max_age = float(bake_cfg.get("max_age_minutes", 60))
+    prev_projects = (previous or {}).get("projects", {})
+    now = datetime.now(timezone.utc)
+    fetched_at = now.strftime(TIMESTAMP_FORMAT)
+    failures = 0
+    reused   = 0
+
+    RATE_LIMIT = RateLimitBudget(
+        reserve=int(bake_cfg.get("rate_limit_reserve", 100)),
+        max_retries=int(bake_cfg.get("max_retries", 3)),
+    )
+    BAKE_METRICS = BakeMetrics()
+
+    calls = [c for proj in projects
+             for c in plan_project_calls(proj, token, max_branches)]
+
+    kept: set[int] = set()
+    if incremental and prev_projects:
+        kept = {i for i, call in enumerate(calls)
+                if is_fresh(call, *previous_entry(prev_projects, call), max_age, now)}
+        print(f"\nIncremental bake: keeping {len(kept)} fresh entries "
+              f"(< {max_age:g} min old), re-fetching {len(calls) - len(kept)}")
+    stale_calls = [c for i, c in enumerate(calls) if i not in kept]
+    stale_pids = {c.pid for c in stale_calls}
+    stale_projects = [p for p in projects if p["id"] in stale_pids]
+
+    try:
+        if not stale_calls:
+            stale_results, total_calls = [], 0
+        elif fetch_mode == "repo":
+            print(f"\nSweeping /actions/runs for {len(stale_projects)} repositories "
+                  f"({max(1, max_workers)} concurrent) ...")
+            stale_results, total_calls = run_calls_with_sweep(
+                stale_calls, stale_projects, token, max_workers,
+                int(bake_cfg.get("sweep_pages", 1)),
+            )
+        elif fetch_mode == "graphql":
+            batch_size = int(bake_cfg.get("graphql_batch_size", len(stale_projects) or 1))
+            print(f"\nQuerying GraphQL for {len(stale_projects)} repositories "
+                  f"({batch_size} per query) ...")
+            stale_results, total_calls = run_calls_with_graphql(
+                stale_calls, stale_projects, token, max_workers, batch_size,
+            )
+        else:
+            print(f"\nDispatching {len(stale_calls)} API calls "
+                  f"({max(1, max_workers)} concurrent) ...")
+            stale_results = run_calls(stale_calls, max_workers)
+            total_calls = sum(r is not SKIPPED for r in stale_results)
     except RuntimeError as exc:
         print(f"\nERROR: {exc}", file=sys.stderr)
         return None
 
-    print(f"\nTotal API calls attempted: {total_calls}")
+    fetched_results = iter(stale_results)
+    baked_projects: dict = {proj["id"]: {"workflows": {}} for proj in projects}
+    current_pid = None
+    for i, call in enumerate(calls):
+        if call.pid != current_pid:
+            current_pid = call.pid
+            print(f"\n[{call.pid}]")
+        proj_data = baked_projects[call.pid]
+        label = call.key or "recent branches"
+
+        result = None if i in kept else next(fetched_results)
+        if i in kept or result is SKIPPED:
+            entry, entry_fetched_at = previous_entry(prev_projects, call)
+            if entry is not None:
+                if call.section == "recent_branches":
+                    proj_data["recent_branches"] = entry
+                    proj_data["branches_fetched_at"] = entry_fetched_at or ""
+                else:
+                    proj_data.setdefault(call.section, {})[call.key] = entry
+            if i in kept:
+                print(f"  {label} ... kept (fetched {entry_fetched_at})")
+            elif entry is not None:
+                reused += 1
+                print(f"  {label} ... skipped (rate limit) — reused previous snapshot")
+            else:
+                failures += 1
+                print(f"  {label} ... skipped (rate limit) — no previous data")
+            continue
+
+        if call.section == "recent_branches":
+            proj_data["recent_branches"] = result
+            proj_data["branches_fetched_at"] = fetched_at
+            print(f"  Recent branches ... {result if result else '(none found)'}")
+            continue
+
+        if call.section == "workflows":
+            print(f"  Run: {call.key} @ {BRANCH} ...", end=" ")
+        else:
+            print(f"  Panel run: {call.key} (any branch) ...", end=" ")
+        if result:
+            summary = _run_summary(result, with_branch=call.section == "panel_workflows")
+            summary["fetched_at"] = fetched_at
+            proj_data.setdefault(call.section, {})[call.key] = summary
+            print(summary["conclusion"])
+        else:
+            failures += 1
+            print("no data")
+
+    print(f"\nTotal API calls made: {total_calls} "
+          f"({RATE_LIMIT.skipped} skipped by the rate-limit budget)")
+    print(RATE_LIMIT.report())
+    if reused:
+        print(f"Reused {reused} entries from the previous snapshot.")
+    if HTTP_POOL is not None:
+        print(f"Connections: {HTTP_POOL.opened} opened, {HTTP_POOL.reused} reused (keep-alive)")
+    if BAKE_METRICS.calls:
+        print("\n" + BAKE_METRICS.table())
+    if HTTP_CACHE is not None:
+        print(f"HTTP cache: {HTTP_CACHE.hits} not-modified (304) hit(s), "
+              f"{HTTP_CACHE.stores} response(s) stored in {HTTP_CACHE.directory}")
 
     payload = {
-        "baked_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "baked_at": fetched_at,
         "projects": baked_projects,
     }
 
@@ -292,15 +1417,651 @@ def bake_ci_data(config: dict, token: str) -> dict | None:
     return payload
 
 
+# ---------------------------------------------------------------------------
+# Sidecar data file (--data-file)
+# ---------------------------------------------------------------------------
+
+DATA_FILE_NAME = "ci-data.json"
+
+
+# Bake bookkeeping that changes on every bake without changing what the
+# dashboard shows; excluded from the snapshot's content hash.
+VOLATILE_KEYS = {"baked_at", "fetched_at", "branches_fetched_at", "content_hash"}
+
+
+def _strip_volatile(value):
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+
+def data_digest(payload: dict) -> str:
+    """Content hash of a baked snapshot, ignoring bake timestamps."""
+    body = json.dumps(_strip_volatile(payload), separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(body.encode()).hexdigest()[:16]
+
+
+def write_data_file(out_dir: str, payload: dict, content_hash: str) -> str:
+    """Write the baked snapshot to ``ci-data.json`` in *out_dir*.
+
+    The file is compact JSON carrying *content_hash* — the build manifest's
+    suffix for it (see ``build_manifest``) — so the HTML shell stays
+    byte-identical across bakes and only this small file changes.  Returns
+    the written path.
+    """
+    path = os.path.join(out_dir, DATA_FILE_NAME)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(dict(payload, content_hash=content_hash), fh, separators=(",", ":"))
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Build manifest (skip-if-unchanged, cache-busting)
+# ---------------------------------------------------------------------------
+
+BUILD_MANIFEST_NAME = "build-manifest.json"
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def build_manifest(sources: dict[str, str], options: dict, payload: dict | None) -> dict:
+    """Describe one build: hashes of every input, the build options and the data.
+
+    *sources* maps input paths to their contents; paths are recorded relative
+    to the repository root.  ``assets`` holds the cache-busting suffix of
+    each file the shell links to (see ``asset_url``); ``outputs`` is filled
+    in once the files are written.
+    """
+    digest = data_digest(payload) if payload else None
+    return {
+        "inputs":   {os.path.relpath(path, REPO_ROOT).replace(os.sep, "/"): text_digest(text)
+                     for path, text in sorted(sources.items())},
+        "options":  options,
+        "data":     digest,
+        "assets":   {DATA_FILE_NAME: digest} if digest else {},
+        "baked_at": (payload or {}).get("baked_at"),
+        "outputs":  {},
+    }
+
+
+def asset_url(manifest: dict, name: str) -> str:
+    """Relative URL of asset *name*, versioned by its suffix in *manifest*."""
+    return f"{name}?v={manifest['assets'][name]}"
+
+
+def load_build_manifest(path: str) -> dict | None:
+    if not path or not os.path.isfile(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except ValueError:
+        return None
+
+
+def build_unchanged(previous: dict | None, current: dict, max_age_minutes: float) -> bool:
+    """True when *current* would reproduce the build recorded in *previous*.
+
+    A build with baked data also needs the previous snapshot to be younger
+    than *max_age_minutes*, so the page's "Snapshot from …" label never
+    falls further behind than an incremental bake would.
+    """
+    if not previous or any(previous.get(k) != current[k] for k in ("inputs", "options", "data")):
+        return False
+    if current["data"] is None:
+        return True
+    try:
+        baked_at = datetime.strptime(previous.get("baked_at") or "", TIMESTAMP_FORMAT)
+    except ValueError:
+        return False
+    age = datetime.now(timezone.utc) - baked_at.replace(tzinfo=timezone.utc)
+    return age.total_seconds() < max_age_minutes * 60
+
+
+def _file_digest(path: str) -> str | None:
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()[:16]
+
+
+def stale_outputs(manifest: dict, directory: str, required: tuple[str, ...] = ()) -> list[str]:
+    """Outputs of *manifest* that are missing or modified in *directory*.
+
+    Every file in ``outputs`` — the dashboard, ``ci-data.json`` and their
+    ``.gz``/``.br`` siblings — has to be there byte for byte; names in
+    *required* that the manifest does not list count as missing too.
+    """
+    outputs = manifest.get("outputs") or {}
+    stale = [name for name, digest in outputs.items()
+             if _file_digest(os.path.join(directory, name)) != digest]
+    return sorted(stale + [name for name in required if name not in outputs])
+
+
+def write_build_manifest(path: str, manifest: dict) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def set_ci_output(name: str, value: str) -> None:
+    """Expose *name* as a GitHub Actions step output (no-op elsewhere)."""
+    path = os.environ.get("GITHUB_OUTPUT")
+    if path:
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(f"{name}={value}\n")
+
+
+# ---------------------------------------------------------------------------
+# Production build (minify + precompress)
+# ---------------------------------------------------------------------------
+
+_CSS_STRING = r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and insignificant whitespace from a stylesheet.
+
+    Only whitespace around ``{ } ; , >`` and after ``:`` is removed, so
+    selectors such as ``a :hover`` and ``calc(1px + 2px)`` keep their meaning.
+    """
+    css = re.sub(_CSS_STRING + r"|/\*.*?\*/", lambda m: m.group(1) or " ", css, flags=re.S)
+    parts = re.split(_CSS_STRING, css)
+    for i in range(0, len(parts), 2):
+        part = re.sub(r"\s+", " ", parts[i])
+        part = re.sub(r"\s*([{};,>])\s*", r"\1", part)
+        parts[i] = re.sub(r":\s+", ":", part)
+    return re.sub(r";+}", "}", "".join(parts)).strip()
+
+
+# Tokens after which a "/" starts a regular expression rather than a division.
+# A keyword only counts when it is not a property name (".return"), a ")"
+# only when it closes the condition of one of _JS_CONDITION_KEYWORDS, and
+# "++"/"--" only when prefix.
+_JS_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_JS_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of",
+                      "void", "delete", "throw", "new", "instanceof"}
+_JS_CONDITION_KEYWORDS = {"if", "while", "for", "with"}
+# A newline after / before these can be dropped without triggering (or
+# suppressing) automatic semicolon insertion.
+_JS_JOIN_AFTER = set("{([,;:=&|?<>*%!~^")
+_JS_JOIN_BEFORE = set("})],;.?:")
+
+
+def _js_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "_$\\"
+
+
+def _js_skip_string(src: str, i: int) -> int:
+    """Return the index just past the string/template literal starting at *i*."""
+    quote = src[i]
+    i += 1
+    while i < len(src):
+        ch = src[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == quote:
+            return i + 1
+        if quote == "`" and src.startswith("${", i):
+            depth, i = 1, i + 2
+            while depth and i < len(src):
+                if src[i] in "'\"`":
+                    i = _js_skip_string(src, i)
+                    continue
+                depth += {"{": 1, "}": -1}.get(src[i], 0)
+                i += 1
+            continue
+        if ch == "\n" and quote != "`":
+            break
+        i += 1
+    raise ValueError(f"unterminated string literal at offset {i}")
+
+
+def _js_skip_regex(src: str, i: int) -> int:
+    """Return the index just past the regex literal (and flags) starting at *i*."""
+    in_class = False
+    i += 1
+    while i < len(src) and src[i] != "\n":
+        ch = src[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "/" and not in_class:
+            i += 1
+            while i < len(src) and src[i].isalpha():
+                i += 1
+            return i
+        i += 1
+    raise ValueError(f"unterminated regex literal at offset {i}")
+
+
+def minify_js(src: str) -> str:
+    """Strip comments and insignificant whitespace from JavaScript.
+
+    A conservative, dependency-free pass: string, template and regex literals
+    are copied verbatim, and line breaks are kept wherever dropping them could
+    change automatic semicolon insertion.  No identifiers are renamed.
+    """
+    out: list[str] = []
+    regex_ok = True     # would a "/" here start a regex literal?
+    last_token = ""     # previous token
+    parens: list[bool] = []   # open "(": does it hold an if/while/for condition?
+    last_property = False     # was the previous token a property name?
+    pending = ""        # "", " " or "\n" — whitespace seen since the last token
+    i, n = 0, len(src)
+
+    while i < n:
+        ch = src[i]
+        if ch in " \t\r\n":
+            if ch == "\n" or pending == "\n":
+                pending = "\n"
+            elif not pending:
+                pending = " "
+            i += 1
+            continue
+        if src.startswith("//", i):
+            end = src.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            if end < 0:
+                raise ValueError(f"unterminated comment at offset {i}")
+            i = end + 2
+            pending = pending or " "
+            continue
+
+        prev = out[-1][-1] if out else ""
+        property_name = last_token == "."
+        if ch in "'\"`":
+            end = _js_skip_string(src, i)
+            next_regex_ok = False
+        elif ch == "/" and regex_ok:
+            end = _js_skip_regex(src, i)
+            next_regex_ok = False
+        elif _js_word_char(ch):
+            end = i + 1
+            while end < n and _js_word_char(src[end]):
+                end += 1
+            next_regex_ok = not property_name and src[i:end] in _JS_REGEX_KEYWORDS
+        elif src.startswith(("++", "--"), i):
+            end = i + 2
+            next_regex_ok = regex_ok    # prefix: an operand follows; postfix: one ended
+        else:
+            end = i + 1
+            if ch == "(":
+                parens.append(last_token in _JS_CONDITION_KEYWORDS and not last_property)
+            next_regex_ok = (parens.pop() if parens else False) if ch == ")" \
+                else ch in _JS_REGEX_AFTER
+        token = src[i:end]
+
+        if pending and prev:
+            if pending == "\n" and not (prev in _JS_JOIN_AFTER or ch in _JS_JOIN_BEFORE):
+                out.append("\n")
+            elif (_js_word_char(prev) and _js_word_char(ch)) or \
+                 (prev in "+-" and ch in "+-") or (prev.isdigit() and ch == "."):
+                out.append(" ")
+        out.append(token)
+        last_property = property_name
+        last_token = token
+        regex_ok = next_regex_ok
+        pending = ""
+        i = end
+
+    return "".join(out)
+
+
+def _compressors() -> list[tuple[str, Callable[[bytes], bytes]]]:
+    """(suffix, compress) pairs for the precompressed siblings of an artifact."""
+    compressors = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        compressors.append((".br", lambda data: brotli.compress(data, quality=11)))
+    return compressors
+
+
+def compressed_sizes(text: str) -> dict:
+    """Raw and compressed byte counts of *text*, keyed "raw", "gz" and "br"."""
+    data = text.encode("utf-8")
+    sizes = {"raw": len(data)}
+    for suffix, compress in _compressors():
+        sizes[suffix[1:]] = len(compress(data))
+    return sizes
+
+
+def write_precompressed(path: str) -> list[str]:
+    """Write ``.gz`` (and, with brotli installed, ``.br``) siblings of *path*.
+
+    Hosts that serve precompressed files (nginx ``gzip_static``, most CDNs)
+    can then hand them out without compressing on every request.  gzip
+    output uses mtime 0 so identical inputs give identical files.
+    """
+    with open(path, "rb") as fh:
+        data = fh.read()
+    written = []
+    for suffix, compress in _compressors():
+        with open(path + suffix, "wb") as fh:
+            fh.write(compress(data))
+        written.append(path + suffix)
+    return written
+
+
+def size_report(sections: list[tuple[str, str, str]]) -> str:
+    """Render a per-section table of source vs. built vs. compressed bytes.
+
+    *sections* holds ``(name, source_text, built_text)`` tuples.
+    """
+    has_br = brotli is not None
+    lines = [f"{'Section':<14}{'source':>10}{'built':>10}{'gzip':>10}"
+             + (f"{'brotli':>10}" if has_br else "")]
+    totals = {"source": 0, "raw": 0, "gz": 0, "br": 0}
+    for name, source, built in sections:
+        src_bytes = len(source.encode("utf-8"))
+        sizes = compressed_sizes(built)
+        totals["source"] += src_bytes
+        for key in ("raw", "gz", "br"):
+            totals[key] += sizes.get(key, 0)
+        lines.append(f"{name:<14}{src_bytes:>10}{sizes['raw']:>10}{sizes['gz']:>10}"
+                     + (f"{sizes['br']:>10}" if has_br else ""))
+    lines.append(f"{'TOTAL':<14}{totals['source']:>10}{totals['raw']:>10}{totals['gz']:>10}"
+                 + (f"{totals['br']:>10}" if has_br else ""))
+    if not has_br:
+        lines.append("(install 'brotli' for .br output and sizes)")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def prepare_css(css: str, minify: bool = False) -> str:
+    # Indent CSS for clean output inside <style> tags
+    return minify_css(css) if minify else textwrap.indent(css, "    ")
+
+
+def prepare_js(js: str, minify: bool = False) -> str:
+    if not minify:
+        return js
+    try:
+        return minify_js(js)
+    except ValueError as exc:
+        print(f"  WARNING: could not minify JavaScript ({exc}); keeping it as is",
+              file=sys.stderr)
+        return js
+
+
+def render_dashboard(template, config: dict, css_out: str, js_config: str,
+                     js_engine_out: str) -> str:
+    """Render the compiled *template* with already prepared CSS and JS."""
+    dashboard = config.get("dashboard", {})
+    return template.render(
+        css=css_out,
+        js=js_config + "\n\n" + js_engine_out,
+        default_theme=dashboard.get("default_theme", "light"),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Dev server (--serve)
+# ---------------------------------------------------------------------------
+
+# Injected before </body> of served pages; reloads on every rebuild.
+LIVE_RELOAD_SNIPPET = (
+    "<script>new EventSource('/__reload').onmessage = () => location.reload();</script>\n"
+)
+
+
+class DevBuild:
+    """In-memory dashboard build that re-processes one source at a time.
+
+    Each section (``config``, ``template``, ``css``, ``js``) keeps its
+    processed form, so a change to style.css only re-reads the CSS: the
+    parsed config, generated JS constants and compiled Jinja template are
+    reused.  A source that fails to load (YAML or template syntax error)
+    keeps serving the last good build.
+    """
+
+    def __init__(self, paths: dict[str, str] | None = None, prefetched: dict | None = None,
+                 minify: bool = False):
+        self.paths = paths or {"config": CONFIG_PATH, "template": TEMPLATE_PATH,
+                               "css": CSS_PATH, "js": JS_PATH}
+        self.prefetched = prefetched
+        self.minify = minify
+        self.env = Environment(autoescape=False)
+        self.version = 0
+        self.html = ""
+        self._stamps: dict[str, tuple] = {}
+        self._cond = threading.Condition()
+        for section in self.paths:
+            self._load(section)
+        self.html = self._render()
+
+    def _stamp(self, section: str) -> tuple:
+        try:
+            st = os.stat(self.paths[section])
+        except OSError:
+            return ()
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self, section: str) -> None:
+        self._stamps[section] = self._stamp(section)
+        with open(self.paths[section], encoding="utf-8") as fh:
+            text = fh.read()
+        if section == "config":
+            self.config = yaml.safe_load(text)
+            self.js_config = generate_js_config(self.config, self.prefetched,
+                                                compact=self.minify)
+        elif section == "template":
+            self.template = self.env.from_string(text)
+        elif section == "css":
+            self.css_out = prepare_css(text, self.minify)
+        elif section == "js":
+            self.js_out = prepare_js(text, self.minify)
+
+    def _render(self) -> str:
+        html = render_dashboard(self.template, self.config, self.css_out,
+                                self.js_config, self.js_out)
+        head, sep, tail = html.rpartition("</body>")
+        return head + LIVE_RELOAD_SNIPPET + sep + tail if sep else html + LIVE_RELOAD_SNIPPET
+
+    def changed_sections(self) -> list[str]:
+        return [s for s in self.paths if self._stamp(s) != self._stamps.get(s)]
+
+    def rebuild(self, sections: list[str]) -> float:
+        """Reload *sections*, re-render and notify waiters; returns elapsed ms."""
+        start = time.perf_counter()
+        try:
+            for section in sections:
+                self._load(section)
+            html = self._render()
+        except (OSError, yaml.YAMLError, TemplateError, ValueError, KeyError) as exc:
+            print(f"  {', '.join(sections)}: {type(exc).__name__}: {exc} "
+                  "— still serving the last good build", file=sys.stderr)
+            return (time.perf_counter() - start) * 1000
+        with self._cond:
+            self.html = html
+            self.version += 1
+            self._cond.notify_all()
+        return (time.perf_counter() - start) * 1000
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """Block until the build is newer than *version* (or *timeout*)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+def watch_sources(build: DevBuild, stop: threading.Event, interval: float = 0.2) -> None:
+    """Poll the source files and rebuild whichever sections changed."""
+    while not stop.wait(interval):
+        sections = build.changed_sections()
+        if sections:
+            elapsed = build.rebuild(sections)
+            print(f"Rebuilt {', '.join(sections)} in {elapsed:.0f} ms (v{build.version})")
+
+
+class _DevHandler(http.server.BaseHTTPRequestHandler):
+    server_version = "DashboardDev/1.0"
+
+    def do_GET(self):
+        build: DevBuild = self.server.build
+        path = urllib.parse.urlsplit(self.path).path
+        if path in ("/", "/index.html", "/dashboard.html"):
+            body = build.html.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+        elif path == "/__reload":
+            self._event_stream(build)
+        else:
+            self.send_error(404)
+
+    def _event_stream(self, build: DevBuild) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        version = build.version
+        try:
+            while True:
+                current = build.wait_for_change(version, timeout=15)
+                # A comment line keeps idle connections from timing out.
+                self.wfile.write(f"data: {current}\n\n".encode() if current != version
+                                 else b": ping\n\n")
+                self.wfile.flush()
+                version = current
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def log_message(self, format, *args):  # noqa: A002 — keep the console for rebuilds
+        pass
+
+
+def make_dev_server(build: DevBuild, host: str = "127.0.0.1",
+                    port: int = 8000) -> http.server.ThreadingHTTPServer:
+    server = http.server.ThreadingHTTPServer((host, port), _DevHandler)
+    server.daemon_threads = True
+    server.build = build
+    return server
+
+
+def serve(port: int, fixture: str = "", minify: bool = False) -> int:
+    """Serve the dashboard from memory with live reload until interrupted."""
+    prefetched = None
+    if fixture:
+        prefetched = load_previous_snapshot(fixture)
+        if prefetched is None:
+            print(f"ERROR: no PREFETCHED_CI_DATA in fixture {fixture}", file=sys.stderr)
+            return 1
+        print(f"Fixture: {fixture} ({prefetched.get('baked_at', '?')})")
+
+    start = time.perf_counter()
+    build = DevBuild(prefetched=prefetched, minify=minify)
+    print(f"Built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    server = make_dev_server(build, port=port)
+    stop = threading.Event()
+    watcher = threading.Thread(target=watch_sources, args=(build, stop), daemon=True)
+    watcher.start()
+    print(f"Serving on http://127.0.0.1:{server.server_address[1]}/ "
+          "(watching sources; Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+    finally:
+        stop.set()
+        server.server_close()
+    return 0
+
+
+def export_worker_config(path: str) -> int:
+    """Write ``worker_snapshot_config`` for projects.yaml to *path* ('-': stdout)."""
+    with open(CONFIG_PATH, encoding="utf-8") as fh:
+        config = yaml.safe_load(fh)
+    text = json.dumps(worker_snapshot_config(config), separators=(",", ":"))
+    if path == "-":
+        print(text)
+    else:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+        print(f"Worker config: {path}")
+    return 0
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> int:
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build (and optionally bake) the VIPER Ecosystem Dashboard.",
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="re-fetch only entries of the previous snapshot that are older than "
+             "bake.max_age_minutes or were still running; keep the rest",
+    )
+    parser.add_argument(
+        "--data-file", action="store_true",
+        help=f"write baked data to {DATA_FILE_NAME} next to the output instead of "
+             "inlining it, so the HTML shell only changes when its sources do",
+    )
+    parser.add_argument(
+        "--serve", action="store_true",
+        help="serve the dashboard from memory on localhost, rebuilding the changed "
+             "section whenever a source file changes (live reload)",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000,
+        help="port for --serve (default: 8000)",
+    )
+    parser.add_argument(
+        "--fixture", default="",
+        help="with --serve: recorded snapshot (ci-data.json, snapshot JSON or a "
+             "built dashboard) to inline as PREFETCHED_CI_DATA, so no network is needed",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help=f"render and write the output even if {BUILD_MANIFEST_NAME} shows "
+             "nothing changed since the last build",
+    )
+    parser.add_argument(
+        "--minify", action="store_true",
+        help="production build: minify CSS/JS, compact the JSON constants, write "
+             ".gz/.br siblings of the outputs and print a per-section size report",
+    )
+    parser.add_argument(
+        "--worker-config", metavar="PATH", default="",
+        help="write the Worker's SNAPSHOT_CONFIG (projects to pre-warm) as JSON to "
+             "PATH ('-' for stdout) and exit",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args([] if argv is None else argv)
+    if args.serve:
+        return serve(args.port, args.fixture, args.minify)
+    if args.worker_config:
+        return export_worker_config(args.worker_config)
+
     # ── Load config ────────────────────────────────────────────────────
     print(f"Config : {CONFIG_PATH}")
     with open(CONFIG_PATH, encoding="utf-8") as fh:
-        config = yaml.safe_load(fh)
+        config_text = fh.read()
+    config = yaml.safe_load(config_text)
 
     # ── Load source files ──────────────────────────────────────────────
     with open(CSS_PATH, encoding="utf-8") as fh:
@@ -317,44 +2078,118 @@ def main() -> int:
     # ── Bake CI data (if token available) ──────────────────────────────
     token = os.environ.get("GITHUB_TOKEN", "")
     prefetched = None
+    previous_path = os.environ.get(
+        "DASHBOARD_PREVIOUS",
+        config.get("bake", {}).get("previous_snapshot", ""),
+    )
     if token:
         print("\nGITHUB_TOKEN found — baking CI data...")
-        prefetched = bake_ci_data(config, token)
+        configure_http_cache(config)
+        configure_http_pool(config)
+        previous = load_previous_snapshot(previous_path)
+        if previous:
+            print(f"Previous snapshot: {previous_path} ({previous.get('baked_at', '?')})")
+        if args.incremental and not previous:
+            print("No previous snapshot — incremental bake falls back to a full bake.")
+        prefetched = bake_ci_data(config, token, previous, incremental=args.incremental)
+        if HTTP_POOL is not None:
+            HTTP_POOL.close()
         if prefetched is None:
             print("ERROR: Bake failed.", file=sys.stderr)
             return 1
     else:
         print("\nNo GITHUB_TOKEN — skipping bake (live mode).")
 
+    out_path = os.environ.get("DASHBOARD_OUT", DEFAULT_OUT)
+    out_path = os.path.normpath(out_path)
+    out_dir = os.path.dirname(out_path) or "."
+    os.makedirs(out_dir, exist_ok=True)
+
+    # ── Compare with the last build ────────────────────────────────────
+    #    The manifest next to the output (local rebuilds) or next to the
+    #    previously published dashboard (CI) records what that build was
+    #    made from; an identical build is not rendered or written again.
+    with open(os.path.abspath(__file__), encoding="utf-8") as fh:
+        builder_src = fh.read()
+    manifest = build_manifest(
+        {CONFIG_PATH: config_text, TEMPLATE_PATH: template_str, CSS_PATH: css_content,
+         JS_PATH: js_engine, os.path.abspath(__file__): builder_src},
+        {"minify": args.minify, "data_file": args.data_file},
+        prefetched,
+    )
+    #    A build only counts as unchanged while every artifact that manifest
+    #    lists is still there untouched.
+    manifest_path = os.path.join(out_dir, BUILD_MANIFEST_NAME)
+    last_dir = out_dir
+    last_manifest = load_build_manifest(manifest_path)
+    if last_manifest is None and previous_path:
+        last_dir = os.path.dirname(previous_path) or "."
+        last_manifest = load_build_manifest(os.path.join(last_dir, BUILD_MANIFEST_NAME))
+    max_age = float(config.get("bake", {}).get("max_age_minutes", 60))
+    unchanged = not args.force and build_unchanged(last_manifest, manifest, max_age)
+    if unchanged:
+        stale = stale_outputs(last_manifest, last_dir, (os.path.basename(out_path),))
+        if stale:
+            print(f"\nRebuilding: {', '.join(stale)} missing or modified in {last_dir}.")
+            unchanged = False
+    set_ci_output("changed", "false" if unchanged else "true")
+    if unchanged:
+        if os.path.samefile(last_dir, out_dir):
+            print(f"\nUnchanged: {out_path} already matches {BUILD_MANIFEST_NAME} "
+                  "— nothing rendered or written.")
+            if prefetched:
+                write_bake_metrics(os.path.join(out_dir, BAKE_METRICS_NAME), prefetched)
+            return 0
+        print("\nUnchanged since the last published build (deploy can be skipped).")
+
     # ── Generate JS config ─────────────────────────────────────────────
-    js_config = generate_js_config(config, prefetched)
-    full_js = js_config + "\n\n" + js_engine
+    data_url = ""
+    if prefetched and args.data_file:
+        # The manifest's content hash doubles as a cache-busting suffix: the
+        # shell only changes when the data it points at does.
+        content_hash = manifest["assets"][DATA_FILE_NAME]
+        data_path = write_data_file(out_dir, prefetched, content_hash)
+        data_url = asset_url(manifest, DATA_FILE_NAME)
+        manifest["outputs"][DATA_FILE_NAME] = _file_digest(data_path)
+        print(f"\nData   : {data_path} ({os.path.getsize(data_path)} bytes, "
+              f"hash {content_hash})")
+
+    js_config = generate_js_config(config, prefetched, data_url, compact=args.minify)
+    css_out = prepare_css(css_content, args.minify)
+    js_engine_out = prepare_js(js_engine, args.minify)
 
     # ── Render template ────────────────────────────────────────────────
-    dashboard = config.get("dashboard", {})
-    default_theme = dashboard.get("default_theme", "light")
-
-    # Indent CSS for clean output inside <style> tags
-    css_indented = textwrap.indent(css_content, "    ")
-
     env = Environment(autoescape=False)
     template = env.from_string(template_str)
-    html = template.render(
-        css=css_indented,
-        js=full_js,
-        default_theme=default_theme,
-    )
+    html = render_dashboard(template, config, css_out, js_config, js_engine_out)
 
     # ── Write output ───────────────────────────────────────────────────
-    out_path = os.environ.get("DASHBOARD_OUT", DEFAULT_OUT)
-    out_path = os.path.normpath(out_path)
-    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
-
     with open(out_path, "w", encoding="utf-8") as fh:
         fh.write(html)
 
+    manifest["outputs"][os.path.basename(out_path)] = _file_digest(out_path)
+
     print(f"\nOutput : {out_path} ({len(html)} bytes)")
+    if args.minify:
+        artifacts = [out_path] + ([os.path.join(out_dir, DATA_FILE_NAME)] if data_url else [])
+        for path in artifacts:
+            written = write_precompressed(path)
+            for packed in written:
+                manifest["outputs"][os.path.basename(packed)] = _file_digest(packed)
+            print(f"Packed : {', '.join(os.path.basename(p) for p in written)}")
+        sections = [
+            ("CSS", css_content, css_out),
+            ("JS engine", js_engine, js_engine_out),
+            ("config", generate_js_config(config, None, data_url),
+             generate_js_config(config, None, data_url, compact=True)),
+        ]
+        if prefetched:
+            sections.append(("baked data", json.dumps(prefetched, indent=2),
+                             json.dumps(prefetched, separators=(",", ":"))))
+        print("\n" + size_report(sections))
+    write_build_manifest(manifest_path, manifest)
     if prefetched:
+        write_bake_metrics(os.path.join(out_dir, BAKE_METRICS_NAME), prefetched)
         print(f"Snapshot: {prefetched['baked_at']}")
     else:
         print("Mode   : live (no baked data)")
@@ -363,4 +2198,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(main(sys.argv[1:]))
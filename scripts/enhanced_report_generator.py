@@ -8,14 +8,26 @@ and back links to the summary page.
 import os
 import sys
 import json
+import re
+import argparse
+import logging
+import logging.handlers
 import subprocess
 import shutil
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import tomllib  # Python 3.11+ supports tomllib natively
 import datetime
 import socket
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
+from sharding import parse_shard, record_junit_durations
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Component configurations
 COMPONENTS = [
@@ -55,6 +67,60 @@ COMPONENTS = [
         'icon': '🌟'
     }
 ]
+
+# Wall-clock seconds each component suite took on previous runs, used to start
+# the longest suites first.  Kept under gh-pages/main so the history deploy
+# carries it to the next run.
+DURATIONS_FILE = "gh-pages/main/test-durations/suite-durations.json"
+# Per-test durations of each component, from its JUnit report (see sharding.py)
+TEST_DURATIONS_FILE = "gh-pages/main/test-durations/{name}-tests.json"
+# A --shard run's suite durations; --merge-shards adds up the shards' records
+SHARD_DURATIONS_FILE = "shard-suite-durations.json"
+
+# Native thread pools capped per suite so concurrent suites share the CPU budget
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS",
+                   "NUMEXPR_NUM_THREADS")
+
+# Suite output is streamed to <LOG_DIR>/<name>-pytest.log, rotated at
+# LOG_MAX_BYTES with LOG_BACKUPS older files kept; only the last TAIL_LINES
+# lines are held in memory for the summary.
+LOG_DIR = "test-logs"
+LOG_MAX_BYTES = 20 * 1024 * 1024
+LOG_BACKUPS = 3
+TAIL_LINES = 40
+# Seconds between progress lines while a suite runs
+PROGRESS_INTERVAL = 60
+# Default limits: a whole component suite (minutes) and a single test
+# (seconds, enforced by pytest-timeout); 0 turns a limit off.  Neither is
+# limited unless asked for, on the command line or in SUITE_TIMEOUT_ENV /
+# TEST_TIMEOUT_ENV ([NAME=]NUMBER, as --suite-timeout / --test-timeout).
+# Per-component values can also be set with 'suite_timeout' / 'test_timeout'
+# in COMPONENTS.
+DEFAULT_SUITE_TIMEOUT = 0
+DEFAULT_TEST_TIMEOUT = 0
+SUITE_TIMEOUT_ENV = "TESTVIPER_SUITE_TIMEOUT"
+TEST_TIMEOUT_ENV = "TESTVIPER_TEST_TIMEOUT"
+# A suite over its limit is sent SIGUSR1 to dump every thread's stack, given
+# STACK_DUMP_WAIT seconds to write it, then terminated (killed after KILL_GRACE).
+STACK_DUMP_WAIT = 3
+STACK_DUMP_LINES = 2000
+KILL_GRACE = 10
+# Runs pytest like `python -m pytest`, with the stack dump handler registered
+# on a copy of stderr taken before pytest captures the real one.
+PYTEST_BOOTSTRAP = (
+    "import faulthandler, os, signal, sys\n"
+    "if hasattr(signal, 'SIGUSR1'):\n"
+    "    _dump_file = os.fdopen(os.dup(2), 'w')\n"
+    "    faulthandler.register(signal.SIGUSR1, file=_dump_file, all_threads=True)\n"
+    "import pytest\n"
+    "sys.exit(pytest.console_main())\n"
+)
+# A `pytest -v` result line has an outcome and a progress percentage:
+# "tests/test_x.py::test_y PASSED   [ 42%]", or with pytest-xdist
+# "[gw1] [ 42%] PASSED tests/test_x.py::test_y"
+PYTEST_OUTCOME = re.compile(r"\b(PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)\b")
+PYTEST_PERCENT = re.compile(r"\[\s*(\d+)%\]")
+
 def read_version(path_to_toml):
     """Read version from .toml"""
     if os.path.exists(os.path.join(path_to_toml, "pyproject.toml")):
@@ -81,11 +147,145 @@ Repository=casangi/{component_name}
     env_file.parent.mkdir(parents=True, exist_ok=True)
     env_file.write_text(env_content)
 
-def run_component_tests(component):
-    """Run tests for a specific component and generate Allure results"""
+def open_suite_log(component_name, log_dir=LOG_DIR):
+    """Return a logger writing to a fresh rotating log file for a suite"""
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{component_name}-pytest.log")
+    for i in range(LOG_BACKUPS + 1):
+        stale = f"{log_path}.{i}" if i else log_path
+        if os.path.exists(stale):
+            os.remove(stale)
+
+    logger = logging.getLogger(f"suite-output.{component_name}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    close_suite_log(logger)
+    handler = logging.handlers.RotatingFileHandler(
+        log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    return logger
+
+def close_suite_log(logger):
+    """Close and detach a suite logger's handlers"""
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+
+def stream_suite_output(process, component_name, logger, echo=False, timeout=None):
+    """Copy a running suite's output to its log as it arrives, until it exits
+
+    Lines are echoed to the console with a "[name]" prefix when *echo* is set.
+    Every PROGRESS_INTERVAL seconds a progress line reports the tests done so
+    far and how long the suite has been silent, so hangs show up while they
+    happen.  Returns the last TAIL_LINES lines.
+
+    A suite still running after *timeout* seconds is stopped with
+    stop_hung_suite and subprocess.TimeoutExpired is raised, with the stack
+    dump as its output.
+    """
+    tail = deque(maxlen=TAIL_LINES)
+    progress = {'tests': 0, 'failed': 0, 'percent': 0, 'last_output': time.monotonic(),
+                'dump': None}
+
+    def read():
+        for line in process.stdout:
+            line = line.rstrip("\n")
+            logger.info(line)
+            tail.append(line)
+            if progress['dump'] is not None:
+                progress['dump'].append(line)
+            progress['last_output'] = time.monotonic()
+            outcome, percent = PYTEST_OUTCOME.search(line), PYTEST_PERCENT.search(line)
+            if outcome and percent:
+                progress['tests'] += 1
+                progress['percent'] = int(percent.group(1))
+                if outcome.group(1) in ("FAILED", "ERROR"):
+                    progress['failed'] += 1
+            if echo:
+                print(f"[{component_name}] {line}", flush=True)
+
+    reader = threading.Thread(target=read, name=f"{component_name}-output", daemon=True)
+    reader.start()
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        wait = PROGRESS_INTERVAL
+        if deadline is not None:
+            wait = max(0, min(wait, deadline - time.monotonic()))
+        try:
+            process.wait(timeout=wait)
+            break
+        except KeyboardInterrupt:
+            signal_suite(process, signal.SIGTERM)
+            raise
+        except subprocess.TimeoutExpired:
+            if deadline is not None and time.monotonic() >= deadline:
+                progress['dump'] = deque(maxlen=STACK_DUMP_LINES)
+                stop_hung_suite(process)
+                reader.join(KILL_GRACE)
+                raise subprocess.TimeoutExpired(process.args, timeout,
+                                                output="\n".join(progress['dump']))
+            silent = time.monotonic() - progress['last_output']
+            print(f"[{component_name}] {progress['tests']} tests done ({progress['percent']}%), "
+                  f"{progress['failed']} failed; last output {silent:.0f}s ago", flush=True)
+    reader.join()
+    return list(tail)
+
+def signal_suite(process, sig):
+    """Send *sig* to a suite's pytest process and (on POSIX) the processes it
+    started, such as pytest-xdist workers"""
+    try:
+        if os.name == "posix":
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+    except ProcessLookupError:
+        pass
+
+def stop_hung_suite(process):
+    """Have a pytest process dump all its threads' stacks, then stop it"""
+    if hasattr(signal, "SIGUSR1"):
+        signal_suite(process, signal.SIGUSR1)
+        try:
+            process.wait(timeout=STACK_DUMP_WAIT)
+        except subprocess.TimeoutExpired:
+            pass
+    signal_suite(process, signal.SIGTERM)
+    try:
+        process.wait(timeout=KILL_GRACE)
+    except subprocess.TimeoutExpired:
+        signal_suite(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+        process.wait()
+
+def xdist_workers(test_workers, threads=None):
+    """Number of pytest-xdist workers for a suite: *test_workers*, or the
+    suite's share of the CPU budget for "auto"; 0 means no xdist"""
+    if test_workers == "auto":
+        return threads or os.cpu_count() or 1
+    return int(test_workers or 0)
+
+def run_component_tests(component, threads=None, log_dir=LOG_DIR, echo=False, test_workers=None,
+                        shard=None):
+    """Run tests for a specific component and generate Allure results
+
+    Each suite writes only to its own allure-results-<name> directory, JUnit
+    file and log, so several can run at once.  *threads* caps the native
+    thread pools of the pytest process; output goes to the suite's log in
+    *log_dir* (and the console, with *echo*) as it is produced.  The
+    component's 'suite_timeout' (minutes) and 'test_timeout' (seconds) limit
+    the run; see DEFAULT_SUITE_TIMEOUT.  With *test_workers* (a number or
+    "auto") the suite's tests are spread over pytest-xdist workers, longest
+    recorded tests first; see sharding.py.  With *shard* ("i/N") only that
+    duration-balanced share of the tests runs.  Returns a dict with the component
+    name, the pytest exit code (None if pytest did not run), the duration in
+    seconds and whether the suite timed out.
+    """
     component_name = component['name']
     component_path = component['path']
     test_path = component['test_path']
+    suite_timeout = component.get('suite_timeout', DEFAULT_SUITE_TIMEOUT)
+    test_timeout = component.get('test_timeout', DEFAULT_TEST_TIMEOUT)
+    outcome = {'name': component_name, 'returncode': None, 'duration': 0.0, 'timed_out': False}
 
     print(f"Running tests for {component_name}...")
 
@@ -101,42 +301,152 @@ def run_component_tests(component):
     if not full_test_path.exists():
         print(f"Test path {full_test_path} does not exist for {component_name}")
         create_minimal_result(results_dir, component_name, "Test directory not found")
-        return
+        return outcome
 
     # Run pytest with allure
-    test_command = [
-        "python", "-m", "pytest",
+    pytest_args = [
         str(full_test_path),
         f"--alluredir={results_dir}",
         "--tb=short",
         "-v",
         f"--junitxml={component['test_path']}/{component_name}-pytest-report.xml"
     ]
-
+    if test_timeout:
+        pytest_args.append(f"--timeout={test_timeout:g}")
+    durations_path = TEST_DURATIONS_FILE.format(name=component_name)
+    n_workers = xdist_workers(test_workers, threads)
+    if n_workers:
+        pytest_args += ["-n", str(n_workers), "--dist", "load"]
+    if n_workers or shard:
+        pytest_args += ["-p", "sharding", f"--test-durations={durations_path}"]
+    if shard:
+        pytest_args.append(f"--shard={shard}")
+    test_command = ["python", "-c", PYTEST_BOOTSTRAP] + pytest_args
+
+    env = os.environ.copy()
+    env["PYTHONUNBUFFERED"] = "1"   # so output arrives as it is written
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SCRIPTS_DIR, env.get("PYTHONPATH")]))
+    if threads:
+        for var in THREAD_ENV_VARS:
+            env.setdefault(var, str(max(1, threads // max(1, n_workers))))
+
+    start = time.monotonic()
     try:
-        # Add timeout to prevent hanging
-        print(f"Running command: {' '.join(test_command)}")
-        result = subprocess.run(test_command, capture_output=True, text=True)  
+        print(f"Running command: python -m pytest {' '.join(pytest_args)}")
+        logger = open_suite_log(component_name, log_dir)
+        try:
+            process = subprocess.Popen(test_command, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, text=True,
+                                       errors="replace", env=env,
+                                       start_new_session=os.name == "posix")
+            tail = stream_suite_output(process, component_name, logger, echo,
+                                       timeout=suite_timeout * 60 if suite_timeout else None)
+        finally:
+            close_suite_log(logger)
+        outcome['returncode'] = process.returncode
+        junit_path = f"{component['test_path']}/{component_name}-pytest-report.xml"
+        if os.path.isfile(junit_path):
+            record_junit_durations([junit_path], durations_path)
         print(f"Tests completed for {component_name}")
-        print(f"Exit code: {result.returncode}")
-        output_file = "subprocess_return_code.txt"
-        with open(output_file, "a") as f:
-            f.write(str(result.returncode)+"\n")
-        if result.stdout:
-            print("STDOUT (last 200 chars):", result.stdout[-200:])
-        if result.stderr and result.stderr.strip():
-            print("STDERR (last 200 chars):", result.stderr[-200:])
-    except subprocess.TimeoutExpired:
-        print(f"Tests for {component_name} timed out after # minutes")
-        create_minimal_result(results_dir, component_name, "Tests timed out")
+        print(f"Exit code: {process.returncode}")
+        if tail:
+            print(f"Last {len(tail)} lines of output (full log in {log_dir}/{component_name}-pytest.log):")
+            print("\n".join(f"  {line}" for line in tail))
+    except subprocess.TimeoutExpired as e:
+        outcome['returncode'] = process.returncode
+        outcome['timed_out'] = True
+        message = f"Tests timed out after {suite_timeout:g} minutes"
+        print(f"Tests for {component_name} timed out after {suite_timeout:g} minutes")
+        if e.output:
+            print(f"Stack dump (also in {log_dir}/{component_name}-pytest.log):")
+            print(e.output)
+        create_minimal_result(results_dir, component_name, message,
+                              trace=e.output or "No stack dump was produced")
     except Exception as e:
         print(f"Error running tests for {component_name}: {e}")
         create_minimal_result(results_dir, component_name, f"Failed to run tests: {e}")
     finally:
         if not os.path.isfile(f"{component['test_path']}/{component_name}-pytest-report.xml"):
-            fMessage=f"{component_name} Test execution failed, no report generated: Exit code: {result.returncode if 'result' in locals() else 'N/A'}"
+            fMessage=f"{component_name} Test execution failed, no report generated: Exit code: {outcome['returncode'] if outcome['returncode'] is not None else 'N/A'}"
+            if outcome['timed_out']:
+                fMessage = f"{component_name} Tests timed out after {suite_timeout:g} minutes"
             create_static_xml_report(component['test_path'], component_name, f"{component['test_path']}/{component_name}-pytest-report.xml", fMessage)
-        print(f"Finished test execution for {component_name}")
+        outcome['duration'] = time.monotonic() - start
+        print(f"Finished test execution for {component_name} in {outcome['duration']:.0f}s")
+    return outcome
+
+def load_suite_durations(path=DURATIONS_FILE):
+    """Read recorded suite durations (seconds by component name)"""
+    try:
+        with open(path) as f:
+            return {name: float(seconds) for name, seconds in json.load(f).items()}
+    except (OSError, ValueError, AttributeError, TypeError):
+        return {}
+
+def save_suite_durations(outcomes, path=DURATIONS_FILE):
+    """Merge the durations of the suites that ran into the recorded ones"""
+    record_suite_durations({o['name']: o['duration']
+                            for o in outcomes if o['returncode'] is not None}, path)
+
+def record_suite_durations(seconds, path=DURATIONS_FILE):
+    """Merge {component name: seconds} into the recorded suite durations"""
+    durations = load_suite_durations(path)
+    durations.update({name: round(duration, 1) for name, duration in seconds.items()})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+def order_longest_first(components, durations):
+    """Sort components by recorded duration, longest first
+
+    Components without a record go first, since they may be the longest.
+    """
+    return sorted(components, key=lambda c: -durations.get(c['name'], float('inf')))
+
+def plan_workers(n_suites, workers=None, cpu_budget=None):
+    """Return (suites run at once, threads per suite) within the CPU budget
+
+    Suites run one at a time unless *workers* asks for more: they share the
+    working directory, .pytest_cache and any data the components download.
+    """
+    budget = max(1, cpu_budget or os.cpu_count() or 1)
+    pool = max(1, min(workers or 1, budget, n_suites))
+    return pool, max(1, budget // pool)
+
+def run_component_suites(components, workers=1, threads=None, on_done=None, **run_options):
+    """Run the components' suites, up to *workers* at a time, in the given order
+
+    With more than one worker each suite runs in its own process.
+    *on_done(component, outcome)* is called in this process as each suite
+    finishes.  *run_options* are passed on to run_component_tests.  Returns
+    the outcomes in completion order.
+    """
+    outcomes = []
+
+    def finish(component, outcome):
+        outcomes.append(outcome)
+        if on_done:
+            on_done(component, outcome)
+
+    if workers <= 1:
+        for component in components:
+            finish(component, run_component_tests(component, threads, **run_options))
+        return outcomes
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_component_tests, component, threads, **run_options): component
+                   for component in components}
+        for future in as_completed(futures):
+            component = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                print(f"Error running tests for {component['name']}: {e}")
+                create_minimal_result(f"allure-results-{component['name']}", component['name'],
+                                      f"Failed to run tests: {e}")
+                outcome = {'name': component['name'], 'returncode': None, 'duration': 0.0}
+            finish(component, outcome)
+    return outcomes
 
 def create_static_xml_report(test_path, component_name, filename, fMessage="Test execution failed, no report generated"):
     """Create a static JUnit XML report if pytest did not generate one"""
@@ -165,8 +475,11 @@ def create_static_xml_report(test_path, component_name, filename, fMessage="Test
     with open(filename, "wb") as f:
         f.write(b_xml)
 
-def create_minimal_result(results_dir, component_name, error_message):
-    """Create a minimal test result for components with issues"""
+def create_minimal_result(results_dir, component_name, error_message, trace=None):
+    """Create a minimal test result for components with issues
+
+    *trace*, e.g. a stack dump, is shown with the message in the report.
+    """
     minimal_result = {
         "uuid": f"test-{component_name}",
         "historyId": f"test-{component_name}", 
@@ -178,6 +491,8 @@ def create_minimal_result(results_dir, component_name, error_message):
         "start": 0,
         "stop": 0
     }
+    if trace:
+        minimal_result["statusDetails"] = {"message": error_message, "trace": trace}
 
     with open(f"{results_dir}/minimal-test-result.json", "w") as f:
         json.dump(minimal_result, f, indent=2)
@@ -297,15 +612,177 @@ def generate_allure_report(component):
         with open(f"{report_dir}/index.html", "w") as f:
             f.write(error_html)
 
-def main():
+def merge_junit_reports(paths, output):
+    """Combine JUnit XML reports into one <testsuites> document"""
+    merged = ET.Element('testsuites')
+    totals = dict.fromkeys(("tests", "failures", "errors", "skipped"), 0)
+    seconds = 0.0
+    for path in paths:
+        try:
+            root = ET.parse(path).getroot()
+        except (OSError, ET.ParseError) as e:
+            print(f"Skipping unreadable JUnit report {path}: {e}")
+            continue
+        for suite in ([root] if root.tag == 'testsuite' else root.findall('testsuite')):
+            merged.append(suite)
+            for key in totals:
+                totals[key] += int(suite.get(key) or 0)
+            seconds += float(suite.get('time') or 0)
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    merged.set('time', f"{seconds:.3f}")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    ET.ElementTree(merged).write(output, encoding="utf-8", xml_declaration=True)
+
+def merge_shards(shard_dirs, shard_count=None):
+    """Combine the outputs of --shard runs, each downloaded into one of
+    *shard_dirs*, into the layout of a single run in this directory
+
+    Merges each component's allure-results-<name> directory and JUnit report
+    and the exit codes, and records the merged per-test durations and, as
+    the sum over the shards, each suite's duration.  With *shard_count*, raises
+    ValueError unless that many shards finished (a finished shard's directory
+    has its subprocess_return_code.txt), rather than merging part of a run.
+    """
+    finished = {os.path.normpath(d) for d in shard_dirs
+                if os.path.isfile(os.path.join(d, "subprocess_return_code.txt"))}
+    if shard_count is not None and len(finished) != shard_count:
+        missing = sorted(set(map(os.path.normpath, shard_dirs)) - finished)
+        raise ValueError(f"expected {shard_count} finished shards, got {len(finished)}"
+                         + (f" (incomplete: {', '.join(missing)})" if missing else ""))
+    for component in COMPONENTS:
+        component_name = component['name']
+        results_dir = f"allure-results-{component_name}"
+        junit_path = f"{component['test_path']}/{component_name}-pytest-report.xml"
+        os.makedirs(results_dir, exist_ok=True)
+        junit_parts = []
+        for shard_dir in shard_dirs:
+            shard_results = os.path.join(shard_dir, results_dir)
+            if os.path.isdir(shard_results):
+                shutil.copytree(shard_results, results_dir, dirs_exist_ok=True)
+            if os.path.isfile(os.path.join(shard_dir, junit_path)):
+                junit_parts.append(os.path.join(shard_dir, junit_path))
+        if junit_parts:
+            merge_junit_reports(junit_parts, junit_path)
+            record_junit_durations([junit_path], TEST_DURATIONS_FILE.format(name=component_name))
+        print(f"Merged {component_name} from {len(junit_parts)} of {len(shard_dirs)} shards")
+
+    suite_seconds = {}
+    for shard_dir in shard_dirs:
+        shard_durations = load_suite_durations(os.path.join(shard_dir, SHARD_DURATIONS_FILE))
+        for name, seconds in shard_durations.items():
+            suite_seconds[name] = suite_seconds.get(name, 0.0) + seconds
+    if suite_seconds:
+        record_suite_durations(suite_seconds)
+
+    with open("subprocess_return_code.txt", "a") as f:
+        for shard_dir in shard_dirs:
+            codes = os.path.join(shard_dir, "subprocess_return_code.txt")
+            if os.path.isfile(codes):
+                with open(codes) as shard_codes:
+                    f.write(shard_codes.read())
+
+def timeout_arg(value):
+    """argparse type for [NAME=]NUMBER timeout settings"""
+    name, _, number = value.rpartition("=")
+    try:
+        return name or None, float(number)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected [NAME=]NUMBER, got {value!r}")
+
+def apply_timeouts(components, key, settings):
+    """Set component[key] from (name, value) settings
+
+    A setting without a name applies to every component; named ones win.
+    """
+    for name, value in sorted(settings or [], key=lambda setting: setting[0] is not None):
+        for component in components:
+            if name is None or name == component['name']:
+                component[key] = value
+
+def shard_arg(value):
+    """argparse type for i/N shard settings"""
+    try:
+        parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--shard", type=shard_arg, default=None, metavar="i/N",
+                      help="run only the i-th of N duration-balanced shards of every suite's "
+                           "tests and skip the HTML reports (one CI job per shard)")
+    mode.add_argument("--merge-shards", nargs="+", default=None, metavar="DIR",
+                      help="merge the outputs of --shard runs, each in one DIR, then generate "
+                           "the reports instead of running tests")
+    parser.add_argument("--shard-count", type=int, default=None, metavar="N",
+                        help="with --merge-shards: fail unless all N shards finished")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="component suites to run at once, at most the CPU budget "
+                             "(default: 1); only for suites known to run side by side safely")
+    parser.add_argument("--cpu-budget", type=int, default=None,
+                        help="cores to use in total (default: all); split between "
+                             "the suites running at once")
+    parser.add_argument("--log-dir", default=LOG_DIR,
+                        help=f"directory for the suites' output logs (default: {LOG_DIR})")
+    parser.add_argument("--stream-output", action="store_true",
+                        help="also echo each suite's output to the console, prefixed "
+                             "with the component name")
+    parser.add_argument("--test-workers", default=None, metavar="N|auto",
+                        help="spread each suite's tests over N pytest-xdist workers, longest "
+                             "recorded tests first; auto: the suite's share of the CPU budget")
+    parser.add_argument("--suite-timeout", type=timeout_arg, action="append", metavar="[NAME=]MINUTES",
+                        help="stop a component suite after this long, recording a stack dump "
+                             f"(default: ${SUITE_TIMEOUT_ENV}, else no limit); repeatable")
+    parser.add_argument("--test-timeout", type=timeout_arg, action="append", metavar="[NAME=]SECONDS",
+                        help="fail a single test after this long, via pytest-timeout "
+                             f"(default: ${TEST_TIMEOUT_ENV}, else no limit); repeatable")
+    args = parser.parse_args(argv)
+    if args.shard_count is not None and not args.merge_shards:
+        parser.error("--shard-count requires --merge-shards")
+    if args.test_workers not in (None, "auto") and not args.test_workers.isdigit():
+        parser.error(f"--test-workers expects a number or 'auto', got {args.test_workers!r}")
+    for key, env_var in (('suite_timeout', SUITE_TIMEOUT_ENV), ('test_timeout', TEST_TIMEOUT_ENV)):
+        if getattr(args, key) is None and os.environ.get(env_var):
+            try:
+                setattr(args, key, [timeout_arg(os.environ[env_var])])
+            except argparse.ArgumentTypeError as e:
+                parser.error(f"{env_var}: {e}")
+    names = {component['name'] for component in COMPONENTS}
+    for name, _ in (args.suite_timeout or []) + (args.test_timeout or []):
+        if name is not None and name not in names:
+            parser.error(f"unknown component {name!r} in a timeout setting")
+    return args
+
+def main(argv=None):
     """Main function to orchestrate the report generation"""
+    args = parse_args(argv)
     print("Starting enhanced Allure report generation...")
 
     # Create main report directory
     os.makedirs("allure-report", exist_ok=True)
 
+    if args.merge_shards:
+        try:
+            merge_shards(args.merge_shards, args.shard_count)
+        except ValueError as e:
+            sys.exit(f"Cannot merge shards: {e}")
+        for component in COMPONENTS:
+            component['display_name'] = "{} {}".format(component['display_name'], read_version(component['path']))
+            generate_allure_report(component)
+        print("\nEnhanced Allure report generation completed!")
+        print(f"Merged {len(args.merge_shards)} shards.")
+        return
+
+    # Shard runs only produce results; the merge run generates the reports
+    report = (lambda component: None) if args.shard else generate_allure_report
+
     # Process each component
     processed_count = 0
+    runnable = []
     for component in COMPONENTS:
         print(f"\n{'='*50}")
         component['display_name'] = "{} {}".format(component['display_name'], read_version(component['path']))
@@ -315,13 +792,7 @@ def main():
 
         if os.path.exists(component['path']):
             print(f"✓ Component path exists: {component['path']}")
-
-            # Run tests and generate results
-            run_component_tests(component)
-
-            # Generate HTML report
-            generate_allure_report(component)
-            processed_count += 1
+            runnable.append(component)
         else:
             print(f"⚠️  Skipping {component['name']} - path not found: {component['path']}")
             # Still create a minimal report for missing components
@@ -329,7 +800,31 @@ def main():
             os.makedirs(results_dir, exist_ok=True)
             create_allure_environment(component['name'], component['path'])
             create_minimal_result(results_dir, component['name'], "Component directory not found")
-            generate_allure_report(component)
+            report(component)
+
+    apply_timeouts(runnable, 'suite_timeout', args.suite_timeout)
+    apply_timeouts(runnable, 'test_timeout', args.test_timeout)
+
+    # Run the suites, longest first, and generate each HTML report as its suite finishes
+    runnable = order_longest_first(runnable, load_suite_durations())
+    workers, threads = plan_workers(len(runnable), args.workers, args.cpu_budget)
+    print(f"\nRunning {len(runnable)} component suites, {workers} at a time "
+          f"({threads} threads each){f', shard {args.shard}' if args.shard else ''}: "
+          f"{', '.join(c['name'] for c in runnable)}")
+    outcomes = run_component_suites(runnable, workers, threads,
+                                    on_done=lambda component, _: report(component),
+                                    log_dir=args.log_dir, echo=args.stream_output,
+                                    test_workers=args.test_workers, shard=args.shard)
+    processed_count = len(outcomes)
+
+    # Exit codes in component order, checked by the workflow
+    codes = {o['name']: o['returncode'] for o in outcomes}
+    with open("subprocess_return_code.txt", "a") as f:
+        for component in runnable:
+            if codes.get(component['name']) is not None:
+                f.write(f"{codes[component['name']]}\n")
+    # A shard's suite durations are only part of each suite's; the merge adds them up
+    save_suite_durations(outcomes, SHARD_DURATIONS_FILE if args.shard else DURATIONS_FILE)
 
     print("\nEnhanced Allure report generation completed!")
     print(f"Processed {processed_count} components successfully.")
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+mock_api_server.py — Local stand-in for the GitHub and Codecov APIs.
+
+Replays recorded responses for the paths the Cloudflare Worker proxy
+(ci/cloudflare/worker.js) whitelists, so the bake in build_dashboard.py and
+the dashboard's live mode can be benchmarked and regression-tested without
+network access.  Behaves like the real services where the dashboard cares:
+
+  * run lists are paginated (``per_page`` / ``page``, ``Link`` header; a
+    non-numeric value gets a 422) and filtered by ``branch``; per-workflow
+    run lists are derived from the recorded repository runs unless
+    recorded explicitly
+  * every response carries an ``ETag``; a matching ``If-None-Match`` gets a
+    304 that, as on GitHub, is not charged against the rate limit
+  * ``X-RateLimit-*`` headers count down from ``--rate-limit``; once spent,
+    requests get GitHub's primary rate-limit 403
+  * ``--fail-rate`` injects secondary rate-limit 403s (with ``Retry-After``)
+  * ``--latency`` / ``--jitter`` delay every response (seeded, reproducible)
+  * paths outside the Worker whitelist get the Worker's 403
+
+Both URL layouts are served: the API's own (``/repos/...``, ``/api/v2/...``)
+for the bake, and the Worker's (``/github/...``, ``/codecov/...``) for the
+dashboard.  ``GET /__stats`` returns request counters as JSON.
+
+Usage:
+    python scripts/mock_api_server.py [--port 8787] [--latency 80 --jitter 40]
+
+    # bake against it
+    GITHUB_API_URL=http://127.0.0.1:8787 GITHUB_TOKEN=dummy \\
+        python scripts/build_dashboard.py
+
+    # dashboard against it: set dashboard.worker_url to http://127.0.0.1:8787
+
+Recordings (--recordings, JSON):
+    {"github":  {"/repos/casangi/xradio/actions/runs": {"workflow_runs": [...]}, ...},
+     "codecov": {"/api/v2/github/casangi/repos/xradio/": {...}, ...}}
+"""
+
+import argparse
+import hashlib
+import http.server
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT  = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
+
+WORKER_JS          = os.path.join(REPO_ROOT, "ci", "cloudflare", "worker.js")
+DEFAULT_RECORDINGS = os.path.join(SCRIPT_DIR, "tests", "fixtures", "api_recordings.json")
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE     = 100
+
+_WORKFLOW_RUNS = re.compile(r"^/repos/([^/]+)/([^/]+)/actions/workflows/([^/]+)/runs/?$")
+
+
+class InvalidQuery(ValueError):
+    """A query parameter GitHub would reject with 422 Unprocessable Entity."""
+
+
+def _int_param(query: dict, name: str, default: int) -> int:
+    raw = query.get(name, default)
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise InvalidQuery(f"Invalid value for parameter '{name}': {raw!r}") from None
+
+
+def load_worker_whitelist(path: str = WORKER_JS) -> dict[str, list[re.Pattern]]:
+    """Read GITHUB_/CODECOV_PATH_PATTERNS from worker.js as Python regexes.
+
+    The Worker's patterns only use syntax shared by JS and Python regexes,
+    so the mock cannot drift from what the deployed proxy forwards.
+    """
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read()
+    whitelist = {}
+    for service in ("github", "codecov"):
+        block = re.search(rf"const {service.upper()}_PATH_PATTERNS = \[(.*?)\];", text, re.S)
+        if not block:
+            raise ValueError(f"{path}: no {service.upper()}_PATH_PATTERNS")
+        whitelist[service] = [
+            re.compile(m.group(1))
+            for m in re.finditer(r"^\s*/(?!/)(.+)/[a-z]*,?\s*$", block.group(1), re.M)
+        ]
+    return whitelist
+
+
+class MockApi:
+    """Request handling and counters shared by all server threads."""
+
+    def __init__(self, recordings: dict, whitelist: dict | None = None,
+                 latency_ms: float = 0, jitter_ms: float = 0, rate_limit: int = 5000,
+                 fail_rate: float = 0.0, seed: int = 0):
+        self.recordings = recordings
+        self.whitelist  = whitelist or load_worker_whitelist()
+        self.latency_ms = latency_ms
+        self.jitter_ms  = jitter_ms
+        self.fail_rate  = fail_rate
+        self.limit      = rate_limit
+        self.remaining  = rate_limit
+        self.reset_at   = int(time.time()) + 3600
+        self.stats: Counter = Counter()
+        self._rng  = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # ── Bodies ──────────────────────────────────────────────────────────
+    def _github_body(self, path: str, query: dict) -> tuple[dict, dict] | None:
+        """Return (body, pagination) for a GitHub path, or None if not recorded.
+
+        Raises InvalidQuery when ``per_page`` or ``page`` is not an integer.
+        """
+        recorded = self.recordings.get("github", {})
+        runs = None
+        if path in recorded:
+            body = recorded[path]
+            if "workflow_runs" not in body:
+                return body, {}
+            runs = body["workflow_runs"]
+        elif (m := _WORKFLOW_RUNS.match(path)):
+            owner, repo, wf_file = m.groups()
+            repo_runs = recorded.get(f"/repos/{owner}/{repo}/actions/runs")
+            if repo_runs is None:
+                return None
+            runs = [r for r in repo_runs["workflow_runs"]
+                    if os.path.basename(r.get("path", "").split("@")[0]) == wf_file]
+        else:
+            return None
+
+        if "branch" in query:
+            runs = [r for r in runs if r.get("head_branch") == query["branch"]]
+        per_page = min(max(1, _int_param(query, "per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        page = max(1, _int_param(query, "page", 1))
+        last = max(1, -(-len(runs) // per_page))
+        body = {"total_count": len(runs),
+                "workflow_runs": runs[(page - 1) * per_page: page * per_page]}
+        return body, {"page": page, "last": last}
+
+    def _codecov_body(self, path: str) -> dict | None:
+        recorded = self.recordings.get("codecov", {})
+        for candidate in (path, path.rstrip("/") + "/", path.rstrip("/")):
+            if candidate in recorded:
+                return recorded[candidate]
+        return None
+
+    # ── Responses ───────────────────────────────────────────────────────
+    def _delay(self) -> None:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0
+        delay = max(0.0, self.latency_ms + jitter) / 1000
+        if delay:
+            time.sleep(delay)
+
+    def _rate_headers(self) -> dict:
+        return {
+            "X-RateLimit-Limit":     str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+            "X-RateLimit-Reset":     str(self.reset_at),
+            "X-RateLimit-Used":      str(self.limit - max(self.remaining, 0)),
+            "X-RateLimit-Resource":  "core",
+        }
+
+    def handle(self, service: str, path: str, query: dict, if_none_match: str,
+               link_base: str) -> tuple[int, dict, bytes]:
+        """Answer one GET; returns (status, headers, body)."""
+        self._delay()
+        with self._lock:
+            self.stats["requests"] += 1
+        if not any(p.search(path) for p in self.whitelist[service]):
+            return self._finish(403, {}, {"error": "Path not allowed"})
+
+        if service == "github":
+            try:
+                found = self._github_body(path, query)
+            except InvalidQuery as exc:
+                return self._finish(422, {}, {"message": str(exc)}, service)
+            body, paging = found if found else (None, {})
+        else:
+            body, paging = self._codecov_body(path), {}
+        if body is None:
+            return self._finish(404, {}, {"message": "Not Found"}, service)
+
+        payload = json.dumps(body, separators=(",", ":")).encode()
+        etag = f'W/"{hashlib.sha256(payload).hexdigest()[:20]}"'
+        headers = {"ETag": etag}
+        if paging:
+            headers["Link"] = self._link_header(link_base, path, query, **paging)
+
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return self._finish(304, headers, None, service)
+
+        if service == "github":
+            with self._lock:
+                if self.remaining <= 0:
+                    limited = "primary"
+                elif self.fail_rate and self._rng.random() < self.fail_rate:
+                    limited = "secondary"
+                else:
+                    self.remaining -= 1
+                    limited = ""
+            if limited == "primary":
+                return self._finish(403, {}, {
+                    "message": "API rate limit exceeded for installation.",
+                    "documentation_url": "https://docs.github.com/rest/rate-limit",
+                }, service)
+            if limited == "secondary":
+                return self._finish(403, {"Retry-After": "1"}, {
+                    "message": "You have exceeded a secondary rate limit. "
+                               "Please wait a few minutes before you try again.",
+                }, service)
+        return self._finish(200, headers, payload, service)
+
+    def _finish(self, status: int, headers: dict, body, service: str = "") -> tuple:
+        if service == "github":
+            headers = dict(self._rate_headers(), **headers)
+        if isinstance(body, dict):
+            body = json.dumps(body).encode()
+        with self._lock:
+            self.stats[str(status)] += 1
+        return status, headers, body or b""
+
+    @staticmethod
+    def _link_header(base: str, path: str, query: dict, page: int, last: int) -> str:
+        def url(p: int) -> str:
+            return f"{base}{path}?{urllib.parse.urlencode(dict(query, page=p))}"
+        rels = []
+        if page > 1:
+            rels += [f'<{url(page - 1)}>; rel="prev"', f'<{url(1)}>; rel="first"']
+        if page < last:
+            rels += [f'<{url(page + 1)}>; rel="next"', f'<{url(last)}>; rel="last"']
+        return ", ".join(rels)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"stats": dict(self.stats), "rate_limit": {
+                "limit": self.limit, "remaining": max(self.remaining, 0)}}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive, like the real APIs
+    server_version   = "MockApi/1.0"
+
+    CORS = {
+        "Access-Control-Allow-Origin":   "*",
+        "Access-Control-Allow-Methods":  "GET, OPTIONS",
+        "Access-Control-Allow-Headers":  "Content-Type, If-None-Match",
+        "Access-Control-Expose-Headers": "ETag, Link, X-RateLimit-Remaining, "
+                                         "X-RateLimit-Limit, X-RateLimit-Reset",
+    }
+
+    def do_OPTIONS(self):
+        self._send(204, {}, b"")
+
+    def do_GET(self):
+        api: MockApi = self.server.api
+        url = urllib.parse.urlsplit(self.path)
+        path, prefix = url.path, ""
+        if path == "/__stats":
+            self._send(200, {}, json.dumps(api.snapshot()).encode())
+            return
+        for service_prefix in ("/github", "/codecov"):
+            if path.startswith(service_prefix + "/"):
+                prefix, path = service_prefix, path[len(service_prefix):]
+        service = "codecov" if prefix == "/codecov" or path.startswith("/api/v2/") else "github"
+        query = dict(urllib.parse.parse_qsl(url.query))
+        base = f"http://{self.headers.get('Host', '127.0.0.1')}{prefix}"
+        status, headers, body = api.handle(service, path, query,
+                                           self.headers.get("If-None-Match", ""), base)
+        self._send(status, headers, body)
+
+    def _send(self, status: int, headers: dict, body: bytes) -> None:
+        self.send_response(status)
+        for name, value in {**self.CORS, **headers}.items():
+            self.send_header(name, value)
+        if status != 304 and status != 204:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(api: MockApi, host: str = "127.0.0.1", port: int = 8787,
+                quiet: bool = True) -> http.server.ThreadingHTTPServer:
+    server = http.server.ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.api = api
+    server.quiet = quiet
+    return server
+
+
+def load_recordings(path: str) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS,
+                        help="recorded responses (default: tests/fixtures/api_recordings.json)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0, help="added latency per request, ms")
+    parser.add_argument("--jitter", type=float, default=0, help="± random latency, ms")
+    parser.add_argument("--rate-limit", type=int, default=5000,
+                        help="core requests before the primary rate limit trips")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="fraction of GitHub requests answered with a secondary rate-limit 403")
+    parser.add_argument("--seed", type=int, default=0, help="seed for jitter and failures")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    api = MockApi(load_recordings(args.recordings), latency_ms=args.latency,
+                  jitter_ms=args.jitter, rate_limit=args.rate_limit,
+                  fail_rate=args.fail_rate, seed=args.seed)
+    server = make_server(api, args.host, args.port, quiet=not args.verbose)
+    print(f"Mock GitHub/Codecov API on http://{args.host}:{server.server_address[1]} "
+          f"({args.recordings})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n" + json.dumps(api.snapshot()))
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
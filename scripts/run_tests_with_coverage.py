@@ -2,11 +2,19 @@
 """
 Test runner with coverage collection for all components
 """
+import argparse
 import subprocess
 import sys
 import os
 from pathlib import Path
 
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Per-test durations recorded by enhanced_report_generator.py (see sharding.py)
+TEST_DURATIONS_FILE = "gh-pages/main/test-durations/{name}-tests.json"
+
+# Set from --workers in main(); empty runs each suite in one process
+XDIST_WORKERS = None
+
 def run_command(cmd, cwd=None):
     """Run a command and handle errors"""
     print(f"Running: {cmd}")
@@ -25,8 +33,27 @@ def ensure_dir(path):
     """Ensure directory exists"""
     Path(path).mkdir(parents=True, exist_ok=True)
 
+def xdist_args(name):
+    """pytest-xdist options for a component's suite, longest recorded tests first
+
+    pytest-cov gives each xdist worker its own data file and combines them
+    before writing the reports, so the coverage options need no change.
+    """
+    if not XDIST_WORKERS:
+        return ""
+    return (f"-n {XDIST_WORKERS} --dist load -p sharding "
+            f"--test-durations={TEST_DURATIONS_FILE.format(name=name)}")
+
 def main():
     """Run all tests with coverage collection"""
+    global XDIST_WORKERS
+    parser = argparse.ArgumentParser(description="Run all component tests with coverage")
+    parser.add_argument("-n", "--workers", default=None, metavar="N|auto",
+                        help="spread each suite's tests over N pytest-xdist workers")
+    XDIST_WORKERS = parser.parse_args().workers
+    if XDIST_WORKERS:
+        os.environ["PYTHONPATH"] = os.pathsep.join(
+            filter(None, [SCRIPTS_DIR, os.environ.get("PYTHONPATH")]))
     
     # Ensure directories exist
     ensure_dir("allure-results/integration")
@@ -42,13 +69,14 @@ def main():
     print("*" * 50)
     print("Running TestVIPER Integration Tests")
     print("*" * 50)
-    cmd = """
+    cmd = f"""
     pytest -v tests/integration \
         --alluredir=allure-results/integration \
         --cov=testviper \
         --cov-report=xml:coverage/coverage-integration.xml \
         --cov-report=html:coverage/htmlcov-integration \
-        --cov-report=json:coverage/coverage-integration.json
+        --cov-report=json:coverage/coverage-integration.json \
+        {xdist_args("testviper")}
     """
     if not run_command(cmd):
         success = False
@@ -57,13 +85,14 @@ def main():
     print("*" * 50)
     print("Running ToolVIPER Tests")
     print("*" * 50)
-    cmd = """
+    cmd = f"""
     pytest -v toolviper/tests/ \
         --alluredir=allure-results/toolviper \
         --cov=toolviper \
         --cov-report=xml:coverage/coverage-toolviper.xml \
         --cov-report=html:coverage/htmlcov-toolviper \
-        --cov-report=json:coverage/coverage-toolviper.json
+        --cov-report=json:coverage/coverage-toolviper.json \
+        {xdist_args("toolviper")}
     """
     if not run_command(cmd):
         success = False
@@ -72,13 +101,14 @@ def main():
     print("*" * 50)
     print("Running XRADIO Component Tests")
     print("*" * 50)
-    cmd = """
+    cmd = f"""
     pytest -v xradio/tests \
         --alluredir=allure-results/xradio \
         --cov=xradio \
         --cov-report=xml:coverage/coverage-xradio.xml \
         --cov-report=html:coverage/htmlcov-xradio \
-        --cov-report=json:coverage/coverage-xradio.json
+        --cov-report=json:coverage/coverage-xradio.json \
+        {xdist_args("xradio")}
     """
     if not run_command(cmd):
         success = False
@@ -91,13 +121,14 @@ def main():
     print("=" * 50)
     print("Running GraphVIPER Tests")
     print("=" * 50)
-    cmd = """
+    cmd = f"""
     pytest -v graphviper/tests \
         --alluredir=allure-results/graphviper \
         --cov=graphviper \
         --cov-report=xml:coverage/coverage-graphviper.xml \
         --cov-report=html:coverage/htmlcov-graphviper \
-        --cov-report=json:coverage/coverage-graphviper.json
+        --cov-report=json:coverage/coverage-graphviper.json \
+        {xdist_args("graphviper")}
     """
     if not run_command(cmd):
         success = False
@@ -110,13 +141,14 @@ def main():
     print("*" * 50)
     print("Running AstroVIPER Tests")
     print("*" * 50)
-    cmd = """
+    cmd = f"""
     pytest -v astroviper/tests \
         --alluredir=allure-results/astroviper \
         --cov=astroviper \
         --cov-report=xml:coverage/coverage-astroviper.xml \
         --cov-report=html:coverage/htmlcov-astroviper \
-        --cov-report=json:coverage/coverage-astroviper.json
+        --cov-report=json:coverage/coverage-astroviper.json \
+        {xdist_args("astroviper")}
     """
     if not run_command(cmd):
         success = False
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Duration-balanced test distribution
+
+Per-test durations are recorded from JUnit XML reports into a JSON file
+(test id -> seconds).  Loaded as a pytest plugin (``-p sharding``, with this
+directory on PYTHONPATH), ``--test-durations=FILE`` orders the collected tests
+longest first.  pytest-xdist's ``--dist load`` scheduler hands tests out in
+collection order to whichever worker is free, so its workers then finish
+close together (longest-processing-time-first scheduling).  Tests without a
+record count as the median recorded duration.
+
+``--shard=i/N`` keeps only the i-th of N shards of the collected tests, for
+splitting a suite across CI jobs.  The tests are bin-packed on the same
+durations (each test, longest first, goes to the least loaded shard), so
+every job collecting the same tests from the same durations file computes
+the same partition and the shards take about equally long.
+
+Under pytest-xdist the plugin also lets each worker dump all its threads'
+stacks on SIGUSR1, as the report generator's pytest bootstrap does for the
+main process.
+"""
+
+import faulthandler
+import json
+import os
+import re
+import signal
+import xml.etree.ElementTree as ET
+
+import pytest
+
+
+def junit_test_id(classname, name):
+    """Key of a test in the durations file, from its JUnit classname and name"""
+    return f"{classname}::{name}" if classname else name
+
+
+def item_test_id(nodeid):
+    """Key of a pytest node id: the classname and name JUnit XML gives it
+
+    Mirrors _pytest.junitxml.mangle_test_address.
+    """
+    path, bracket, params = nodeid.partition("[")
+    names = path.split("::")
+    names[0] = re.sub(r"\.py$", "", names[0].replace("/", "."))
+    names[-1] += bracket + params
+    return junit_test_id(".".join(names[:-1]), names[-1])
+
+
+def read_junit_durations(path):
+    """Return {test id: seconds} for the test cases of a JUnit XML report"""
+    durations = {}
+    for case in ET.parse(path).iter("testcase"):
+        try:
+            seconds = float(case.get("time", 0))
+        except ValueError:
+            continue
+        key = junit_test_id(case.get("classname", ""), case.get("name", ""))
+        durations[key] = durations.get(key, 0.0) + seconds
+    return durations
+
+
+def load_durations(path):
+    """Read a durations file; missing or unreadable files give {}"""
+    try:
+        with open(path) as f:
+            return {key: float(seconds) for key, seconds in json.load(f).items()}
+    except (OSError, ValueError, AttributeError, TypeError):
+        return {}
+
+
+def record_junit_durations(junit_paths, durations_path):
+    """Merge the durations in JUnit reports into a durations file
+
+    Returns the number of tests recorded.
+    """
+    recorded = {}
+    for junit_path in junit_paths:
+        try:
+            recorded.update(read_junit_durations(junit_path))
+        except (OSError, ET.ParseError) as e:
+            print(f"Could not read test durations from {junit_path}: {e}")
+    if not recorded:
+        return 0
+    durations = load_durations(durations_path)
+    durations.update({key: round(seconds, 3) for key, seconds in recorded.items()})
+    os.makedirs(os.path.dirname(durations_path) or ".", exist_ok=True)
+    with open(durations_path, "w") as f:
+        json.dump(durations, f, indent=1, sort_keys=True)
+    return len(recorded)
+
+
+def item_durations(items, durations):
+    """Recorded duration of each item; the median for items without a record"""
+    keys = [item_test_id(item.nodeid) for item in items]
+    known = sorted(durations[key] for key in keys if key in durations)
+    default = known[len(known) // 2] if known else 1.0
+    return [durations.get(key, default) for key in keys]
+
+
+def order_longest_first(items, durations):
+    """Sort pytest items in place by recorded duration, longest first"""
+    if not any(item_test_id(item.nodeid) in durations for item in items):
+        return
+    seconds = dict(zip(map(id, items), item_durations(items, durations)))
+    items.sort(key=lambda item: -seconds[id(item)])
+
+
+def partition(items, durations, shards):
+    """Bin-pack items into *shards* lists of about equal recorded duration
+
+    Longest first, each item goes to the least loaded shard (the lowest
+    numbered on ties); the result depends only on the items' node ids and
+    the durations.
+    """
+    seconds = item_durations(items, durations)
+    order = sorted(range(len(items)), key=lambda i: (-seconds[i], items[i].nodeid))
+    bins = [[] for _ in range(shards)]
+    loads = [0.0] * shards
+    for i in order:
+        target = loads.index(min(loads))
+        bins[target].append(items[i])
+        loads[target] += seconds[i]
+    return bins
+
+
+def parse_shard(value):
+    """Parse "i/N" (1 <= i <= N) into (i, N)"""
+    index, _, count = value.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"expected i/N, got {value!r}")
+    if not 1 <= index <= count:
+        raise ValueError(f"shard {index} is not between 1 and {count}")
+    return index, count
+
+
+# ── pytest plugin hooks ─────────────────────────────────────────────────────
+
+_dump_file = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("sharding", "duration-balanced test distribution")
+    group.addoption("--test-durations", metavar="FILE", default=None,
+                    help="JSON file of recorded test durations; run the longest tests first")
+    group.addoption("--shard", metavar="i/N", default=None,
+                    help="run only the i-th of N duration-balanced shards of the tests")
+
+
+def pytest_configure(config):
+    global _dump_file
+    if hasattr(config, "workerinput") and hasattr(signal, "SIGUSR1") and _dump_file is None:
+        # a copy of stderr taken before pytest captures it
+        _dump_file = os.fdopen(os.dup(2), "w")
+        faulthandler.register(signal.SIGUSR1, file=_dump_file, all_threads=True)
+
+
+def pytest_collection_modifyitems(config, items):
+    path = config.getoption("test_durations")
+    durations = load_durations(path) if path else {}
+    shard = config.getoption("shard")
+    if shard:
+        try:
+            index, count = parse_shard(shard)
+        except ValueError as e:
+            raise pytest.UsageError(f"--shard: {e}")
+        bins = partition(items, durations, count)
+        keep = {id(item) for item in bins[index - 1]}
+        deselected = [item for item in items if id(item) not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if id(item) in keep]
+    if durations:
+        order_longest_first(items, durations)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    # a shard can be left without tests; that is not a failure
+    if session.config.getoption("shard") and exitstatus == 5:
+        session.exitstatus = 0
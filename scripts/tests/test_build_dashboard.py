@@ -13,11 +13,20 @@ These tests validate:
   6. Config-to-output consistency (every project in YAML appears in output)
 """
 
+import gzip
 import json
 import os
 import re
+import shutil
+import subprocess
 import sys
 import tempfile
+import textwrap
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
 from unittest import mock
 
 import pytest
@@ -40,9 +49,10 @@ def config():
 
 
 @pytest.fixture(scope="session")
-def built_html():
+def built_html(tmp_path_factory):
     """Run a full build (no baking) and return the output HTML."""
-    with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as tmp:
+    with tempfile.NamedTemporaryFile(suffix=".html", delete=False,
+                                     dir=tmp_path_factory.mktemp("build")) as tmp:
         tmp_path = tmp.name
     try:
         with mock.patch.dict(os.environ, {"DASHBOARD_OUT": tmp_path}, clear=False):
@@ -180,6 +190,7 @@ class TestJsConfigGeneration:
         assert "const WORKER_URL =" in js
         assert "const MAX_RECENT_BRANCHES =" in js
         assert "const PREFETCHED_CI_DATA = null;" in js
+        assert 'const CI_DATA_URL = "";' in js
         assert "const CI_OVERVIEW_PROJECTS =" in js
 
     def test_generate_js_config_with_bake(self, config):
@@ -192,6 +203,13 @@ class TestJsConfigGeneration:
         assert "PREFETCHED_CI_DATA = null" not in js
         assert "2025-01-01T00:00:00Z" in js
 
+    def test_generate_js_config_with_data_url(self, config):
+        fake_bake = {"baked_at": "2025-01-01T00:00:00Z", "projects": {}}
+        js = build_dashboard.generate_js_config(config, fake_bake, "ci-data.json")
+        assert "const PREFETCHED_CI_DATA = null;" in js
+        assert 'const CI_DATA_URL = "ci-data.json";' in js
+        assert "2025-01-01T00:00:00Z" not in js
+
     def test_projects_array_matches_config(self, config):
         js = build_dashboard.generate_js_config(config, None)
         match = re.search(r"const PROJECTS = (.+?);$", js, re.MULTILINE)
@@ -323,6 +341,661 @@ class TestBuildOutput:
         assert size_kb < 5000, f"Output too large ({size_kb:.0f} KB) — likely bloated"
 
 
+class TestDataFileBuild:
+
+    @staticmethod
+    def _build(tmp_path, snapshot, *argv):
+        out = tmp_path / "index.html"
+        env = {"DASHBOARD_OUT": str(out), "GITHUB_TOKEN": "fake-token",
+               "DASHBOARD_PREVIOUS": ""}
+        with mock.patch.dict(os.environ, env), \
+             mock.patch.object(build_dashboard, "bake_ci_data", return_value=snapshot), \
+             mock.patch.object(build_dashboard, "configure_http_cache"), \
+             mock.patch.object(build_dashboard, "configure_http_pool"):
+            assert build_dashboard.main(list(argv)) == 0
+        return out.read_text(encoding="utf-8")
+
+    def test_data_file_written_and_not_inlined(self, tmp_path):
+        snap = {"baked_at": "2025-01-01T00:00:00Z", "projects": {"a": {"workflows": {}}}}
+        html = self._build(tmp_path, snap, "--data-file")
+        data = json.loads((tmp_path / "ci-data.json").read_text())
+        assert data["projects"] == snap["projects"]
+        assert re.fullmatch(r"[0-9a-f]{16}", data["content_hash"])
+        assert "const PREFETCHED_CI_DATA = null;" in html
+        assert f'const CI_DATA_URL = "ci-data.json?v={data["content_hash"]}";' in html
+
+    def test_suffix_comes_from_the_manifest(self, tmp_path):
+        snap = {"baked_at": "2025-01-01T00:00:00Z", "projects": {}}
+        real = build_dashboard.build_manifest
+
+        def pinned(*args):
+            return dict(real(*args), assets={"ci-data.json": "pinned"})
+
+        with mock.patch.object(build_dashboard, "build_manifest", side_effect=pinned):
+            html = self._build(tmp_path, snap, "--data-file")
+        assert 'const CI_DATA_URL = "ci-data.json?v=pinned";' in html
+        assert json.loads((tmp_path / "ci-data.json").read_text())["content_hash"] == "pinned"
+        manifest = json.loads((tmp_path / "build-manifest.json").read_text())
+        assert manifest["assets"] == {"ci-data.json": "pinned"}
+
+    def test_missing_data_artifact_is_rebuilt(self, tmp_path):
+        snap = {"baked_at": datetime.now(timezone.utc).strftime(build_dashboard.TIMESTAMP_FORMAT),
+                "projects": {}}
+        gh_output = tmp_path / "gh-output"
+        self._build(tmp_path, snap, "--data-file", "--minify")
+        manifest = json.loads((tmp_path / "build-manifest.json").read_text())
+        assert {"ci-data.json", "ci-data.json.gz", "index.html.gz"} <= set(manifest["outputs"])
+        with mock.patch.dict(os.environ, {"GITHUB_OUTPUT": str(gh_output)}):
+            self._build(tmp_path, snap, "--data-file", "--minify")
+        assert gh_output.read_text() == "changed=false\n"
+        for name in ("ci-data.json", "ci-data.json.gz"):
+            (tmp_path / name).unlink()
+            with mock.patch.dict(os.environ, {"GITHUB_OUTPUT": str(gh_output)}):
+                self._build(tmp_path, snap, "--data-file", "--minify")
+            assert gh_output.read_text().endswith("changed=true\n")
+            assert (tmp_path / name).exists()
+
+    def test_shell_changes_only_with_the_data(self, tmp_path):
+        first = self._build(tmp_path, {"baked_at": "2025-01-01T00:00:00Z", "projects": {}},
+                            "--data-file")
+        hash1 = json.loads((tmp_path / "ci-data.json").read_text())["content_hash"]
+        second = self._build(tmp_path, {"baked_at": "2025-01-02T00:00:00Z", "projects": {}},
+                             "--data-file")
+        hash2 = json.loads((tmp_path / "ci-data.json").read_text())["content_hash"]
+        assert first == second
+        assert hash1 == hash2
+        third = self._build(tmp_path, {"baked_at": "2025-01-02T00:00:00Z",
+                                       "projects": {"a": {"workflows": {}}}}, "--data-file")
+        assert third != second
+
+
+class TestBuildManifest:
+
+    @staticmethod
+    def _live_build(out, *argv, **env):
+        with mock.patch.dict(os.environ, dict(env, DASHBOARD_OUT=str(out), GITHUB_TOKEN="",
+                                              DASHBOARD_PREVIOUS="")):
+            assert build_dashboard.main(list(argv)) == 0
+
+    def test_manifest_records_inputs_and_outputs(self, tmp_path):
+        self._live_build(tmp_path / "index.html")
+        manifest = json.loads((tmp_path / "build-manifest.json").read_text())
+        assert set(manifest["inputs"]) == {
+            "ci/config/projects.yaml", "ci/templates/base.html", "ci/static/style.css",
+            "ci/static/app.js", "scripts/build_dashboard.py",
+        }
+        assert manifest["data"] is None
+        assert manifest["outputs"]["index.html"] == build_dashboard._file_digest(
+            str(tmp_path / "index.html"))
+
+    def test_identical_rebuild_is_skipped(self, tmp_path):
+        out = tmp_path / "index.html"
+        gh_output = tmp_path / "gh-output"
+        self._live_build(out)
+        before = out.stat().st_mtime_ns
+        self._live_build(out, GITHUB_OUTPUT=str(gh_output))
+        assert out.stat().st_mtime_ns == before
+        assert gh_output.read_text() == "changed=false\n"
+        self._live_build(out, "--minify", GITHUB_OUTPUT=str(gh_output))
+        assert gh_output.read_text().endswith("changed=true\n")
+
+    def test_tampered_output_is_rebuilt(self, tmp_path):
+        out = tmp_path / "index.html"
+        self._live_build(out)
+        html = out.read_text()
+        out.write_text("stale")
+        self._live_build(out)
+        assert out.read_text() == html
+
+    def test_manifest_from_previous_dir_needs_its_artifacts(self, tmp_path):
+        published = tmp_path / "published"
+        published.mkdir()
+        self._live_build(published / "index.html")
+        gh_output = tmp_path / "gh-output"
+        env = {"DASHBOARD_OUT": str(tmp_path / "out" / "index.html"), "GITHUB_TOKEN": "",
+               "DASHBOARD_PREVIOUS": str(published / "index.html"),
+               "GITHUB_OUTPUT": str(gh_output)}
+        with mock.patch.dict(os.environ, env):
+            assert build_dashboard.main([]) == 0
+        assert gh_output.read_text() == "changed=false\n"
+        (published / "index.html").unlink()
+        env["DASHBOARD_OUT"] = str(tmp_path / "out2" / "index.html")
+        with mock.patch.dict(os.environ, env):
+            assert build_dashboard.main([]) == 0
+        assert gh_output.read_text().endswith("changed=true\n")
+
+    def test_stale_outputs(self, tmp_path):
+        (tmp_path / "index.html").write_text("x")
+        digest = build_dashboard._file_digest(str(tmp_path / "index.html"))
+        manifest = {"outputs": {"index.html": digest, "index.html.gz": "0" * 16}}
+        assert build_dashboard.stale_outputs(manifest, str(tmp_path)) == ["index.html.gz"]
+        assert build_dashboard.stale_outputs({"outputs": {"index.html": digest}}, str(tmp_path),
+                                             ("index.html", "ci-data.json")) == ["ci-data.json"]
+
+    def test_build_unchanged_rules(self):
+        payload = {"baked_at": "2025-01-01T00:00:00Z",
+                   "projects": {"a": {"workflows": {"ci.yml": {"conclusion": "success",
+                                                               "fetched_at": "x"}}}}}
+        current = build_dashboard.build_manifest({}, {"minify": False}, payload)
+        assert current["data"] == build_dashboard.data_digest(
+            dict(payload, baked_at="2025-02-02T00:00:00Z"))
+        fresh = dict(current, baked_at=datetime.now(timezone.utc).strftime(
+            build_dashboard.TIMESTAMP_FORMAT))
+        assert build_dashboard.build_unchanged(fresh, current, 60)
+        assert not build_dashboard.build_unchanged(current, current, 60)   # too old
+        assert not build_dashboard.build_unchanged(dict(fresh, data="other"), current, 60)
+        assert not build_dashboard.build_unchanged(None, current, 60)
+
+
+class TestDevServer:
+
+    @pytest.fixture
+    def sources(self, tmp_path):
+        paths = {}
+        for section, src in [("config", build_dashboard.CONFIG_PATH),
+                             ("template", build_dashboard.TEMPLATE_PATH),
+                             ("css", build_dashboard.CSS_PATH),
+                             ("js", build_dashboard.JS_PATH)]:
+            dst = tmp_path / os.path.basename(src)
+            shutil.copy(src, dst)
+            paths[section] = str(dst)
+        return paths
+
+    @staticmethod
+    def _edit(path, text):
+        with open(path, "a", encoding="utf-8") as fh:
+            fh.write(text)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    def test_rebuilds_only_the_changed_section(self, sources):
+        snap = {"baked_at": "2025-01-01T00:00:00Z", "projects": {}}
+        build = build_dashboard.DevBuild(sources, prefetched=snap)
+        assert build_dashboard.LIVE_RELOAD_SNIPPET + "</body>" in build.html
+        assert "2025-01-01T00:00:00Z" in build.html
+        template, js_config = build.template, build.js_config
+
+        self._edit(sources["css"], "\n.dev-marker { color: red; }\n")
+        assert build.changed_sections() == ["css"]
+        build.rebuild(build.changed_sections())
+        assert build.version == 1
+        assert ".dev-marker" in build.html
+        assert build.template is template and build.js_config is js_config
+        assert build.changed_sections() == []
+
+    def test_broken_source_keeps_last_good_build(self, sources):
+        build = build_dashboard.DevBuild(sources)
+        html = build.html
+        self._edit(sources["template"], "{% if %}")
+        build.rebuild(build.changed_sections())
+        assert build.version == 0
+        assert build.html == html
+
+    def test_serves_html_and_reload_events(self, sources):
+        build = build_dashboard.DevBuild(sources)
+        server = build_dashboard.make_dev_server(build, port=0)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with urllib.request.urlopen(base + "/") as resp:
+                assert resp.read().decode("utf-8") == build.html
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(base + "/missing.js")
+            with urllib.request.urlopen(base + "/__reload", timeout=5) as events:
+                threading.Timer(0.1, build.rebuild, args=(["css"],)).start()
+                assert events.readline() == b"data: 1\n"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+def run_app_js_section(start_marker: str, end_marker: str, script: str,
+                       prelude: str = "") -> list[str]:
+    """Run a slice of app.js plus *script* under node with stubbed browser APIs.
+
+    *prelude* is evaluated before the slice, for the build-time constants and
+    helpers it refers to.  Returns the lines *script* logs.  The stubs cover what the engine's
+    data layer touches: fetch (answers from ``FETCH_BODIES``, counting calls
+    in ``fetchCalls`` and honouring ``init.signal``) and localStorage.
+    """
+    with open(build_dashboard.JS_PATH, encoding="utf-8") as fh:
+        js = fh.read()
+    section = js[js.index(start_marker):js.index(end_marker)]
+    harness = textwrap.dedent("""\
+        const store = {};
+        globalThis.localStorage = {
+          getItem: k => (k in store ? store[k] : null),
+          setItem: (k, v) => { store[k] = String(v); },
+          removeItem: k => { delete store[k]; },
+          key: i => Object.keys(store)[i],
+          get length() { return Object.keys(store).length; },
+        };
+        const FETCH_BODIES = {};
+        let fetchCalls = 0;
+        globalThis.fetch = async (url, init) => {
+          fetchCalls++;
+          await new Promise(r => setTimeout(r, 5));
+          if (init && init.signal && init.signal.aborted) {
+            throw new DOMException('The operation was aborted', 'AbortError');
+          }
+          const body = FETCH_BODIES[url];
+          return { ok: body !== undefined, status: body === undefined ? 404 : 200,
+                   json: async () => JSON.parse(JSON.stringify(body)) };
+        };
+    """)
+    proc = subprocess.run(["node", "-e", harness + prelude + "\n" + section +
+                           "\n(async () => {\n" + script + "\n})();"],
+                          capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    return proc.stdout.splitlines()
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node not installed")
+class TestClientCache:
+
+    SECTION = ("const GH_REQUEST", "/* ── SVG icons")
+    URL = "https://w/github/repos/casangi/x/actions/runs?per_page=30"
+
+    def _run(self, script):
+        body = {"total_count": 1, "workflow_runs": [
+            {"name": "ci", "status": "completed", "conclusion": "success",
+             "head_branch": "main", "updated_at": "2025-01-01T00:00:00Z", "html_url": "u"}]}
+        return run_app_js_section(*self.SECTION, f"""
+            const URL = {json.dumps(self.URL)};
+            FETCH_BODIES[URL] = {json.dumps(body)};
+            {script}
+        """)
+
+    def test_fresh_entries_skip_the_network(self):
+        out = self._run("""
+            const a = await cachedApiJson(URL, GH_REQUEST);
+            const b = await cachedApiJson(URL, GH_REQUEST);
+            console.log(fetchCalls, JSON.stringify(a) === JSON.stringify(b));
+            console.log(Object.keys(a.workflow_runs[0]).sort().join(','));
+            apiCache.clear();
+            await cachedApiJson(URL, GH_REQUEST);
+            console.log(fetchCalls);
+        """)
+        assert out == ["1 true", "conclusion,head_branch,name,status,updated_at", "1"]
+
+    def test_stale_entries_are_served_and_revalidated(self):
+        out = self._run("""
+            await cachedApiJson(URL, GH_REQUEST);
+            apiCache.get(URL).at -= apiCacheTtl(URL) + 1;
+            FETCH_BODIES[URL].workflow_runs[0].conclusion = 'failure';
+            const shown = await cachedApiJson(URL, GH_REQUEST,
+              d => console.log('update', d.workflow_runs[0].conclusion));
+            console.log('shown', shown.workflow_runs[0].conclusion);
+            await new Promise(r => setTimeout(r, 50));
+        """)
+        assert out == ["shown success", "update failure"]
+
+    def test_expired_entries_are_dropped(self):
+        out = self._run("""
+            await cachedApiJson(URL, GH_REQUEST);
+            apiCache.get(URL).at -= API_CACHE_MAX_AGE + 1;
+            console.log(apiCacheGet(URL), localStorage.length);
+        """)
+        assert out == ["null 0"]
+
+    def test_persisted_entries_are_capped_lru(self):
+        out = self._run("""
+            const stored = () => Object.keys(store).map(k => k.slice(API_CACHE_PREFIX.length));
+            for (let i = 0; i < API_CACHE_MAX_ENTRIES; i++) apiCachePut('u' + i, {n: i});
+            apiCacheGet('u0');                       // now the most recently used
+            apiCachePut('extra', {n: -1});
+            console.log(stored().length, stored().includes('u0'), stored().includes('u1'));
+
+            apiCache.clear();
+            apiCacheStored.clear();
+            store['viper-api:old'] = JSON.stringify({at: Date.now() - 1000, data: {}});
+            pruneApiCache();                         // 201 entries: the oldest goes
+            console.log(stored().length, stored().includes('old'), stored().includes('extra'));
+        """)
+        assert out == ["200 true false", "200 false true"]
+
+    def test_full_storage_evicts_and_retries(self):
+        out = self._run("""
+            apiCachePut('a', {n: 1});
+            apiCachePut('b', {n: 2});
+            const setItem = localStorage.setItem;
+            localStorage.setItem = (k, v) => {
+              if (Object.keys(store).length >= 2) {
+                throw new DOMException('full', 'QuotaExceededError');
+              }
+              setItem(k, v);
+            };
+            apiCachePut('c', {n: 3});
+            console.log(Object.keys(store).sort().join(','));
+            localStorage.setItem = () => { throw new DOMException('denied', 'SecurityError'); };
+            apiCachePut('d', {n: 4});
+            console.log(Object.keys(store).sort().join(','), apiCacheGet('d').data.n);
+        """)
+        assert out == ["viper-api:b,viper-api:c", "viper-api:b,viper-api:c 4"]
+
+    def test_concurrent_requests_share_one_fetch(self):
+        out = self._run("""
+            const [a, b] = await Promise.all([cachedApiJson(URL, GH_REQUEST),
+                                              cachedApiJson(URL, GH_REQUEST)]);
+            console.log(fetchCalls, a === b, apiInFlight.size);
+        """)
+        assert out == ["1 true 0"]
+
+    def test_abort_only_cancels_once_every_waiter_left(self):
+        out = self._run("""
+            const left = new AbortController();
+            const stays = cachedApiJson(URL, GH_REQUEST);
+            const leaves = cachedApiJson(URL, GH_REQUEST, null, left.signal)
+              .catch(err => isAbortError(err) ? 'aborted' : 'error');
+            left.abort();
+            console.log(await leaves, (await stays).total_count, apiCacheGet(URL) !== null);
+
+            apiCache.clear();
+            for (const k in store) delete store[k];
+            const signal = panelSignal();
+            const pending = cachedApiJson(URL, GH_REQUEST, null, signal)
+              .then(() => 'painted', err => isAbortError(err) ? 'aborted' : 'error');
+            abortPanelRequests();
+            console.log(await pending, apiInFlight.size, apiCacheGet(URL));
+        """)
+        assert out == ["aborted 1 true", "aborted 0 null"]
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node not installed")
+class TestLiveOverview:
+
+    SECTION = ("const GH_REQUEST", "/* ══════════════════════════════════════════════════"
+                                   "════════════════════════\n   NAVIGATION")
+    PRELUDE = textwrap.dedent("""\
+        const WORKER_URL = 'https://w';
+        const PREFETCHED_CI_DATA = null;
+        const MAX_RECENT_BRANCHES = 2;
+        const relTime = d => 'at ' + d.toISOString().slice(0, 10);
+        const ghApiUrl = path => WORKER_URL + '/github' + path;
+    """)
+
+    def _run(self, script, batch):
+        return run_app_js_section(*self.SECTION, f"""
+            const el = () => ({{ style: {{}}, dataset: {{}}, textContent: '' }});
+            const row = (id, file) => ({{ id, owner: 'casangi', repo: id, wf: {{ file }},
+              selectEl: null, dot: el(), statusEl: el(), branchEl: el(), timeEl: el() }});
+            const rows = [row('xradio', 'linux.yml'), row('xradio', 'macos.yml'),
+                          row('astroviper', 'ci.yml')];
+            const url = statusBatchUrl(rows, []);
+            if ({json.dumps(batch)}) FETCH_BODIES[url] = {json.dumps(batch)};
+            {script}
+        """, prelude=self.PRELUDE)
+
+    def test_rows_are_filled_from_one_batch_request(self):
+        batch = {"baked_at": "2025-01-01T00:00:00Z", "projects": {
+            "xradio": {"workflows": {
+                "linux.yml": {"conclusion": "success", "updated_at": "2025-01-02T00:00:00Z"},
+                "macos.yml": {"conclusion": "failure", "updated_at": "2025-01-03T00:00:00Z"}}},
+            "astroviper": {"workflows": {
+                "ci.yml": {"conclusion": "cancelled", "updated_at": "2025-01-04T00:00:00Z"}}}}}
+        out = self._run("""
+            console.log(JSON.parse(decodeURIComponent(url.split('?q=')[1]))
+              .map(i => i.id + ':' + i.repo + ':' + i.workflows.join('+')).join(' '));
+            loadLiveOverview(rows, []);
+            await new Promise(r => setTimeout(r, 50));
+            console.log(fetchCalls, rows.map(r => r.statusEl.textContent + ' ' + r.timeEl.textContent)
+              .join(', '));
+        """, batch)
+        assert out == [
+            "xradio:casangi/xradio:linux.yml+macos.yml astroviper:casangi/astroviper:ci.yml",
+            "2 passing at 2025-01-02, failing at 2025-01-03, cancelled at 2025-01-04",
+        ]
+
+    def test_rows_fall_back_to_their_own_requests(self):
+        batch = {"projects": {"xradio": {"workflows": {
+            "linux.yml": {"conclusion": "success", "updated_at": "2025-01-02T00:00:00Z"}},
+            "errors": {"macos.yml": "HTTP 502"}}}}
+        out = self._run("""
+            FETCH_BODIES['https://w/github/repos/casangi/astroviper/actions/workflows/ci.yml/runs'
+                         + '?branch=main&per_page=1'] = { workflow_runs: [
+              { conclusion: 'success', updated_at: '2025-01-05T00:00:00Z' }] };
+            loadLiveOverview(rows, []);
+            await new Promise(r => setTimeout(r, 50));
+            console.log(fetchCalls, rows.map(r => r.statusEl.textContent).join(', '));
+        """, batch)
+        assert out == ["4 passing, unavailable (HTTP 404), passing"]
+
+    def test_a_recent_worker_snapshot_replaces_the_batch(self):
+        out = self._run("""
+            const entry = { conclusion: 'success', updated_at: '2025-01-02T00:00:00Z' };
+            const baked_at = new Date(Date.now() - 60 * 1000).toISOString();
+            FETCH_BODIES['https://w/snapshot'] = { baked_at, projects: {
+              xradio: { workflows: { 'linux.yml': entry, 'macos.yml': entry } },
+              astroviper: { workflows: { 'ci.yml': entry } } } };
+            loadLiveOverview(rows, []);
+            await new Promise(r => setTimeout(r, 50));
+            console.log(fetchCalls, rows.map(r => r.statusEl.textContent).join(', '));
+
+            apiCache.clear();
+            for (const k in store) delete store[k];
+            FETCH_BODIES['https://w/snapshot'].baked_at = '2025-01-01T00:00:00Z';
+            console.log(isRecentSnapshot(await fetchWorkerSnapshot()));
+        """, None)
+        assert out == ["1 passing, passing, passing", "false"]
+
+    def test_a_forced_refresh_skips_the_snapshot_and_the_cache(self):
+        entry = {"conclusion": "success", "updated_at": "2025-01-02T00:00:00Z"}
+        batch = {"projects": {"xradio": {"workflows": {"linux.yml": entry, "macos.yml": entry}},
+                              "astroviper": {"workflows": {"ci.yml": entry}}}}
+        out = self._run("""
+            const baked_at = new Date(Date.now() - 60 * 1000).toISOString();
+            FETCH_BODIES['https://w/snapshot'] = { baked_at, projects: {} };
+            console.log(JSON.stringify(await loadLiveOverview(rows, [])) === JSON.stringify(
+              { snapshot: baked_at }));
+            await loadLiveOverview(rows, []);
+            const before = fetchCalls;
+            console.log(JSON.stringify(await loadLiveOverview(rows, [], true)), fetchCalls - before);
+            console.log(Object.keys(await loadLiveOverview(rows, [])).join());
+        """, batch)
+        # the snapshot has no rows, so the first loads fetch them one by one
+        assert out == ["true", '{"live":true} 1', "snapshot"]
+
+    def test_cached_answers_are_not_called_live(self):
+        out = self._run("""
+            FETCH_BODIES[url].projects = {};
+            apiCachePut(url, FETCH_BODIES[url]);
+            const source = await loadLiveOverview(rows, []);
+            console.log(Object.keys(source).join(), fetchCalls);
+        """, {"projects": {}})
+        # no snapshot: cached batch, then each row on its own (404s here)
+        assert out == ["cachedAt 4"]
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node not installed")
+class TestAutoRefresh:
+
+    def _run(self, script):
+        return run_app_js_section(*TestLiveOverview.SECTION, f"""
+            globalThis.document = {{
+              hidden: false,
+              getElementById: () => ({{ style: {{ display: 'flex' }} }}),
+              querySelector: () => null,
+            }};
+            // count writes, to tell patched rows from untouched ones
+            const el = () => {{
+              const e = {{ style: {{}}, dataset: {{}}, writes: 0, text: '' }};
+              Object.defineProperty(e, 'textContent', {{
+                get: () => e.text, set: v => {{ e.writes++; e.text = v; }} }});
+              return e;
+            }};
+            const row = (id, file) => ({{ id, owner: 'casangi', repo: id, wf: {{ file }},
+              selectEl: null, dot: el(), statusEl: el(), branchEl: el(), timeEl: el() }});
+            overview = {{ rows: [row('xradio', 'linux.yml'), row('xradio', 'macos.yml')],
+                          selects: [] }};
+            const snap = (linux, macos) => ({{
+              baked_at: new Date(Date.now() - 1000).toISOString(), projects: {{ xradio: {{
+                workflows: {{ 'linux.yml': {{ conclusion: linux, updated_at: '2025-01-01T00:00:00Z' }},
+                             'macos.yml': {{ conclusion: macos, updated_at: '2025-01-01T00:00:00Z' }} }}
+              }} }} }});
+            const SNAP_URL = 'https://w/snapshot';
+            {script}
+            clearTimeout(autoRefresh.timer);
+        """, prelude=TestLiveOverview.PRELUDE + "const CI_DATA_URL = '';\n")
+
+    def test_only_changed_rows_are_patched(self):
+        out = self._run("""
+            patchOverview(snap('success', 'success'));
+            const before = overview.rows.map(r => r.statusEl.writes);
+            patchOverview(snap('success', 'failure'));
+            console.log(JSON.stringify(overview.rows.map((r, i) => r.statusEl.writes - before[i])),
+                        overview.rows[1].statusEl.text, overview.rows[1].dot.style.background);
+        """)
+        assert out == ["[0,1] failing #f87171"]
+
+    def test_polling_backs_off_while_unchanged(self):
+        out = self._run("""
+            autoRefresh.enabled = true;
+            FETCH_BODIES[SNAP_URL] = snap('success', 'success');
+            const delays = [];
+            for (let i = 0; i < 5; i++) { await pollOverview(); delays.push(autoRefresh.delay / 1000); }
+            FETCH_BODIES[SNAP_URL] = snap('success', 'failure');
+            await pollOverview();
+            delays.push(autoRefresh.delay / 1000);
+            console.log(delays.join(' '), fetchCalls, overview.rows[1].statusEl.text);
+        """)
+        # the first poll changes the (empty) digest; then 120s, 240s, ... up to 600s
+        assert out == ["60 120 240 480 600 60 6 failing"]
+
+    def test_hidden_tabs_do_not_poll(self):
+        out = self._run("""
+            autoRefresh.enabled = true;
+            document.hidden = true;
+            scheduleAutoRefresh(0);
+            await new Promise(r => setTimeout(r, 20));
+            console.log(autoRefresh.timer === null, fetchCalls);
+            document.hidden = false;
+            scheduleAutoRefresh(0);
+            await new Promise(r => setTimeout(r, 20));
+            console.log(fetchCalls > 0);
+        """)
+        assert out == ["true 0", "true"]
+
+    def test_unavailable_storage_does_not_break_the_toggle(self):
+        out = self._run("""
+            globalThis.window = { location: { search: '' } };
+            document.addEventListener = () => {};
+            localStorage.getItem = localStorage.setItem = () => {
+              throw new DOMException('The operation is insecure.', 'SecurityError');
+            };
+            initAutoRefresh();
+            const before = autoRefresh.enabled;
+            setAutoRefresh(true);
+            console.log(before, autoRefresh.enabled, autoRefresh.timer !== null);
+            clearInterval(relTimeTimer);
+        """)
+        assert out == ["false true true"]
+
+    def test_a_newer_worker_snapshot_is_patched_in_after_rendering(self):
+        out = self._run("""
+            const age = { dataset: {}, textContent: '' };
+            document.querySelector = () => age;
+            ciSnapshot = Object.assign(snap('success', 'success'),
+                                       { baked_at: '2025-01-01T00:00:00Z' });
+            FETCH_BODIES[SNAP_URL] = snap('success', 'failure');
+            await applyWorkerSnapshot();
+            console.log(overview.rows.map(r => r.statusEl.text).join(', '),
+                        ciSnapshot.baked_at === age.dataset.time);
+
+            FETCH_BODIES[SNAP_URL] = Object.assign(snap('failure', 'failure'),
+                                                   { baked_at: '2024-12-31T00:00:00Z' });
+            apiCache.clear();
+            for (const k in store) delete store[k];
+            await applyWorkerSnapshot();
+            console.log(overview.rows.map(r => r.statusEl.text).join(', '));
+        """)
+        assert out == ["passing, failing true", "passing, failing"]
+
+    def test_worker_snapshot_requests_time_out(self):
+        out = self._run("""
+            AbortSignal.timeout = () => {
+              const c = new AbortController();
+              setTimeout(() => c.abort(), 20);
+              return c.signal;
+            };
+            globalThis.fetch = (url, init) => new Promise((resolve, reject) => {
+              init.signal.addEventListener('abort', () => reject(init.signal.reason));
+            });
+            console.log(await fetchWorkerSnapshot());
+        """)
+        assert out == ["null"]
+
+
+class TestProductionBuild:
+
+    def test_minify_css(self):
+        css = 'a , b > c { color : red ; /* note */ content: "x ; }" ; }\n\n@media (max-width: 9px) and (x) { d :hover { e: 1 } }'
+        assert build_dashboard.minify_css(css) == (
+            'a,b>c{color :red;content:"x ; }"}@media (max-width:9px) and (x){d :hover{e:1}}'
+        )
+
+    def test_minify_js_keeps_literals_and_asi(self):
+        src = textwrap.dedent("""\
+            // line comment
+            const s = "a // b", t = `x ${ {a: 1}.a } /* y */`;  /* block */
+            const r = /[/]+\\//g.test(s) ? a / b : 0;
+            let i = a - -b
+            i++
+            return x
+        """)
+        out = build_dashboard.minify_js(src)
+        assert "comment" not in out and "block" not in out
+        assert '"a // b"' in out and "`x ${ {a: 1}.a } /* y */`" in out
+        assert "/[/]+\\//g.test(s)?a/b:0" in out
+        assert "a- -b\ni++\nreturn x" in out
+
+    @pytest.mark.parametrize("src, expected", [
+        # postfix ++/-- end an operand: division follows
+        ("let a = i++ / 2 / 3;\nb = j-- / k / 2", "let a=i++/2/3;b=j--/k/2"),
+        ("x = ++/a/.lastIndex", "x=++/a/.lastIndex"),
+        # keywords used as property names are operands
+        ("const r = it.return / 2 / y, t = o.typeof / 3 / z",
+         "const r=it.return/2/y,t=o.typeof/3/z"),
+        # a ")" closing an if/while/for condition is followed by a regex
+        ("if (ok) /a+b/.test(s)\nwhile (x) /c/g.exec(s)\nfor (;;) /d/.test(e)",
+         "if(ok)/a+b/.test(s)\nwhile(x)/c/g.exec(s)\nfor(;;)/d/.test(e)"),
+        # any other ")" ends an operand
+        ("f(a) / 2 / b, o.if(c) / 3 / d", "f(a)/2/b,o.if(c)/3/d"),
+    ])
+    def test_minify_js_tells_regex_from_division(self, src, expected):
+        assert build_dashboard.minify_js(src) == expected
+
+    def test_unminifiable_js_is_kept_as_is(self, capsys):
+        src = "const s = 'unterminated\n"
+        with pytest.raises(ValueError):
+            build_dashboard.minify_js(src)
+        assert build_dashboard.prepare_js(src, minify=True) == src
+        assert "could not minify" in capsys.readouterr().err
+
+    @pytest.mark.skipif(not shutil.which("node"), reason="node not installed")
+    def test_minified_app_js_parses(self, tmp_path):
+        with open(build_dashboard.JS_PATH, encoding="utf-8") as fh:
+            minified = build_dashboard.minify_js(fh.read())
+        path = tmp_path / "app.min.js"
+        path.write_text(minified, encoding="utf-8")
+        proc = subprocess.run(["node", "--check", str(path)], capture_output=True, text=True)
+        assert proc.returncode == 0, proc.stderr
+
+    def test_minify_build_writes_precompressed_siblings(self, tmp_path):
+        snap = {"baked_at": "2025-01-01T00:00:00Z", "projects": {"a": {"workflows": {}}}}
+        plain = TestDataFileBuild._build(tmp_path, snap)
+        html = TestDataFileBuild._build(tmp_path, snap, "--minify")
+        assert len(html) < 0.8 * len(plain)
+        with open(tmp_path / "index.html.gz", "rb") as fh:
+            assert gzip.decompress(fh.read()).decode("utf-8") == html
+        # the previous-snapshot reader must still find the inlined data
+        assert build_dashboard.load_previous_snapshot(str(tmp_path / "index.html")) == snap
+
+    def test_compressed_sizes(self):
+        sizes = build_dashboard.compressed_sizes("x" * 1000)
+        assert sizes["raw"] == 1000
+        assert sizes["gz"] < 100
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 5. Baked data structure (mocked API)
 # ═══════════════════════════════════════════════════════════════════════════
@@ -442,6 +1115,77 @@ class TestBakeDataStructure:
         assert result is None
 
 
+    def test_bake_concurrent_matches_serial(self, config):
+        serial_cfg = dict(config, bake={"max_workers": 1})
+        parallel_cfg = dict(config, bake={"max_workers": 8})
+        with mock.patch.object(build_dashboard, "_gh_get", side_effect=self._mock_gh_get):
+            serial = build_dashboard.bake_ci_data(serial_cfg, "fake-token")
+            parallel = build_dashboard.bake_ci_data(parallel_cfg, "fake-token")
+
+        assert json.dumps(serial["projects"]) == json.dumps(parallel["projects"])
+
+    def test_bake_repo_sweep_single_call_per_project(self, config):
+        calls = []
+
+        def sweep_gh_get(path, token):
+            calls.append(path)
+            repo = path.split("/")[3]
+            proj = next(p for p in config["projects"] if p["repo"] == repo)
+            files = {wf["file"] for c in proj["categories"] if c["type"] == "ci"
+                     for wf in c["workflows"]}
+            files |= {wf["file"] for wf in proj["overview_workflows"]}
+            runs = [{"path": ".github/workflows/" + f, "head_branch": "feature-x",
+                     "conclusion": "failure", "updated_at": "2025-06-02T00:00:00Z"}
+                    for f in sorted(files)]
+            runs += [{"path": ".github/workflows/" + f, "head_branch": "main",
+                      "conclusion": "success", "updated_at": "2025-06-01T00:00:00Z"}
+                     for f in sorted(files)]
+            return {"workflow_runs": runs}
+
+        cfg = dict(config, bake={"max_workers": 4, "fetch_mode": "repo"})
+        with mock.patch.object(build_dashboard, "_gh_get", side_effect=sweep_gh_get):
+            result = build_dashboard.bake_ci_data(cfg, "fake-token")
+
+        assert len(calls) == len(config["projects"])
+        assert all("/actions/runs?" in c for c in calls)
+        for proj in config["projects"]:
+            proj_data = result["projects"][proj["id"]]
+            for wf in proj["overview_workflows"]:
+                assert proj_data["workflows"][wf["file"]]["conclusion"] == "success"
+            for wf_data in proj_data["panel_workflows"].values():
+                assert wf_data["head_branch"] == "feature-x"
+            assert proj_data["recent_branches"] == ["feature-x"]
+
+    def test_bake_repo_sweep_falls_back_for_missing_workflows(self, config):
+        cfg = dict(config, bake={"max_workers": 1, "fetch_mode": "repo"})
+        with mock.patch.object(build_dashboard, "_gh_get", side_effect=self._mock_gh_get) as m:
+            result = build_dashboard.bake_ci_data(cfg, "fake-token")
+
+        assert any("/actions/workflows/" in c.args[0] for c in m.call_args_list)
+        for proj in config["projects"]:
+            for wf in proj["overview_workflows"]:
+                assert wf["file"] in result["projects"][proj["id"]]["workflows"]
+
+    def test_run_calls_preserves_order(self):
+        import time
+
+        def slow(i):
+            time.sleep(0.01 * (5 - i))
+            return i
+
+        calls = [build_dashboard.BakeCall("p", "workflows", str(i), slow, (i,))
+                 for i in range(5)]
+        assert build_dashboard.run_calls(calls, 5) == [0, 1, 2, 3, 4]
+
+    def test_run_calls_reraises_first_error(self):
+        def boom():
+            raise RuntimeError("GitHub API error (HTTP 403)")
+
+        calls = [build_dashboard.BakeCall("p", "workflows", "a", boom, ())]
+        with pytest.raises(RuntimeError):
+            build_dashboard.run_calls(calls, 4)
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 6. API helper unit tests
 # ═══════════════════════════════════════════════════════════════════════════
@@ -507,6 +1251,24 @@ class TestApiHelpers:
             result = build_dashboard.fetch_recent_branches("org", "repo", "tok", 5)
         assert result == ["feat-a", "feat-b"]
 
+    def test_latest_run_from_runs_filters_by_file_and_branch(self):
+        runs = [
+            {"path": ".github/workflows/a.yml", "head_branch": "dev", "id": 1},
+            {"path": ".github/workflows/b.yml", "head_branch": "main", "id": 2},
+            {"path": ".github/workflows/a.yml", "head_branch": "main", "id": 3},
+        ]
+        assert build_dashboard.latest_run_from_runs(runs, "a.yml")["id"] == 1
+        assert build_dashboard.latest_run_from_runs(runs, "a.yml", "main")["id"] == 3
+        assert build_dashboard.latest_run_from_runs(runs, "c.yml") is None
+
+    def test_fetch_repo_runs_paginates_until_short_page(self):
+        full = {"workflow_runs": [{}] * build_dashboard.SWEEP_PAGE_SIZE}
+        short = {"workflow_runs": [{}] * 3}
+        with mock.patch.object(build_dashboard, "_gh_get", side_effect=[full, short]) as m:
+            runs = build_dashboard.fetch_repo_runs("org", "repo", "tok", pages=5)
+        assert len(runs) == build_dashboard.SWEEP_PAGE_SIZE + 3
+        assert m.call_count == 2
+
     def test_fetch_recent_branches_respects_limit(self):
         runs = [
             {"head_branch": f"branch-{i}"} for i in range(10)
@@ -519,6 +1281,540 @@ class TestApiHelpers:
         assert len(result) == 2
 
 
+class TestHttpCache:
+
+    class _FakeResponse:
+        def __init__(self, body, headers):
+            self._body = body.encode()
+            self.headers = headers
+
+        def read(self):
+            return self._body
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def test_cache_round_trip(self, tmp_path):
+        cache = build_dashboard.HttpCache(str(tmp_path))
+        cache.put("https://x/a", {"ETag": '"abc"'}, '{"k": 1}')
+        entry = cache.get("https://x/a")
+        assert entry["etag"] == '"abc"'
+        assert entry["body"] == '{"k": 1}'
+        assert cache.get("https://x/b") is None
+
+    def test_cache_skips_responses_without_validators(self, tmp_path):
+        cache = build_dashboard.HttpCache(str(tmp_path))
+        cache.put("https://x/a", {}, "{}")
+        assert cache.get("https://x/a") is None
+
+    def test_gh_get_revalidates_and_reuses_body_on_304(self, tmp_path):
+        cache = build_dashboard.HttpCache(str(tmp_path))
+        sent_headers = []
+
+        def fake_urlopen(req, timeout=None):
+            sent_headers.append(dict(req.header_items()))
+            if len(sent_headers) == 1:
+                return self._FakeResponse('{"workflow_runs": [1]}', {"ETag": '"v1"'})
+            raise urllib.error.HTTPError(req.full_url, 304, "Not Modified", {}, None)
+
+        with mock.patch.object(build_dashboard, "HTTP_CACHE", cache), \
+             mock.patch("urllib.request.urlopen", side_effect=fake_urlopen):
+            first = build_dashboard._gh_get("/repos/o/r/actions/runs", "tok")
+            second = build_dashboard._gh_get("/repos/o/r/actions/runs", "tok")
+
+        assert first == second == {"workflow_runs": [1]}
+        assert "If-none-match" not in sent_headers[0]
+        assert sent_headers[1]["If-none-match"] == '"v1"'
+        assert cache.hits == 1
+
+    def test_configure_http_cache_env_override(self, tmp_path, config):
+        with mock.patch.dict(os.environ, {"DASHBOARD_HTTP_CACHE": str(tmp_path)}):
+            cache = build_dashboard.configure_http_cache(config)
+        try:
+            assert cache is not None and cache.directory == str(tmp_path)
+        finally:
+            build_dashboard.HTTP_CACHE = None
+
+    def test_configure_http_cache_disabled(self, config):
+        with mock.patch.dict(os.environ, {"DASHBOARD_HTTP_CACHE": ""}):
+            assert build_dashboard.configure_http_cache(config) is None
+
+
+class TestConnectionPool:
+
+    @pytest.fixture
+    def server(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if self.path.startswith("/redirect/"):
+                    # /redirect/<status>/<location>
+                    status, location = self.path[len("/redirect/"):].split("/", 1)
+                    self.send_response(int(status))
+                    self.send_header("Location", urllib.parse.unquote(location))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                status = 404 if self.path.startswith("/missing") else 200
+                echo = {"path": self.path}
+                if self.path.startswith("/auth"):
+                    echo["auth"] = self.headers.get("Authorization")
+                body = json.dumps(echo).encode()
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = gzip.compress(body)
+                    self.send_response(status)
+                    self.send_header("Content-Encoding", "gzip")
+                else:
+                    self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+        httpd.shutdown()
+        httpd.server_close()
+
+    def test_connections_are_reused(self, server):
+        pool = build_dashboard.ConnectionPool()
+        for i in range(3):
+            with pool.open(urllib.request.Request(f"{server}/a?i={i}")) as resp:
+                assert json.loads(resp.read()) == {"path": f"/a?i={i}"}
+        pool.close()
+        assert pool.opened == 1
+        assert pool.reused == 2
+
+    def test_gzip_is_decoded(self, server):
+        pool = build_dashboard.ConnectionPool(gzip=True)
+        with pool.open(urllib.request.Request(f"{server}/z")) as resp:
+            assert json.loads(resp.read()) == {"path": "/z"}
+        pool.close()
+
+    def test_error_status_raises_http_error(self, server):
+        pool = build_dashboard.ConnectionPool()
+        with pytest.raises(urllib.error.HTTPError) as info:
+            pool.open(urllib.request.Request(f"{server}/missing"))
+        assert info.value.code == 404
+        pool.close()
+
+    @pytest.mark.parametrize("status", [301, 302, 307, 308])
+    def test_same_host_redirects_are_followed_on_the_pool(self, server, status):
+        pool = build_dashboard.ConnectionPool()
+        req = urllib.request.Request(f"{server}/redirect/{status}/%2Fauth%3Fto%3Dhere",
+                                     headers={"Authorization": "token t"})
+        with pool.open(req) as resp:
+            assert json.loads(resp.read()) == {"path": "/auth?to=here", "auth": "token t"}
+        pool.close()
+        assert pool.opened == 1
+
+    def test_other_host_redirects_fall_back_to_urlopen(self, server):
+        pool = build_dashboard.ConnectionPool()
+        elsewhere = urllib.parse.quote(server.replace("127.0.0.1", "localhost") + "/auth", safe="")
+        req = urllib.request.Request(f"{server}/redirect/302/{elsewhere}",
+                                     headers={"Authorization": "token t"})
+        with mock.patch.object(urllib.request, "urlopen", wraps=urllib.request.urlopen) as urlopen:
+            with pool.open(req) as resp:
+                assert json.loads(resp.read()) == {"path": "/auth", "auth": None}
+        assert urlopen.call_count == 1
+        pool.close()
+
+    def test_redirect_loops_raise_http_error(self, server):
+        pool = build_dashboard.ConnectionPool()
+        with pytest.raises(urllib.error.HTTPError) as info:
+            pool.open(urllib.request.Request(f"{server}/redirect/302/%2Fredirect%2F302%2Fx"))
+        assert info.value.code == 302
+        pool.close()
+
+    def test_gh_get_uses_pool(self, server):
+        pool = build_dashboard.ConnectionPool()
+        with mock.patch.object(build_dashboard, "HTTP_POOL", pool), \
+             mock.patch.object(build_dashboard, "HTTP_CACHE", None), \
+             mock.patch.object(build_dashboard, "RATE_LIMIT", None), \
+             mock.patch.object(build_dashboard, "API_BASE", server):
+            assert build_dashboard._gh_get("/one", "tok") == {"path": "/one"}
+            assert build_dashboard._gh_get("/two", "tok") == {"path": "/two"}
+        pool.close()
+        assert pool.opened == 1
+
+
+class TestBakeMetrics:
+
+    def test_endpoint_class(self):
+        assert build_dashboard.endpoint_class(
+            "/repos/o/r/actions/workflows/a.yml/runs?per_page=1") == "workflow_runs"
+        assert build_dashboard.endpoint_class("/repos/o/r/actions/runs?per_page=30") == "repo_runs"
+        assert build_dashboard.endpoint_class("/graphql") == "graphql"
+        assert build_dashboard.endpoint_class("/rate_limit") == "other"
+
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert build_dashboard._percentile(values, 50) == 50
+        assert build_dashboard._percentile(values, 95) == 95
+        assert build_dashboard._percentile([], 95) == 0
+
+    def test_gh_get_records_call(self):
+        metrics = build_dashboard.BakeMetrics()
+        resp = TestHttpCache._FakeResponse('{"workflow_runs": []}',
+                                           {"X-RateLimit-Remaining": "4999"})
+        with mock.patch.object(build_dashboard, "BAKE_METRICS", metrics), \
+             mock.patch.object(build_dashboard, "HTTP_CACHE", None), \
+             mock.patch.object(build_dashboard, "HTTP_POOL", None), \
+             mock.patch.object(build_dashboard, "RATE_LIMIT", None), \
+             mock.patch("urllib.request.urlopen", return_value=resp):
+            build_dashboard._gh_get("/repos/o/r/actions/runs?per_page=30", "tok")
+
+        (call,) = metrics.calls
+        assert call["endpoint"] == "repo_runs"
+        assert call["repo"] == "o/r"
+        assert call["status"] == 200
+        assert call["bytes"] == len('{"workflow_runs": []}')
+        assert call["cache"] == "off"
+        assert call["ratelimit_remaining"] == "4999"
+        assert call["latency_ms"] >= 0
+
+    def test_summary_and_written_file(self, tmp_path):
+        metrics = build_dashboard.BakeMetrics()
+        for ms, path in [(100, "/repos/o/a/actions/runs"), (300, "/repos/o/b/actions/runs"),
+                         (50, "/repos/o/a/actions/workflows/x.yml/runs")]:
+            metrics.record({"path": path, "status": 200, "bytes": 10, "cache": "miss",
+                            "retries": 0, "ratelimit_remaining": None}, ms / 1000)
+        summary = metrics.summary()
+        assert summary["endpoints"]["repo_runs"]["calls"] == 2
+        assert summary["endpoints"]["repo_runs"]["max_ms"] == 300
+        assert summary["repos"]["o/a"]["calls"] == 2
+        assert "repo_runs" in metrics.table()
+
+        out = tmp_path / "bake-metrics.json"
+        with mock.patch.object(build_dashboard, "BAKE_METRICS", metrics):
+            build_dashboard.write_bake_metrics(str(out), {"baked_at": "2025-01-01T00:00:00Z"})
+        data = json.loads(out.read_text())
+        assert data["baked_at"] == "2025-01-01T00:00:00Z"
+        assert len(data["calls"]) == 3
+        assert "endpoints" in data["summary"]
+
+
+class TestRateLimitScheduler:
+
+    @staticmethod
+    def _budget(remaining, reserve=10):
+        budget = build_dashboard.RateLimitBudget(reserve=reserve, max_retries=2, backoff=0)
+        budget.update({"X-RateLimit-Remaining": str(remaining),
+                       "X-RateLimit-Limit": "5000",
+                       "X-RateLimit-Reset": "4102444800"})
+        return budget
+
+    def test_unknown_budget_allows_everything(self):
+        budget = build_dashboard.RateLimitBudget()
+        assert budget.acquire(2)
+
+    def test_reserve_only_admits_priority_zero(self):
+        budget = self._budget(5)
+        assert budget.acquire(0)
+        assert not budget.acquire(1)
+        assert not budget.acquire(2)
+        assert budget.skipped == 2
+
+    def test_exhausted_budget_blocks_all(self):
+        budget = self._budget(0)
+        assert not budget.acquire(0)
+
+    def test_update_keeps_lowest_remaining_in_window(self):
+        budget = self._budget(50)
+        budget.update({"X-RateLimit-Remaining": "60", "X-RateLimit-Reset": "4102444800"})
+        assert budget.remaining == 50
+
+    def test_run_calls_dispatches_by_priority(self):
+        order = []
+        calls = [
+            build_dashboard.BakeCall("p", "recent_branches", "", order.append, ("b",)),
+            build_dashboard.BakeCall("p", "panel_workflows", "x", order.append, ("p",)),
+            build_dashboard.BakeCall("p", "workflows", "x", order.append, ("w",)),
+        ]
+        with mock.patch.object(build_dashboard, "RATE_LIMIT", None):
+            build_dashboard.run_calls(calls, 1)
+        assert order == ["w", "p", "b"]
+
+    def test_bake_reuses_previous_snapshot_for_skipped(self, config):
+        proj = config["projects"][0]
+        cfg = dict(config, projects=[proj],
+                   bake={"max_workers": 1, "fetch_mode": "workflow", "rate_limit_reserve": 10})
+        panel_file = next(wf["file"] for c in proj["categories"] if c["type"] == "ci"
+                          for wf in c["workflows"])
+        previous = {"baked_at": "2025-01-01T00:00:00Z", "projects": {proj["id"]: {
+            "panel_workflows": {panel_file: {"conclusion": "success",
+                                             "updated_at": "2025-01-01T00:00:00Z",
+                                             "head_branch": "old"}},
+            "recent_branches": ["old-branch"],
+        }}}
+
+        def low_budget_gh_get(path, token):
+            build_dashboard.RATE_LIMIT.update({"X-RateLimit-Remaining": "3",
+                                               "X-RateLimit-Reset": "4102444800"})
+            return TestBakeDataStructure._mock_gh_get(path, token)
+
+        with mock.patch.object(build_dashboard, "_gh_get", side_effect=low_budget_gh_get):
+            result = build_dashboard.bake_ci_data(cfg, "fake-token", previous)
+
+        proj_data = result["projects"][proj["id"]]
+        assert len(proj_data["workflows"]) == len(proj["overview_workflows"])
+        assert proj_data["panel_workflows"] == previous["projects"][proj["id"]]["panel_workflows"]
+        assert proj_data["recent_branches"] == ["old-branch"]
+
+    def test_gh_get_retries_secondary_rate_limit(self):
+        attempts = []
+
+        def fake_urlopen(req, timeout=None):
+            attempts.append(req)
+            if len(attempts) == 1:
+                raise urllib.error.HTTPError(req.full_url, 403, "Forbidden",
+                                             {"Retry-After": "0"}, None)
+            return TestHttpCache._FakeResponse('{"ok": true}', {})
+
+        with mock.patch.object(build_dashboard, "RATE_LIMIT", self._budget(100)), \
+             mock.patch.object(build_dashboard, "HTTP_CACHE", None), \
+             mock.patch("urllib.request.urlopen", side_effect=fake_urlopen), \
+             mock.patch("time.sleep"):
+            assert build_dashboard._gh_get("/x", "tok") == {"ok": True}
+        assert len(attempts) == 2
+
+    def test_gh_get_primary_exhaustion_raises_rate_limited(self):
+        def fake_urlopen(req, timeout=None):
+            raise urllib.error.HTTPError(req.full_url, 403, "Forbidden",
+                                         {"X-RateLimit-Remaining": "0"}, None)
+
+        with mock.patch.object(build_dashboard, "RATE_LIMIT", self._budget(100)), \
+             mock.patch.object(build_dashboard, "HTTP_CACHE", None), \
+             mock.patch("urllib.request.urlopen", side_effect=fake_urlopen):
+            with pytest.raises(build_dashboard.RateLimited):
+                build_dashboard._gh_get("/x", "tok")
+
+    def test_graphql_retries_secondary_rate_limit_and_updates_budget(self):
+        attempts = []
+
+        def fake_urlopen(req, timeout=None):
+            attempts.append(req)
+            if len(attempts) == 1:
+                raise urllib.error.HTTPError(req.full_url, 403, "Forbidden",
+                                             {"Retry-After": "0"}, None)
+            return TestHttpCache._FakeResponse(
+                '{"data": {"r0": null}}',
+                {"X-RateLimit-Remaining": "40", "X-RateLimit-Reset": "4102444800"})
+
+        budget = self._budget(100)
+        with mock.patch.object(build_dashboard, "RATE_LIMIT", budget), \
+             mock.patch("urllib.request.urlopen", side_effect=fake_urlopen), \
+             mock.patch("time.sleep"):
+            assert build_dashboard._gh_graphql("query {}", "tok") == {"r0": None}
+        assert len(attempts) == 2
+        assert (budget.window("graphql").remaining, budget.charged, budget.retries) == (40, 2, 1)
+        assert budget.remaining == 100
+
+    def test_rest_and_graphql_budgets_are_tracked_apart(self):
+        budget = self._budget(4000)
+        budget.update({"X-RateLimit-Remaining": "3", "X-RateLimit-Limit": "5000",
+                       "X-RateLimit-Reset": "4102444800", "X-RateLimit-Resource": "graphql"})
+        budget.update({"X-RateLimit-Remaining": "3990", "X-RateLimit-Reset": "4102444800",
+                       "X-RateLimit-Resource": "core"})
+        assert (budget.remaining, budget.window("graphql").remaining) == (3990, 3)
+        assert budget.acquire(1)
+        assert not budget.acquire(1, "graphql")
+        assert budget.acquire(0, "graphql")
+        assert (budget.reserved, budget.window("graphql").reserved) == (1, 1)
+        assert "core 3990/5000" in budget.report() and "graphql 3/5000" in budget.report()
+
+    def test_bake_counts_only_dispatched_calls(self, config, capsys):
+        proj = config["projects"][0]
+        cfg = dict(config, projects=[proj],
+                   bake={"max_workers": 1, "fetch_mode": "workflow", "rate_limit_reserve": 10})
+        calls = build_dashboard.plan_project_calls(proj, "t", 2)
+
+        def low_budget_gh_get(path, token):
+            build_dashboard.RATE_LIMIT.update({"X-RateLimit-Remaining": "3",
+                                               "X-RateLimit-Reset": "4102444800"})
+            return TestBakeDataStructure._mock_gh_get(path, token)
+
+        with mock.patch.object(build_dashboard, "_gh_get", side_effect=low_budget_gh_get):
+            build_dashboard.bake_ci_data(cfg, "fake-token")
+        budget = build_dashboard.RATE_LIMIT
+        made = sum(c.section == "workflows" for c in calls)
+        assert (budget.dispatched, budget.skipped) == (made, len(calls) - made)
+        assert (f"Total API calls made: {made} ({len(calls) - made} skipped"
+                in capsys.readouterr().out)
+
+    def test_free_304_responses_give_their_budget_back(self):
+        budget = self._budget(12)
+
+        def not_modified(path, token):
+            exc = urllib.error.HTTPError(path, 304, "Not Modified",
+                                         {"X-RateLimit-Remaining": "12",
+                                          "X-RateLimit-Reset": "4102444800"}, None)
+            budget.update(exc.headers)
+            return {}
+
+        calls = [build_dashboard.BakeCall("p", "panel_workflows", str(i), not_modified, ("/x", "t"))
+                 for i in range(5)]
+        with mock.patch.object(build_dashboard, "RATE_LIMIT", budget):
+            results = build_dashboard.run_calls(calls, 1)
+        assert build_dashboard.SKIPPED not in results
+        assert (budget.remaining, budget.reserved, budget.skipped) == (12, 0, 0)
+
+    def test_load_previous_snapshot_from_html(self, config, tmp_path):
+        snap = {"baked_at": "2025-01-01T00:00:00Z", "projects": {"a": {"workflows": {}}}}
+        html = tmp_path / "index.html"
+        html.write_text("<script>\n" + build_dashboard.generate_js_config(config, snap) + "\n</script>")
+        assert build_dashboard.load_previous_snapshot(str(html)) == snap
+        assert build_dashboard.load_previous_snapshot(str(tmp_path / "missing.html")) is None
+
+    def test_load_previous_snapshot_follows_data_file(self, config, tmp_path):
+        snap = {"baked_at": "2025-01-01T00:00:00Z", "projects": {"a": {"workflows": {}}}}
+        html = tmp_path / "index.html"
+        html.write_text("<script>\n" + build_dashboard.generate_js_config(
+            config, snap, build_dashboard.DATA_FILE_NAME) + "\n</script>")
+        assert build_dashboard.load_previous_snapshot(str(html)) is None
+        build_dashboard.write_data_file(str(tmp_path), snap, build_dashboard.data_digest(snap))
+        assert build_dashboard.load_previous_snapshot(str(html))["projects"] == snap["projects"]
+
+
+class TestIncrementalBake:
+
+    @pytest.fixture
+    def one_project(self, config):
+        proj = config["projects"][0]
+        return dict(config, projects=[proj],
+                    bake={"max_workers": 1, "fetch_mode": "workflow", "max_age_minutes": 30})
+
+    def test_entries_record_fetched_at(self, one_project):
+        with mock.patch.object(build_dashboard, "_gh_get",
+                               side_effect=TestBakeDataStructure._mock_gh_get):
+            result = build_dashboard.bake_ci_data(one_project, "fake-token")
+        proj_data = next(iter(result["projects"].values()))
+        for section in ("workflows", "panel_workflows"):
+            for entry in proj_data[section].values():
+                assert entry["fetched_at"] == result["baked_at"]
+        assert proj_data["branches_fetched_at"] == result["baked_at"]
+
+    def test_incremental_refetches_only_stale_and_pending(self, one_project):
+        with mock.patch.object(build_dashboard, "_gh_get",
+                               side_effect=TestBakeDataStructure._mock_gh_get):
+            previous = build_dashboard.bake_ci_data(one_project, "fake-token")
+
+        proj_data = next(iter(previous["projects"].values()))
+        wf_files = list(proj_data["workflows"])
+        proj_data["workflows"][wf_files[0]]["fetched_at"] = "2000-01-01T00:00:00Z"
+        proj_data["workflows"][wf_files[1]]["conclusion"] = "in_progress"
+
+        with mock.patch.object(build_dashboard, "_gh_get",
+                               side_effect=TestBakeDataStructure._mock_gh_get) as m:
+            result = build_dashboard.bake_ci_data(one_project, "fake-token",
+                                                  previous, incremental=True)
+
+        assert m.call_count == 2
+        refetched = {c.args[0].split("/workflows/")[1].split("/")[0]
+                     for c in m.call_args_list}
+        assert refetched == {wf_files[0], wf_files[1]}
+        merged = next(iter(result["projects"].values()))
+        assert merged["workflows"][wf_files[1]]["conclusion"] == "success"
+        assert merged["workflows"][wf_files[2]] == proj_data["workflows"][wf_files[2]]
+        assert merged["recent_branches"] == proj_data["recent_branches"]
+
+    def test_incremental_without_timestamps_is_full_bake(self, one_project):
+        previous = {"baked_at": "2025-01-01T00:00:00Z", "projects": {
+            one_project["projects"][0]["id"]: {"workflows": {}, "recent_branches": ["x"]},
+        }}
+        with mock.patch.object(build_dashboard, "_gh_get",
+                               side_effect=TestBakeDataStructure._mock_gh_get) as m:
+            build_dashboard.bake_ci_data(one_project, "fake-token", previous, incremental=True)
+        plan = build_dashboard.plan_project_calls(one_project["projects"][0], "t", 4)
+        assert m.call_count == len(plan)
+
+
+class TestGraphqlBackend:
+    """GraphQL backend replayed against a recorded response (testviper, xradio)."""
+
+    FIXTURE = os.path.join(SCRIPT_DIR, "fixtures", "graphql_ci_status.json")
+
+    @pytest.fixture
+    def recorded(self):
+        with open(self.FIXTURE, encoding="utf-8") as fh:
+            return fh.read()
+
+    @pytest.fixture
+    def two_projects(self, config):
+        projects = [p for p in config["projects"] if p["id"] in ("testviper", "xradio")]
+        return dict(config, projects=projects,
+                    bake={"max_workers": 1, "fetch_mode": "graphql"})
+
+    def _urlopen(self, body, seen):
+        def fake_urlopen(req, timeout=None):
+            seen.append(req)
+            return TestHttpCache._FakeResponse(body, {})
+        return fake_urlopen
+
+    def test_query_aliases_every_repository(self, config):
+        query = build_dashboard.build_graphql_query(config["projects"])
+        for i, proj in enumerate(config["projects"]):
+            assert f'r{i}: repository(owner: "{proj["owner"]}", name: "{proj["repo"]}")' in query
+
+    def test_repo_to_runs_normalises_and_sorts(self, recorded):
+        runs = build_dashboard.graphql_repo_to_runs(json.loads(recorded)["data"]["r0"])
+        assert [r["updated_at"] for r in runs] == sorted(
+            (r["updated_at"] for r in runs), reverse=True)
+        assert runs[0]["head_branch"] == "feature-a"
+        allure = next(r for r in runs if r["path"].endswith("python-tests-allure-report.yml"))
+        assert allure["status"] == "in_progress" and allure["conclusion"] is None
+        assert len(runs) == 3, "suites without a workflowRun must be dropped"
+        assert all(r["path"] for r in runs)
+
+    def test_bake_graphql_single_round_trip(self, two_projects, recorded):
+        seen = []
+        with mock.patch("urllib.request.urlopen", side_effect=self._urlopen(recorded, seen)), \
+             mock.patch.object(build_dashboard, "_gh_get",
+                               side_effect=TestBakeDataStructure._mock_gh_get) as rest:
+            result = build_dashboard.bake_ci_data(two_projects, "fake-token")
+
+        assert len(seen) == 1 and seen[0].get_method() == "POST"
+        tv = result["projects"]["testviper"]
+        assert tv["workflows"]["integration_tests_linux.yml"]["conclusion"] == "success"
+        assert tv["workflows"]["python-tests-allure-report.yml"]["conclusion"] == "in_progress"
+        assert tv["panel_workflows"]["integration_tests_linux.yml"]["head_branch"] == "feature-a"
+        assert tv["recent_branches"] == ["feature-a"]
+        xr = result["projects"]["xradio"]
+        assert xr["workflows"]["python-testing-macos.yml"]["conclusion"] == "failure"
+        assert xr["recent_branches"] == ["docs-fix"]
+        # dispatch-receiver.yml (overview + panel) and four xradio panel
+        # workflows are not in the recorded window and fall back to REST.
+        assert rest.call_count == 6
+        assert "python-testing-casatools.yml" in xr["panel_workflows"]
+
+    def test_bake_graphql_matches_rest_shape(self, two_projects, recorded):
+        with mock.patch("urllib.request.urlopen", side_effect=self._urlopen(recorded, [])), \
+             mock.patch.object(build_dashboard, "_gh_get",
+                               side_effect=TestBakeDataStructure._mock_gh_get):
+            gql = build_dashboard.bake_ci_data(two_projects, "fake-token")
+        rest_cfg = dict(two_projects, bake={"max_workers": 1, "fetch_mode": "workflow"})
+        with mock.patch.object(build_dashboard, "_gh_get",
+                               side_effect=TestBakeDataStructure._mock_gh_get):
+            rest = build_dashboard.bake_ci_data(rest_cfg, "fake-token")
+
+        assert set(gql) == set(rest)
+        for pid, proj_data in rest["projects"].items():
+            assert set(gql["projects"][pid]) == set(proj_data)
+            for section in ("workflows", "panel_workflows"):
+                assert list(gql["projects"][pid][section]) == list(proj_data[section])
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 7. Config-to-output consistency
 # ═══════════════════════════════════════════════════════════════════════════
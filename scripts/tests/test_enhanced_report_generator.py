@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Tests for the component suite runner (scripts/enhanced_report_generator.py).
+
+Run with:  pytest scripts/tests/test_enhanced_report_generator.py -v
+
+Component suites are small pytest trees written to a temporary working
+directory, run the way the report pipeline runs them.  Skipped when the
+generator's dependencies (beautifulsoup4, allure-pytest, pytest-timeout,
+pytest-xdist) are not installed.
+
+These tests validate:
+  1. Scheduling: longest-first order, worker and thread planning, durations
+  2. Running suites concurrently with isolated outputs
+  3. Streaming suite output to logs and the console
+  4. Suite and per-test timeouts
+  5. pytest-xdist sharding inside a suite, balanced on recorded durations
+  6. Sharding across CI jobs and merging the shards' outputs
+"""
+
+import glob
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("bs4")
+pytest.importorskip("allure_pytest")
+pytest.importorskip("pytest_timeout")
+pytest.importorskip("xdist")
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+import enhanced_report_generator as erg  # noqa: E402
+import sharding  # noqa: E402
+
+
+def make_component(root, name, body):
+    """Write a one-file suite for *name* under *root* and return its config."""
+    tests = root / name / "tests"
+    tests.mkdir(parents=True)
+    (tests / f"test_{name}.py").write_text(textwrap.dedent(body))
+    return {'name': name, 'display_name': name, 'path': name, 'test_path': 'tests', 'icon': ''}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 1. Scheduling
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestScheduling:
+
+    def test_longest_first_with_unrecorded_suites_leading(self):
+        comps = [{'name': n} for n in ("a", "b", "c", "d")]
+        order = erg.order_longest_first(comps, {"a": 10, "b": 300, "d": 60})
+        assert [c['name'] for c in order] == ["c", "b", "d", "a"]
+
+    @pytest.mark.parametrize("n,workers,budget,expected", [
+        (5, None, 4, (1, 4)),    # default: one suite at a time, with every core
+        (2, 2, 8, (2, 4)),       # spare cores go to each suite's threads
+        (5, 8, 4, (4, 1)),       # never more suites than the budget
+        (5, 2, 8, (2, 4)),
+        (0, None, 4, (1, 4)),
+    ])
+    def test_plan_workers(self, n, workers, budget, expected):
+        assert erg.plan_workers(n, workers, budget) == expected
+
+    def test_durations_merge_and_skip_suites_that_did_not_run(self, tmp_path):
+        path = str(tmp_path / "d" / "suite-durations.json")
+        assert erg.load_suite_durations(path) == {}
+        erg.save_suite_durations([{'name': 'a', 'returncode': 0, 'duration': 12.34},
+                                  {'name': 'b', 'returncode': 1, 'duration': 5}], path)
+        erg.save_suite_durations([{'name': 'a', 'returncode': None, 'duration': 0.0},
+                                  {'name': 'c', 'returncode': 0, 'duration': 7}], path)
+        assert erg.load_suite_durations(path) == {'a': 12.3, 'b': 5.0, 'c': 7.0}
+
+    def test_unreadable_durations_are_ignored(self, tmp_path):
+        path = tmp_path / "suite-durations.json"
+        path.write_text("[1, 2]")
+        assert erg.load_suite_durations(str(path)) == {}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 2. Concurrent runs
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestConcurrentRuns:
+
+    SUITE = """
+        import json, os, time
+
+        def test_sleep():
+            start = time.time()
+            time.sleep(1.5)
+            with open(os.environ["SPAN_FILE"], "a") as f:
+                f.write(json.dumps([start, time.time(), os.environ.get("OMP_NUM_THREADS")]) + "\\n")
+            assert {ok}
+    """
+
+    def test_suites_overlap_and_keep_separate_outputs(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("SPAN_FILE", str(tmp_path / "spans.jsonl"))
+        monkeypatch.delenv("OMP_NUM_THREADS", raising=False)
+        comps = [make_component(tmp_path, "good", self.SUITE.format(ok=True)),
+                 make_component(tmp_path, "bad", self.SUITE.format(ok=False))]
+        done = []
+        outcomes = erg.run_component_suites(comps, workers=2, threads=3,
+                                            on_done=lambda c, o: done.append(c['name']))
+
+        assert sorted(done) == ["bad", "good"]
+        assert {o['name']: o['returncode'] for o in outcomes} == {"good": 0, "bad": 1}
+        assert all(o['duration'] >= 1.5 for o in outcomes)
+        (s1, e1, t1), (s2, e2, t2) = [json.loads(l) for l in open("spans.jsonl")]
+        assert s1 < e2 and s2 < e1, "suites ran one after another"
+        assert t1 == t2 == "3"
+        for name in ("good", "bad"):
+            results = os.listdir(f"allure-results-{name}")
+            assert any(f.endswith("-result.json") for f in results)
+            assert os.path.isfile(f"tests/{name}-pytest-report.xml")
+
+    def test_missing_test_directory_is_reported_not_run(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        comp = {'name': 'gone', 'display_name': 'gone', 'path': 'gone', 'test_path': 'tests'}
+        [outcome] = erg.run_component_suites([comp], workers=1)
+        assert outcome['returncode'] is None
+        assert os.path.isfile("allure-results-gone/minimal-test-result.json")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 3. Streaming output
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestStreamingOutput:
+
+    @staticmethod
+    def _stream(tmp_path, code, echo=False):
+        process = subprocess.Popen([sys.executable, "-u", "-c", textwrap.dedent(code)],
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        logger = erg.open_suite_log("demo", str(tmp_path))
+        try:
+            return erg.stream_suite_output(process, "demo", logger, echo)
+        finally:
+            erg.close_suite_log(logger)
+
+    def test_log_gets_everything_and_memory_only_the_tail(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(erg, "TAIL_LINES", 5)
+        tail = self._stream(tmp_path, """
+            import sys
+            for i in range(100):
+                print(f"line {i}")
+            print("oops", file=sys.stderr)
+        """)
+        assert tail == ["line 96", "line 97", "line 98", "line 99", "oops"]
+        log = (tmp_path / "demo-pytest.log").read_text().splitlines()
+        assert log == [f"line {i}" for i in range(100)] + ["oops"]
+
+    def test_logs_rotate_and_start_fresh(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(erg, "LOG_MAX_BYTES", 200)
+        (tmp_path / "demo-pytest.log.3").write_text("previous run")
+        self._stream(tmp_path, "for i in range(100): print('x' * 20)")
+        names = sorted(os.listdir(tmp_path))
+        assert names == ["demo-pytest.log"] + [f"demo-pytest.log.{i}" for i in (1, 2, 3)]
+        assert "previous run" not in (tmp_path / "demo-pytest.log.3").read_text()
+        assert all(os.path.getsize(tmp_path / n) <= 200 for n in names)
+
+    def test_echo_and_progress_while_silent(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(erg, "PROGRESS_INTERVAL", 0.2)
+        self._stream(tmp_path, """
+            import time
+            print("tests/test_a.py::test_one PASSED      [ 50%]")
+            print("tests/test_a.py::test_two FAILED      [100%]")
+            time.sleep(0.7)
+        """, echo=True)
+        out = capsys.readouterr().out.splitlines()
+        assert out[:2] == ["[demo] tests/test_a.py::test_one PASSED      [ 50%]",
+                           "[demo] tests/test_a.py::test_two FAILED      [100%]"]
+        assert any(line.startswith("[demo] 2 tests done (100%), 1 failed; last output")
+                   for line in out[2:])
+
+    def test_suite_run_writes_its_log(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        comp = make_component(tmp_path, "logged", """
+            def test_ok():
+                print("hello from the suite")
+        """)
+        [outcome] = erg.run_component_suites([comp], workers=1, log_dir="logs")
+        assert outcome['returncode'] == 0
+        assert "test_ok PASSED" in (tmp_path / "logs" / "logged-pytest.log").read_text()
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 4. Timeouts
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestTimeouts:
+
+    def test_hung_suite_is_stopped_with_a_stack_dump(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(erg, "STACK_DUMP_WAIT", 1)
+        comp = make_component(tmp_path, "hangs", """
+            import threading, time
+
+            def helper_loop():
+                while True:
+                    time.sleep(0.1)
+
+            def test_hang():
+                threading.Thread(target=helper_loop, daemon=True).start()
+                time.sleep(600)
+        """)
+        comp.update(suite_timeout=3 / 60, test_timeout=0)
+        (tmp_path / "tests").mkdir()   # where the fallback JUnit file goes, as in the repo
+        [outcome] = erg.run_component_suites([comp], workers=1, log_dir="logs")
+
+        assert outcome['timed_out'] and outcome['returncode'] != 0
+        assert outcome['duration'] < 30
+        with open("allure-results-hangs/minimal-test-result.json") as f:
+            result = json.load(f)
+        assert result["status"] == "broken"
+        assert result["statusDetails"]["message"] == "Tests timed out after 0.05 minutes"
+        trace = result["statusDetails"]["trace"]
+        assert "in test_hang" in trace and "in helper_loop" in trace
+        assert "timed out" in open("tests/hangs-pytest-report.xml").read()
+        assert "in helper_loop" in open("logs/hangs-pytest.log").read()
+
+    def test_slow_test_fails_and_the_suite_goes_on(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        comp = make_component(tmp_path, "slow", """
+            import time
+
+            def test_slow():
+                time.sleep(30)
+
+            def test_after():
+                pass
+        """)
+        comp.update(test_timeout=1)
+        [outcome] = erg.run_component_suites([comp], workers=1)
+
+        assert outcome['returncode'] == 1 and not outcome['timed_out']
+        statuses = {}
+        for path in glob.glob("allure-results-slow/*-result.json"):
+            with open(path) as f:
+                result = json.load(f)
+            statuses[result["name"]] = (result["status"], result["statusDetails"].get("message", "")
+                                        if "statusDetails" in result else "")
+        assert statuses["test_after"][0] == "passed"
+        assert statuses["test_slow"][0] == "failed"
+        assert "Timeout" in statuses["test_slow"][1]
+
+    def test_timeout_settings(self):
+        comps = [{'name': 'a'}, {'name': 'b'}]
+        erg.apply_timeouts(comps, 'suite_timeout', [('b', 90.0), (None, 30.0)])
+        assert [c['suite_timeout'] for c in comps] == [30.0, 90.0]
+        args = erg.parse_args(["--suite-timeout", "xradio=120", "--test-timeout", "0"])
+        assert args.suite_timeout == [("xradio", 120.0)] and args.test_timeout == [(None, 0.0)]
+        with pytest.raises(SystemExit):
+            erg.parse_args(["--suite-timeout", "nosuch=5"])
+        with pytest.raises(SystemExit):
+            erg.parse_args(["--test-timeout", "soon"])
+
+    @pytest.mark.parametrize("key, option, env_var", [
+        ("suite_timeout", "--suite-timeout", erg.SUITE_TIMEOUT_ENV),
+        ("test_timeout", "--test-timeout", erg.TEST_TIMEOUT_ENV),
+    ])
+    def test_no_limits_unless_asked(self, monkeypatch, key, option, env_var):
+        monkeypatch.delenv(erg.SUITE_TIMEOUT_ENV, raising=False)
+        monkeypatch.delenv(erg.TEST_TIMEOUT_ENV, raising=False)
+        assert erg.DEFAULT_SUITE_TIMEOUT == 0 and erg.DEFAULT_TEST_TIMEOUT == 0
+        assert getattr(erg.parse_args([]), key) is None
+        monkeypatch.setenv(env_var, "45")
+        assert getattr(erg.parse_args([]), key) == [(None, 45.0)]
+        assert getattr(erg.parse_args([option, "90"]), key) == [(None, 90.0)]
+        monkeypatch.setenv(env_var, "soon")
+        with pytest.raises(SystemExit):
+            erg.parse_args([])
+
+    def test_no_per_test_limit_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        comp = make_component(tmp_path, "plain", "def test_only():\n    pass\n")
+        commands = []
+        real_popen = subprocess.Popen
+        monkeypatch.setattr(subprocess, "Popen",
+                            lambda cmd, **kw: commands.append(cmd) or real_popen(cmd, **kw))
+        erg.run_component_suites([comp], workers=1)
+        assert not any(arg.startswith("--timeout") for arg in commands[0])
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 5. Sharding inside a suite
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSharding:
+
+    SUITE = """
+        import pytest
+
+        class TestGroup:
+            @pytest.mark.parametrize("n", [1, 2])
+            def test_param(self, n):
+                pass
+
+        def test_plain():
+            pass
+
+        def test_fails():
+            assert False
+    """
+
+    def test_xdist_run_merges_results_and_records_durations(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        comp = make_component(tmp_path, "sharded", self.SUITE)
+        [outcome] = erg.run_component_suites([comp], workers=1, threads=2, test_workers="auto",
+                                             log_dir="logs")
+
+        assert outcome['returncode'] == 1
+        assert "[gw1]" in open("logs/sharded-pytest.log").read()
+        results = glob.glob("allure-results-sharded/*-result.json")
+        assert len(results) == 4
+        junit = open("tests/sharded-pytest-report.xml").read()
+        assert junit.count("<testcase ") == 4
+        recorded = sharding.load_durations("gh-pages/main/test-durations/sharded-tests.json")
+        assert set(recorded) == {sharding.item_test_id(f"sharded/tests/test_sharded.py::{name}") for name in
+                                 ("TestGroup::test_param[1]", "TestGroup::test_param[2]",
+                                  "test_plain", "test_fails")}
+
+    def test_longest_recorded_tests_are_collected_first(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        make_component(tmp_path, "ordered", self.SUITE)
+        ids = ["ordered/tests/test_ordered.py::" + name for name in
+               ("TestGroup::test_param[1]", "TestGroup::test_param[2]", "test_plain", "test_fails")]
+        with open("durations.json", "w") as f:
+            json.dump({sharding.item_test_id(ids[2]): 9.0, sharding.item_test_id(ids[1]): 1.0,
+                       sharding.item_test_id(ids[0]): 0.1}, f)
+        proc = subprocess.run(
+            [sys.executable, "-m", "pytest", "ordered", "--collect-only", "-q", "-p", "sharding",
+             "--test-durations=durations.json"],
+            capture_output=True, text=True,
+            env=dict(os.environ, PYTHONPATH=os.path.dirname(SCRIPT_DIR)))
+        collected = [line for line in proc.stdout.splitlines() if "::" in line]
+        # test_fails has no record and counts as the median (1.0); ties keep their order
+        assert collected == [ids[2], ids[1], ids[3], ids[0]]
+
+    def test_item_ids_match_junit_names(self):
+        assert sharding.item_test_id("tests/sub/test_a.py::TestX::test_y[a/b::c]") == \
+            "tests.sub.test_a.TestX::test_y[a/b::c]"
+        assert sharding.item_test_id("test_a.py::test_y") == "test_a::test_y"
+
+    def test_hung_worker_dumps_its_stack(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(erg, "STACK_DUMP_WAIT", 1)
+        (tmp_path / "tests").mkdir()
+        comp = make_component(tmp_path, "hangs", """
+            import time
+
+            def test_hang_in_worker():
+                time.sleep(600)
+        """)
+        comp.update(suite_timeout=6 / 60, test_timeout=0)
+        [outcome] = erg.run_component_suites([comp], workers=1, test_workers=1, log_dir="logs")
+
+        assert outcome['timed_out']
+        with open("allure-results-hangs/minimal-test-result.json") as f:
+            assert "in test_hang_in_worker" in json.load(f)["statusDetails"]["trace"]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 6. Sharding across CI jobs
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestCrossJobShards:
+
+    SUITE = """
+        import pytest
+
+        @pytest.mark.parametrize("n", range(7))
+        def test_many(n):
+            assert n != 3
+    """
+
+    def test_partition_is_balanced_and_complete(self):
+        items = [SimpleNamespace(nodeid=f"t.py::test_{i}") for i in range(10)]
+        durations = {f"t::test_{i}": float(i) for i in range(8)}   # 8, 9 count as the median
+        bins = sharding.partition(items, durations, 3)
+        assert sorted(i.nodeid for b in bins for i in b) == sorted(i.nodeid for i in items)
+        loads = [sum(durations.get(sharding.item_test_id(i.nodeid), 4.0) for i in b) for b in bins]
+        assert max(loads) - min(loads) <= 1
+        assert bins == sharding.partition(list(reversed(items)), durations, 3)
+
+    def test_parse_shard(self):
+        assert sharding.parse_shard("2/3") == (2, 3)
+        for bad in ("0/3", "4/3", "x", "1/"):
+            with pytest.raises(ValueError):
+                sharding.parse_shard(bad)
+
+    def test_shards_cover_the_suite_once_and_merge(self, tmp_path, monkeypatch):
+        make_component(tmp_path / "src", "many", self.SUITE)
+        comp = {'name': 'many', 'display_name': 'Many', 'path': str(tmp_path / "src" / "many"),
+                'test_path': 'tests', 'icon': ''}
+        monkeypatch.setattr(erg, "COMPONENTS", [comp])
+        ran = []
+        for i in (1, 2):
+            (tmp_path / f"shard{i}").mkdir()
+            monkeypatch.chdir(tmp_path / f"shard{i}")
+            erg.main(["--shard", f"{i}/2", "--workers", "1", "--log-dir", "logs"])
+            cases = ET.parse("tests/many-pytest-report.xml").iter("testcase")
+            ran.append({case.get("name") for case in cases})
+            assert not os.path.exists("allure-report/many")
+        assert not ran[0] & ran[1]
+        assert ran[0] | ran[1] == {f"test_many[{n}]" for n in range(7)}
+
+        (tmp_path / "merged").mkdir()
+        monkeypatch.chdir(tmp_path / "merged")
+        reported = []
+        monkeypatch.setattr(erg, "generate_allure_report", lambda c: reported.append(c['name']))
+        erg.main(["--merge-shards", "../shard1", "../shard2"])
+
+        assert reported == ["many"]
+        junit = open("tests/many-pytest-report.xml").read()
+        assert junit.count("<testcase ") == 7 and 'tests="7"' in junit and 'failures="1"' in junit
+        assert len(glob.glob("allure-results-many/*-result.json")) == 7
+        assert sorted(open("subprocess_return_code.txt").read().split()) == ["0", "1"]
+        assert len(sharding.load_durations("gh-pages/main/test-durations/many-tests.json")) == 7
+        shard_seconds = [erg.load_suite_durations(f"../shard{i}/{erg.SHARD_DURATIONS_FILE}")["many"]
+                         for i in (1, 2)]
+        assert erg.load_suite_durations() == {"many": pytest.approx(sum(shard_seconds), abs=0.1)}
+
+    def test_merge_fails_without_every_shard(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(erg, "COMPONENTS", [])
+        for i in (1, 2, 3):
+            (tmp_path / f"shard-{i}").mkdir()
+        for i in (1, 2):
+            (tmp_path / f"shard-{i}" / "subprocess_return_code.txt").write_text("0\n")
+        with pytest.raises(SystemExit, match=r"expected 3 finished shards, got 2 \(incomplete: shard-3\)"):
+            erg.main(["--merge-shards", "shard-1", "shard-2", "shard-3", "--shard-count", "3"])
+        with pytest.raises(SystemExit, match="expected 3 finished shards, got 2$"):
+            erg.main(["--merge-shards", "shard-1", "shard-2", "--shard-count", "3"])
+        assert not os.path.exists("subprocess_return_code.txt")
+        erg.main(["--merge-shards", "shard-1", "shard-2", "--shard-count", "2"])
+        assert open("subprocess_return_code.txt").read() == "0\n0\n"
+
+    def test_empty_shard_is_not_a_failure(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        comp = make_component(tmp_path, "tiny", "def test_only():\n    pass\n")
+        [outcome] = erg.run_component_suites([comp], workers=1, shard="2/2")
+        assert outcome['returncode'] == 0
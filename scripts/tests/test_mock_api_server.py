@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Tests for the local GitHub/Codecov API stand-in.
+
+Run with:  pytest scripts/tests/test_mock_api_server.py -v
+
+These tests validate:
+  1. Whitelist parity with ci/cloudflare/worker.js
+  2. Replay semantics (pagination, filtering, ETags, rate limits, failures)
+  3. End-to-end bakes of build_dashboard.py against the mock
+"""
+
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import pytest
+import yaml
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(SCRIPT_DIR)
+
+sys.path.insert(0, SCRIPTS_DIR)
+import build_dashboard  # noqa: E402
+import mock_api_server  # noqa: E402
+
+
+# ── Fixtures ──────────────────────────────────────────────────────────────
+
+@pytest.fixture(scope="module")
+def recordings():
+    return mock_api_server.load_recordings(mock_api_server.DEFAULT_RECORDINGS)
+
+
+@pytest.fixture
+def serve(recordings):
+    """Start a mock server; returns (base_url, api) for the given options."""
+    servers = []
+
+    def start(**options):
+        api = mock_api_server.MockApi(recordings, **options)
+        server = mock_api_server.make_server(api, port=0)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}", api
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def get(url, headers=None):
+    """GET *url*; returns (status, headers, parsed JSON or None)."""
+    req = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, resp.headers, json.loads(resp.read() or "null")
+    except urllib.error.HTTPError as exc:
+        body = exc.read()
+        return exc.code, exc.headers, json.loads(body) if body else None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 1. Whitelist parity
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestWhitelist:
+
+    def test_patterns_are_read_from_worker(self):
+        whitelist = mock_api_server.load_worker_whitelist()
+        assert len(whitelist["github"]) == 2
+        assert len(whitelist["codecov"]) == 1
+        assert any(p.search("/repos/casangi/xradio/actions/runs") for p in whitelist["github"])
+        assert not any(p.search("/repos/other/xradio/actions/runs") for p in whitelist["github"])
+
+    @pytest.mark.parametrize("path", [
+        "/repos/casangi/xradio/issues",
+        "/github/repos/casangi/xradio/contents/README.md",
+        "/codecov/api/v2/github/casangi/repos/xradio/commits/",
+    ])
+    def test_paths_outside_the_whitelist_are_refused(self, serve, path):
+        base, _ = serve()
+        status, _, body = get(base + path)
+        assert status == 403
+        assert body == {"error": "Path not allowed"}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 2. Replay semantics
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestReplay:
+
+    RUNS = "/repos/casangi/xradio/actions/runs"
+
+    def test_pagination_and_link_header(self, serve, recordings):
+        base, _ = serve()
+        total = len(recordings["github"][self.RUNS]["workflow_runs"])
+        status, headers, body = get(base + self.RUNS + "?per_page=15")
+        assert status == 200
+        assert body["total_count"] == total
+        assert len(body["workflow_runs"]) == 15
+        assert 'rel="next"' in headers["Link"] and "page=2" in headers["Link"]
+
+        last = -(-total // 15)
+        _, headers, body = get(base + self.RUNS + f"?per_page=15&page={last}")
+        assert len(body["workflow_runs"]) == total - 15 * (last - 1)
+        assert 'rel="next"' not in headers["Link"] and 'rel="prev"' in headers["Link"]
+
+    @pytest.mark.parametrize("query", ["per_page=abc", "page=2.5", "per_page=10&page=x1"])
+    def test_non_numeric_paging_is_422(self, serve, query):
+        base, api = serve()
+        status, headers, body = get(base + self.RUNS + "?" + query)
+        assert status == 422
+        assert "Invalid value for parameter" in body["message"]
+        assert "X-RateLimit-Remaining" in headers
+        assert get(base + self.RUNS + "?per_page=0")[0] == 200   # server still answers
+        assert api.snapshot()["stats"]["422"] == 1
+
+    def test_workflow_runs_are_derived_and_filtered(self, serve, recordings):
+        base, _ = serve()
+        path = "/repos/casangi/xradio/actions/workflows/python-testing-linux.yml/runs"
+        _, _, body = get(base + path + "?branch=main&per_page=1")
+        expected = next(r for r in recordings["github"][self.RUNS]["workflow_runs"]
+                        if r["path"].endswith("/python-testing-linux.yml")
+                        and r["head_branch"] == "main")
+        assert body["workflow_runs"] == [expected]
+
+    def test_worker_layout_and_codecov(self, serve):
+        base, _ = serve()
+        status, headers, body = get(base + "/github" + self.RUNS + "?per_page=1")
+        assert status == 200 and headers["Access-Control-Allow-Origin"] == "*"
+        assert headers["Link"].startswith(f"<{base}/github{self.RUNS}?")
+        status, headers, body = get(base + "/codecov/api/v2/github/casangi/repos/xradio/")
+        assert status == 200 and body["totals"]["coverage"] == 84.29
+        assert "X-RateLimit-Remaining" not in headers
+
+    def test_etag_revalidation_is_free(self, serve):
+        base, api = serve(rate_limit=10)
+        _, headers, _ = get(base + self.RUNS)
+        assert headers["X-RateLimit-Remaining"] == "9"
+        status, headers, body = get(base + self.RUNS, {"If-None-Match": headers["ETag"]})
+        assert status == 304 and body is None
+        assert headers["X-RateLimit-Remaining"] == "9"
+        assert api.snapshot()["stats"]["304"] == 1
+
+    def test_primary_rate_limit(self, serve):
+        base, _ = serve(rate_limit=2)
+        assert [get(base + self.RUNS)[0] for _ in range(3)] == [200, 200, 403]
+        _, headers, body = get(base + self.RUNS)
+        assert headers["X-RateLimit-Remaining"] == "0"
+        assert "rate limit" in body["message"]
+
+    def test_injected_secondary_limit(self, serve):
+        base, api = serve(fail_rate=1.0)
+        status, headers, body = get(base + self.RUNS)
+        assert status == 403 and headers["Retry-After"] == "1"
+        assert "secondary rate limit" in body["message"]
+        assert api.remaining == api.limit
+
+    def test_unrecorded_path_is_404(self, serve):
+        base, _ = serve()
+        assert get(base + "/repos/casangi/unknown/actions/runs")[0] == 404
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 3. End-to-end bake
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestBakeAgainstMock:
+
+    @pytest.fixture
+    def bake_config(self):
+        with open(build_dashboard.CONFIG_PATH, encoding="utf-8") as fh:
+            config = yaml.safe_load(fh)
+        projects = [p for p in config["projects"] if p["id"] in ("testviper", "xradio")]
+        return dict(config, projects=projects, bake={"max_workers": 4})
+
+    def _bake(self, base, config, tmp_path):
+        cache = build_dashboard.HttpCache(str(tmp_path / "http"))
+        with mock.patch.object(build_dashboard, "API_BASE", base), \
+             mock.patch.object(build_dashboard, "HTTP_CACHE", cache), \
+             mock.patch.object(build_dashboard, "HTTP_POOL", None):
+            return build_dashboard.bake_ci_data(config, "dummy-token"), cache
+
+    @pytest.mark.parametrize("fetch_mode", ["workflow", "repo"])
+    def test_bake_matches_recordings(self, serve, recordings, bake_config, tmp_path,
+                                     fetch_mode):
+        base, _ = serve()
+        bake_config["bake"]["fetch_mode"] = fetch_mode
+        payload, _ = self._bake(base, bake_config, tmp_path)
+        runs = recordings["github"]["/repos/casangi/testviper/actions/runs"]["workflow_runs"]
+        expected = next(r for r in runs if r["path"].endswith("/integration_tests_linux.yml")
+                        and r["head_branch"] == "main")
+        entry = payload["projects"]["testviper"]["workflows"]["integration_tests_linux.yml"]
+        assert entry["conclusion"] == expected["conclusion"]
+        assert entry["updated_at"] == expected["updated_at"]
+        assert payload["projects"]["testviper"]["recent_branches"] == ["feature-a", "fix-b",
+                                                                       "docs-c"]
+
+    def test_second_bake_is_served_from_304s(self, serve, bake_config, tmp_path):
+        base, api = serve()
+        first, _ = self._bake(base, bake_config, tmp_path)
+        charged = api.limit - api.remaining
+        second, cache = self._bake(base, bake_config, tmp_path)
+        assert api.limit - api.remaining == charged
+        assert cache.hits == charged
+        assert second["projects"] == first["projects"]
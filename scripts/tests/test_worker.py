@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Tests for the Cloudflare Worker proxy (ci/cloudflare/worker.js).
+
+Run with:  pytest scripts/tests/test_worker.py -v
+
+The Worker is executed under node against a stubbed upstream: ``fetch`` is
+answered from an ``UPSTREAM`` table keyed by URL (honouring ``etag`` with
+304s) and every upstream call is recorded in ``upstreamCalls``.  The
+runtime's ``caches.default``, ``ctx.waitUntil`` and a ``CI_SNAPSHOT`` KV
+namespace are stood in for, and ``advance(seconds)`` moves the Worker's
+clock.  With an upstream *base* URL, GitHub calls go to that server (e.g.
+scripts/mock_api_server.py) instead.  Skipped when node is not installed.
+
+These tests validate:
+  1. The single-path proxy routes and their whitelist
+  2. The /batch status route
+  3. Edge caching
+  4. Field projection
+  5. The scheduled snapshot and /snapshot
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+import threading
+from unittest import mock
+from urllib.parse import parse_qs, quote, urlsplit
+
+import pytest
+import yaml
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT  = os.path.normpath(os.path.join(SCRIPT_DIR, "..", ".."))
+WORKER_JS  = os.path.join(REPO_ROOT, "ci", "cloudflare", "worker.js")
+
+sys.path.insert(0, os.path.dirname(SCRIPT_DIR))
+import build_dashboard  # noqa: E402
+import mock_api_server  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not shutil.which("node"), reason="node not installed")
+
+GH = "https://api.github.com"
+
+HARNESS = textwrap.dedent("""\
+    const UPSTREAM = __UPSTREAM__;
+    const UPSTREAM_BASE = __UPSTREAM_BASE__;
+    const upstreamCalls = [];
+    const realFetch = globalThis.fetch;
+    globalThis.fetch = async (input, init = {}) => {
+      const url = typeof input === 'string' ? input : input.url;
+      const hit = UPSTREAM[url];
+      const conditional = (init.headers || {})['If-None-Match'];
+      upstreamCalls.push(conditional ? url + ' if-none-match' : url);
+      if (UPSTREAM_BASE) return realFetch(url.replace('https://api.github.com', UPSTREAM_BASE), init);
+      if (!hit) return new Response('{"message":"Not Found"}', { status: 404 });
+      const headers = { 'Content-Type': 'application/json', ...(hit.headers || {}) };
+      if (hit.etag) {
+        headers.ETag = hit.etag;
+        if (conditional === hit.etag) return new Response(null, { status: 304, headers });
+      }
+      return new Response(JSON.stringify(hit.body), { status: hit.status || 200, headers });
+    };
+
+    let NOW = Date.now();
+    Date.now = () => NOW;
+    const advance = seconds => { NOW += seconds * 1000; };
+
+    const cacheStore = new Map();
+    globalThis.caches = { default: {
+      async match(key) {
+        const e = cacheStore.get(String(key));
+        return e && new Response(e.body, { status: e.status, headers: e.headers });
+      },
+      async put(key, resp) {
+        cacheStore.set(String(key), { status: resp.status, body: await resp.text(),
+                                      headers: Object.fromEntries(resp.headers) });
+      },
+    } };
+
+    const pending = [];
+    const ctx = { waitUntil: p => pending.push(p) };
+    const settle = () => Promise.all(pending.splice(0));
+
+    const kvStore = new Map();
+    const KV = {
+      async get(key, type) {
+        const value = kvStore.has(key) ? kvStore.get(key) : null;
+        return value !== null && type === 'json' ? JSON.parse(value) : value;
+      },
+      async put(key, value) { kvStore.set(key, String(value)); },
+    };
+
+    const ENV = { GITHUB_TOKEN: 'test-token', CI_SNAPSHOT: KV };
+    const { default: worker } = await import(__WORKER__);
+
+    async function request(path, env = ENV) {
+      const resp = await worker.fetch(new Request('https://worker.test' + path), env, ctx);
+      const text = await resp.text();
+      return { status: resp.status, headers: Object.fromEntries(resp.headers),
+               body: text ? JSON.parse(text) : null };
+    }
+""")
+
+
+def run_worker(tmp_path, script: str, upstream: dict | None = None, base: str = "") -> list:
+    """Run *script* against worker.js under node; returns what it logs, parsed as JSON."""
+    # worker.js is an ES module without a package.json; an .mjs copy makes
+    # node load it as one.
+    module = tmp_path / "worker.mjs"
+    shutil.copyfile(WORKER_JS, module)
+    harness = (HARNESS.replace("__UPSTREAM__", json.dumps(upstream or {}))
+                      .replace("__UPSTREAM_BASE__", json.dumps(base))
+                      .replace("__WORKER__", json.dumps(module.as_uri())))
+    entry = tmp_path / "run.mjs"
+    entry.write_text(harness + textwrap.dedent(script), encoding="utf-8")
+    proc = subprocess.run(["node", str(entry)], capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    return [json.loads(line) for line in proc.stdout.splitlines()]
+
+
+def runs(*entries):
+    return {"total_count": len(entries), "workflow_runs": [
+        {"name": "ci", "status": "completed", "conclusion": conclusion,
+         "head_branch": branch, "updated_at": updated}
+        for conclusion, branch, updated in entries]}
+
+
+def batch_path(items) -> str:
+    return "/batch?q=" + quote(json.dumps(items))
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 1. Single-path proxy
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestProxy:
+
+    def test_whitelisted_github_path_is_forwarded(self, tmp_path):
+        path = "/repos/casangi/xradio/actions/runs?per_page=1"
+        upstream = {GH + path: {"body": runs(("success", "main", "2025-01-01T00:00:00Z")),
+                                "headers": {"X-RateLimit-Remaining": "4999"}}}
+        out = run_worker(tmp_path, f"""
+            const r = await request('/github{path}');
+            console.log(JSON.stringify([r.status, r.headers['x-ratelimit-remaining'],
+                                        r.body.total_count, upstreamCalls]));
+        """, upstream)
+        assert out == [[200, "4999", 1, [GH + path]]]
+
+    @pytest.mark.parametrize("path", [
+        "/github/repos/casangi/xradio/issues",
+        "/github/repos/other/xradio/actions/runs",
+        "/codecov/api/v2/github/casangi/repos/xradio/commits/",
+        "/github/repos/casangi/xradio/actions/runs/%2e%2e/%2e%2e/%2e%2e/%2e%2e/user",
+        "/github/repos/casangi/xradio/actions/runs/%252e%252e/user",
+    ])
+    def test_other_paths_are_refused(self, tmp_path, path):
+        out = run_worker(tmp_path, f"""
+            const r = await request('{path}');
+            console.log(JSON.stringify([r.status, r.body, upstreamCalls.length]));
+        """)
+        assert out == [[403, {"error": "Path not allowed"}, 0]]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 2. /batch
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestBatch:
+
+    LINUX = "/repos/casangi/xradio/actions/workflows/linux.yml/runs?branch=main&per_page=1"
+    MACOS = "/repos/casangi/xradio/actions/workflows/macos.yml/runs?branch=main&per_page=1"
+    RUNS  = "/repos/casangi/xradio/actions/runs?per_page=30"
+
+    @pytest.fixture
+    def upstream(self):
+        return {
+            GH + self.LINUX: {"body": runs(("success", "main", "2025-01-02T00:00:00Z")),
+                              "headers": {"X-RateLimit-Remaining": "4990"}},
+            GH + self.MACOS: {"body": runs((None, "main", "2025-01-03T00:00:00Z")),
+                              "headers": {"X-RateLimit-Remaining": "4989"}},
+            GH + self.RUNS:  {"body": runs(("success", "main", "t"), ("failure", "feat", "t"),
+                                           ("success", "feat", "t"), ("success", "fix", "t"))},
+        }
+
+    def test_response_is_shaped_like_the_baked_payload(self, tmp_path, upstream):
+        path = batch_path([{"id": "xradio", "repo": "casangi/xradio",
+                            "workflows": ["linux.yml", "macos.yml"], "branches": 4}])
+        out = run_worker(tmp_path, f"""
+            const r = await request({json.dumps(path)});
+            console.log(JSON.stringify([r.status, r.headers['x-ratelimit-remaining'], r.body]));
+            console.log(JSON.stringify(upstreamCalls.sort()));
+        """, upstream)
+        status, remaining, body = out[0]
+        assert status == 200 and remaining == "4989"
+        assert body["baked_at"].endswith("Z") and "." not in body["baked_at"]
+        assert body["projects"] == {"xradio": {
+            "workflows": {
+                "linux.yml": {"conclusion": "success", "updated_at": "2025-01-02T00:00:00Z"},
+                "macos.yml": {"conclusion": "completed", "updated_at": "2025-01-03T00:00:00Z"},
+            },
+            "recent_branches": ["feat", "fix"],
+        }}
+        assert out[1] == sorted(GH + p for p in (self.LINUX, self.MACOS, self.RUNS))
+
+    def test_items_are_whitelisted_and_fail_individually(self, tmp_path, upstream):
+        path = batch_path([
+            {"id": "xradio", "repo": "casangi/xradio",
+             "workflows": ["linux.yml", "missing.yml", "../../../../user"]},
+            {"id": "evil", "repo": "someone/else", "workflows": ["ci.yml"]},
+            {"id": "dots", "repo": "casangi/..", "workflows": [], "branches": 1},
+        ])
+        out = run_worker(tmp_path, f"""
+            const r = await request({json.dumps(path)});
+            console.log(JSON.stringify([r.status, r.body.projects, upstreamCalls.length]));
+        """, upstream)
+        status, projects, calls = out[0]
+        assert status == 200 and calls == 2
+        assert projects["xradio"]["workflows"] == {
+            "linux.yml": {"conclusion": "success", "updated_at": "2025-01-02T00:00:00Z"}}
+        assert projects["xradio"]["errors"] == {"missing.yml": "HTTP 404",
+                                                "../../../../user": "Path not allowed"}
+        assert projects["evil"] == {"workflows": {}, "errors": {"ci.yml": "Path not allowed"}}
+        assert projects["dots"]["errors"] == {"recent_branches": "Path not allowed"}
+
+    def test_encoded_traversal_is_refused(self, tmp_path, upstream):
+        path = batch_path([
+            {"id": "repo", "repo": "casangi/%2e%2e/%2e%2e/users/x",
+             "workflows": ["ci.yml"], "branches": 1},
+            {"id": "file", "repo": "casangi/xradio",
+             "workflows": ["%2e%2e%2f%2e%2e%2fx", "linux.yml/../../../../x", "a b.yml"]},
+        ])
+        out = run_worker(tmp_path, f"""
+            const r = await request({json.dumps(path)});
+            console.log(JSON.stringify([r.status, r.body.projects, upstreamCalls.length]));
+        """, upstream)
+        status, projects, calls = out[0]
+        assert status == 200 and calls == 0
+        assert projects["repo"]["errors"] == {"ci.yml": "Path not allowed",
+                                              "recent_branches": "Path not allowed"}
+        assert projects["file"]["errors"] == {
+            "%2e%2e%2f%2e%2e%2fx": "Path not allowed",
+            "linux.yml/../../../../x": "Path not allowed",
+            "a b.yml": "Path not allowed",
+        }
+
+    def test_duplicate_upstream_requests_are_made_once(self, tmp_path, upstream):
+        item = {"id": "xradio", "repo": "casangi/xradio", "workflows": ["linux.yml"]}
+        out = run_worker(tmp_path, f"""
+            await request({json.dumps(batch_path([item, dict(item, id="again")]))});
+            console.log(JSON.stringify(upstreamCalls));
+        """, upstream)
+        assert out == [[GH + self.LINUX]]
+
+    @pytest.mark.parametrize("query", [
+        "/batch", "/batch?q=nope", "/batch?q=%7B%7D", "/batch?q=%5B%7B%22id%22%3A1%7D%5D",
+    ])
+    def test_malformed_queries_are_rejected(self, tmp_path, query):
+        out = run_worker(tmp_path, f"""
+            const r = await request('{query}');
+            console.log(JSON.stringify([r.status, upstreamCalls.length]));
+        """)
+        assert out == [[400, 0]]
+
+    def test_oversized_batches_are_rejected(self, tmp_path):
+        path = batch_path([{"id": "x", "repo": "casangi/x",
+                            "workflows": [f"w{i}.yml" for i in range(41)]}])
+        out = run_worker(tmp_path, f"""
+            const r = await request({json.dumps(path)});
+            console.log(JSON.stringify([r.status, r.body.error, upstreamCalls.length]));
+        """)
+        assert out == [[400, "Too many items (41 > 40)", 0]]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 3. Edge caching
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestEdgeCache:
+
+    PATH = "/repos/casangi/xradio/actions/workflows/linux.yml/runs?branch=main&per_page=1"
+    CODECOV = "/api/v2/github/casangi/repos/xradio/"
+
+    @pytest.fixture
+    def upstream(self):
+        return {
+            GH + self.PATH: {"body": runs(("success", "main", "t1")), "etag": 'W/"v1"',
+                             "headers": {"X-RateLimit-Remaining": "4999"}},
+            "https://api.codecov.io" + self.CODECOV: {"body": {"totals": {"coverage": 84.3}}},
+        }
+
+    def test_repeat_requests_are_hits_on_a_normalised_key(self, tmp_path, upstream):
+        out = run_worker(tmp_path, f"""
+            for (const path of ['/github{self.PATH}',
+                                '/github/repos/casangi/xradio/actions/workflows/linux.yml/runs'
+                                + '?per_page=1&branch=main',
+                                '/codecov{self.CODECOV}', '/codecov{self.CODECOV}']) {{
+              const r = await request(path);
+              console.log(JSON.stringify([r.status, r.headers['x-cache'],
+                                          r.headers['x-ratelimit-remaining'] || null]));
+            }}
+            console.log(JSON.stringify(upstreamCalls.length));
+        """, upstream)
+        assert out == [[200, "MISS", "4999"], [200, "HIT", "4999"],
+                       [200, "MISS", None], [200, "HIT", None], 2]
+
+    def test_stale_entries_are_served_while_revalidating(self, tmp_path, upstream):
+        out = run_worker(tmp_path, f"""
+            const show = r => console.log(JSON.stringify(
+              [r.headers['x-cache'], r.body.workflow_runs[0].conclusion]));
+            await request('/github{self.PATH}');
+            advance(61);
+            show(await request('/github{self.PATH}'));      // 304: entry renewed
+            await settle();
+            show(await request('/github{self.PATH}'));
+
+            UPSTREAM['{GH + self.PATH}'] = {{ etag: 'W/"v2"',
+              body: {{ workflow_runs: [{{ conclusion: 'failure', updated_at: 't2' }}] }} }};
+            advance(61);
+            show(await request('/github{self.PATH}'));      // stale copy, refreshed behind
+            await settle();
+            show(await request('/github{self.PATH}'));
+            console.log(JSON.stringify(upstreamCalls.map(c => c.split(' ')[1] || 'plain')));
+        """, upstream)
+        assert out == [["STALE", "success"], ["HIT", "success"],
+                       ["STALE", "success"], ["HIT", "failure"],
+                       ["plain", "if-none-match", "if-none-match"]]
+
+    def test_entries_past_the_stale_window_are_refetched(self, tmp_path, upstream):
+        out = run_worker(tmp_path, f"""
+            const env = {{ ...ENV, CACHE_TTL_RUNS: '5', CACHE_MAX_STALE: '10' }};
+            await request('/github{self.PATH}', env);
+            advance(16);
+            const r = await request('/github{self.PATH}', env);
+            console.log(JSON.stringify([r.headers['x-cache'], pending.length, upstreamCalls.length]));
+        """, upstream)
+        assert out == [["MISS", 0, 2]]
+
+    def test_errors_are_not_cached_and_ttl_zero_bypasses(self, tmp_path, upstream):
+        upstream[GH + self.PATH]["status"] = 502
+        out = run_worker(tmp_path, f"""
+            for (let i = 0; i < 2; i++) {{
+              const r = await request('/github{self.PATH}');
+              console.log(JSON.stringify([r.status, r.headers['x-cache']]));
+            }}
+            const r = await request('/codecov{self.CODECOV}', {{ ...ENV, CACHE_TTL_CODECOV: '0' }});
+            console.log(JSON.stringify([r.status, r.headers['x-cache'], cacheStore.size]));
+        """, upstream)
+        assert out == [[502, "MISS"], [502, "MISS"], [200, "BYPASS", 0]]
+
+    def test_batch_reports_the_cache_status_of_its_parts(self, tmp_path, upstream):
+        path = batch_path([{"id": "xradio", "repo": "casangi/xradio",
+                            "workflows": ["linux.yml"]}])
+        out = run_worker(tmp_path, f"""
+            await request('/github{self.PATH}');
+            const first = await request({json.dumps(path)});
+            advance(61);
+            const second = await request({json.dumps(path)});
+            console.log(JSON.stringify([first.headers['x-cache'], second.headers['x-cache'],
+                                        upstreamCalls.length]));
+        """, upstream)
+        assert out == [["HIT", "STALE", 2]]   # the second call is the background refresh
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 4. Field projection
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestProjection:
+
+    PATH = "/repos/casangi/xradio/actions/runs?per_page=30"
+    CODECOV = "/api/v2/github/casangi/repos/xradio/"
+
+    @pytest.fixture
+    def upstream(self):
+        bulky = {"id": 1, "login": "someone", "avatar_url": "https://x" * 40,
+                 "repository": {"full_name": "casangi/xradio", "description": "d" * 500}}
+        full = runs(*[("success", f"b{i}", "t") for i in range(30)])
+        for run in full["workflow_runs"]:
+            run.update(html_url="https://github.com/x", actor=bulky, triggering_actor=bulky,
+                       head_commit={"message": "m" * 200}, repository=bulky["repository"],
+                       head_repository=bulky["repository"])
+        return {
+            GH + self.PATH: {"body": full},
+            "https://api.codecov.io" + self.CODECOV: {"body": {
+                "totals": {"coverage": 84.3, "lines": 10, "hits": 8, "misses": 1,
+                           "partials": 1, "complexity": 0, "diff": [1, 2]},
+                "branch": "main", "updatestamp": "u", "author": bulky, "language": "python"}},
+        }
+
+    def test_run_lists_keep_only_the_fields_the_dashboard_reads(self, tmp_path, upstream):
+        out = run_worker(tmp_path, f"""
+            const r = await request('/github{self.PATH}');
+            const raw = JSON.stringify(UPSTREAM['{GH + self.PATH}'].body).length;
+            const cached = cacheStore.values().next().value.body;
+            console.log(JSON.stringify([Object.keys(r.body), r.body.workflow_runs[0],
+                                        JSON.stringify(r.body) === cached,
+                                        raw / cached.length > 10]));
+        """, upstream)
+        keys, run, cached_projected, ten_x_smaller = out[0]
+        assert keys == ["total_count", "workflow_runs"]
+        assert run == {"name": "ci", "status": "completed", "conclusion": "success",
+                       "head_branch": "b0", "updated_at": "t"}
+        assert cached_projected and ten_x_smaller
+
+    def test_codecov_totals_are_projected(self, tmp_path, upstream):
+        out = run_worker(tmp_path, f"""
+            console.log(JSON.stringify((await request('/codecov{self.CODECOV}')).body));
+        """, upstream)
+        assert out == [{"totals": {"coverage": 84.3, "lines": 10, "hits": 8, "misses": 1,
+                                   "partials": 1},
+                        "branch": "main", "updatestamp": "u"}]
+
+    def test_projection_can_be_switched_off(self, tmp_path, upstream):
+        out = run_worker(tmp_path, f"""
+            const r = await request('/github{self.PATH}', {{ ...ENV, FIELD_PROJECTION: 'off' }});
+            console.log(JSON.stringify('actor' in r.body.workflow_runs[0]));
+        """, upstream)
+        assert out == [True]
+
+    def test_projected_and_raw_bodies_are_cached_apart(self, tmp_path, upstream):
+        out = run_worker(tmp_path, f"""
+            const raw = {{ ...ENV, FIELD_PROJECTION: 'off' }};
+            for (const env of [ENV, raw, ENV, raw]) {{
+              const r = await request('/github{self.PATH}', env);
+              console.log(JSON.stringify([r.headers['x-cache'], 'actor' in r.body.workflow_runs[0]]));
+            }}
+            console.log(JSON.stringify([upstreamCalls.length, [...cacheStore.keys()].sort()]));
+        """, upstream)
+        assert out[:4] == [["MISS", False], ["MISS", True], ["HIT", False], ["HIT", True]]
+        calls, keys = out[4]
+        assert calls == 2
+        assert [parse_qs(urlsplit(k).query)["__projection"] for k in keys] == [["off"], ["v1"]]
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 5. Scheduled snapshot
+# ═══════════════════════════════════════════════════════════════════════════
+
+class TestSnapshot:
+
+    @pytest.fixture
+    def config(self):
+        with open(build_dashboard.CONFIG_PATH, encoding="utf-8") as fh:
+            config = yaml.safe_load(fh)
+        projects = [p for p in config["projects"] if p["id"] in ("testviper", "xradio")]
+        return dict(config, projects=projects, bake={"max_workers": 4})
+
+    @pytest.fixture
+    def mock_base(self):
+        api = mock_api_server.MockApi(
+            mock_api_server.load_recordings(mock_api_server.DEFAULT_RECORDINGS))
+        server = mock_api_server.make_server(api, port=0)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+        server.server_close()
+
+    def test_worker_config_lists_the_bake_calls(self, config):
+        exported = build_dashboard.worker_snapshot_config(config)
+        assert exported["max_recent_branches"] == config["dashboard"]["max_recent_branches"]
+        xradio = exported["projects"][1]
+        calls = build_dashboard.plan_project_calls(config["projects"][1], "", 4)
+        assert xradio["workflows"] == [c.key for c in calls if c.section == "workflows"]
+        assert xradio["panel_workflows"] == [c.key for c in calls
+                                             if c.section == "panel_workflows"]
+        assert xradio["fixed_branch"] is False
+
+    def test_scheduled_snapshot_matches_the_bake(self, tmp_path, config, mock_base):
+        snapshot_config = build_dashboard.worker_snapshot_config(config)
+        out = run_worker(tmp_path, f"""
+            const env = {{ ...ENV, SNAPSHOT_CONFIG: {json.dumps(json.dumps(snapshot_config))} }};
+            await worker.scheduled({{ cron: '*/5 * * * *' }}, env, ctx);
+            await settle();
+            const r = await request('/snapshot');
+            console.log(JSON.stringify([r.status, r.headers['cache-control'], r.body]));
+            console.log(JSON.stringify(upstreamCalls.length));
+        """, base=mock_base)
+        status, cache_control, snapshot = out[0]
+        assert status == 200 and cache_control == "public, max-age=30"
+
+        with mock.patch.object(build_dashboard, "API_BASE", mock_base), \
+             mock.patch.object(build_dashboard, "HTTP_CACHE", None), \
+             mock.patch.object(build_dashboard, "HTTP_POOL", None):
+            baked = build_dashboard.bake_ci_data(config, "dummy-token")
+        assert (build_dashboard._strip_volatile(snapshot)
+                == build_dashboard._strip_volatile(baked))
+        assert list(snapshot["projects"]) == ["testviper", "xradio"]
+        entry = snapshot["projects"]["xradio"]["workflows"]["python-testing-linux.yml"]
+        assert entry["fetched_at"] == snapshot["baked_at"]
+        # one sweep per repository plus targeted calls for unswept workflows only
+        assert out[1] < sum(len(p["workflows"]) + len(p["panel_workflows"]) + 1
+                            for p in snapshot_config["projects"])
+
+    def test_failed_entries_keep_their_previous_value(self, tmp_path):
+        snapshot_config = {"max_recent_branches": 2, "projects": [
+            {"id": "x", "owner": "casangi", "repo": "x", "fixed_branch": False,
+             "workflows": ["ci.yml"], "panel_workflows": ["ci.yml", "gone.yml"]}]}
+        previous = {"baked_at": "2025-01-01T00:00:00Z", "projects": {"x": {
+            "workflows": {"ci.yml": {"conclusion": "success", "updated_at": "old",
+                                     "fetched_at": "2025-01-01T00:00:00Z"}},
+            "recent_branches": ["feat"], "branches_fetched_at": "2025-01-01T00:00:00Z"}}}
+        runs_url = GH + "/repos/casangi/x/actions/workflows/ci.yml/runs?per_page=1"
+        upstream = {runs_url: {"body": runs(("failure", "feat", "new"))}}
+        out = run_worker(tmp_path, f"""
+            kvStore.set('snapshot', {json.dumps(json.dumps(previous))});
+            const env = {{ ...ENV, SNAPSHOT_CONFIG: {json.dumps(snapshot_config)} }};
+            await worker.scheduled({{}}, env, ctx);
+            await settle();
+            console.log(kvStore.get('snapshot'));
+        """, upstream)
+        project = out[0]["projects"]["x"]
+        assert project["workflows"] == previous["projects"]["x"]["workflows"]
+        assert project["panel_workflows"] == {"ci.yml": {
+            "conclusion": "failure", "updated_at": "new", "head_branch": "feat",
+            "fetched_at": out[0]["baked_at"]}}
+        assert project["recent_branches"] == ["feat"]
+        assert project["branches_fetched_at"] == "2025-01-01T00:00:00Z"
+
+    def test_snapshot_route_without_data(self, tmp_path):
+        out = run_worker(tmp_path, """
+            for (const env of [ENV, { GITHUB_TOKEN: 'x' }]) {
+              const r = await request('/snapshot', env);
+              console.log(JSON.stringify([r.status, r.body]));
+            }
+            await worker.scheduled({}, { GITHUB_TOKEN: 'x' }, ctx);
+            await settle();
+            console.log(JSON.stringify(upstreamCalls.length));
+        """)
+        assert out == [[404, {"error": "No snapshot available"}]] * 2 + [0]